@@ -0,0 +1,296 @@
+"""
+드롭 폴더 주문 수신
+
+EDI 방식 연동을 위해 수신 폴더에 놓인 엑셀/CSV 주문 파일을 Streamlit 프로세스 밖에서 처리합니다.
+
+    data/inbound/<발주사 계정>/주문.xlsx    ← 고객사 시스템이 파일을 놓는 위치
+    data/inbound/processing/<계정>/         처리 중인 파일
+    data/inbound/done/<계정>/               처리 완료 파일과 결과 보고서 (*.report.csv)
+    data/inbound/error/<계정>/              오류가 있는 파일과 행별 오류 보고서
+
+파일 형식은 엑셀 업로드와 같으며(품목명, 주문수량, 납품예정일) 같은 검증 규칙(utils.excel_handler.validate_order_rows)을
+사용합니다. 선택 컬럼 주문키/주문일자/주문구분이 있으면 주문키가 같은 행끼리 하나의 주문이 되고, 없으면 파일 전체가 한 주문입니다.
+파싱은 프로세스 풀에서 하고, 주문은 그룹 커밋 쓰기 큐를 통해 묶음 단위로 생성합니다(create_orders_bulk).
+멱등성 키는 "drop:<파일 내용의 SHA-256>:<주문키>"이므로 같은 파일을 다시 놓아도 이미 생성된 주문은 중복되지 않고,
+매일 같은 이름(예: orders.csv)으로 내용만 바꾸어 보내는 파일은 새 주문으로 생성됩니다.
+오류가 있는 주문(행)만 제외하고 나머지는 생성하며, 오류가 하나라도 있으면 파일은 error 폴더로 옮깁니다.
+주문 생성이 중간 묶음에서 실패해도 이미 커밋된 주문은 보고서에 주문번호와 함께 기록됩니다.
+
+실행:
+    python -m api.drop_folder                 # 계속 감시
+    python -m api.drop_folder --once          # 한 번만 처리하고 종료 (cron 등)
+"""
+import argparse
+import csv
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+
+from config import (
+    ROLES, DROP_FOLDER_DIR, DROP_FOLDER_WORKERS, DROP_FOLDER_POLL_S, DROP_FOLDER_SETTLE_S, DROP_FOLDER_ORDERS_PER_COMMIT,
+)
+from database.connection import get_db, close_db
+from database.models import User
+from database.write_queue import get_writer
+from services.order_service import create_orders_bulk
+from utils.excel_handler import REQUIRED_COLUMNS, csv_separator, iter_csv_chunks, load_item_lookup, validate_order_rows
+from utils.validators import validate_order_type
+
+FILE_EXTENSIONS = (".xlsx", ".csv", ".tsv")
+STATE_DIRS = ("processing", "done", "error")
+
+
+def read_order_file(path: str):
+    """엑셀/CSV/TSV 주문 파일을 DataFrame으로 읽습니다. CSV는 업로드와 같이 UTF-8/CP949를 판별하여 C 파서로 읽습니다."""
+    import pandas as pd
+
+    if path.lower().endswith(".xlsx"):
+        return pd.read_excel(path, engine="openpyxl")
+    return pd.concat([df for df, _ in iter_csv_chunks(path, csv_separator(path))])
+
+
+def file_digest(path: str) -> str:
+    """파일 내용의 SHA-256 (멱등성 키에 사용)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse_order_file(path: str, item_dict: dict, today: date) -> dict:
+    """
+    파일 하나를 파싱하여 주문 단위로 묶습니다. 프로세스 풀에서 실행되므로 DB에 접근하지 않습니다.
+    Returns: {"orders": [...], "row_errors": [(행, 메시지)], "rejected": {주문키: [행]}, "rows": 행 수, "digest": 내용 해시}
+             또는 파일 자체를 처리할 수 없으면 {"error": 메시지}
+    """
+    import pandas as pd
+
+    try:
+        digest = file_digest(path)
+        df = read_order_file(path)
+    except Exception as e:
+        return {"error": f"파일을 읽을 수 없습니다: {e}"}
+
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing_columns:
+        return {"error": f"필수 컬럼이 누락되었습니다: {', '.join(missing_columns)}"}
+
+    rows, row_errors = validate_order_rows(df, item_dict)
+    valid_rows = {row_num for row_num, _ in rows}
+    blocked_rows = {row_num for row_num, _ in row_errors if row_num not in valid_rows}
+
+    def cell(idx, column):
+        if column not in df.columns or pd.isna(df.at[idx, column]):
+            return None
+        return df.at[idx, column]
+
+    # 주문키별 주문 헤더 (주문일자/주문구분은 주문키의 첫 행 기준)
+    headers, keys_by_row = {}, {}
+    for idx in df.index:
+        row_num = idx + 2
+        key = str(cell(idx, "주문키")).strip() if cell(idx, "주문키") is not None else "1"
+        keys_by_row[row_num] = key
+        if key in headers:
+            continue
+        order_date, order_type = today, str(cell(idx, "주문구분") or "일반").strip()
+        if cell(idx, "주문일자") is not None:
+            try:
+                order_date = pd.to_datetime(cell(idx, "주문일자")).date()
+            except (ValueError, TypeError):
+                row_errors.append((row_num, "주문일자 형식이 올바르지 않습니다."))
+                blocked_rows.add(row_num)
+        is_valid, error_msg = validate_order_type(order_type)
+        if not is_valid:
+            row_errors.append((row_num, error_msg))
+            blocked_rows.add(row_num)
+        headers[key] = {"idempotency_key": key, "order_date": order_date, "order_type": order_type, "details": [], "rows": []}
+
+    rejected = {}
+    for row_num in blocked_rows:
+        rejected.setdefault(keys_by_row[row_num], []).append(row_num)
+    for row_num, detail in rows:
+        key = keys_by_row[row_num]
+        if key not in rejected:
+            headers[key]["details"].append(detail)
+            headers[key]["rows"].append(row_num)
+
+    orders = [order for key, order in headers.items() if key not in rejected and order["details"]]
+    return {"orders": orders, "row_errors": sorted(row_errors), "rejected": rejected, "rows": len(df), "digest": digest}
+
+
+def _customer_users(db) -> dict:
+    users = db.query(User).filter(User.role == ROLES["발주사"]).all()
+    return {u.username: {"user_id": u.user_id, "username": u.username, "role": u.role, "company_name": u.company_name}
+            for u in users}
+
+
+def _move(path: str, root: str, state: str, username: str, name: str) -> str:
+    target_dir = os.path.join(root, state, username)
+    os.makedirs(target_dir, exist_ok=True)
+    target = os.path.join(target_dir, name)
+    os.replace(path, target)
+    return target
+
+
+def _write_report(path: str, entries: list):
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["행", "주문키", "결과", "주문번호", "메시지"])
+        writer.writerows(entries)
+
+
+def create_parsed_orders(user: dict, parsed: dict) -> tuple:
+    """
+    파싱된 주문을 묶음 단위로 생성합니다.
+    Returns: ({주문키: (주문번호, 신규 여부)}, 오류 메시지 또는 None)
+             중간 묶음에서 오류가 나면 이미 커밋된 앞 묶음의 결과와 오류 메시지를 함께 반환합니다.
+    """
+    orders = [dict(order, idempotency_key=f"drop:{parsed['digest']}:{order['idempotency_key']}") for order in parsed["orders"]]
+    results = {}
+    for start in range(0, len(orders), DROP_FOLDER_ORDERS_PER_COMMIT):
+        chunk = orders[start:start + DROP_FOLDER_ORDERS_PER_COMMIT]
+        try:
+            created = get_writer().execute(create_orders_bulk, user, chunk, source="drop_folder")
+        except Exception as e:
+            return results, f"주문 생성 중 오류 발생: {e}"
+        for order, result in zip(parsed["orders"][start:start + DROP_FOLDER_ORDERS_PER_COMMIT], created):
+            results[order["idempotency_key"]] = result
+    return results, None
+
+
+def finish_file(root: str, username: str, user: dict, processing_path: str, name: str, parsed: dict) -> dict:
+    """주문 생성 → 보고서 작성 → done/error 폴더로 이동"""
+    entries = []
+    created = {}
+    if "error" in parsed:
+        entries.append(["", "", "오류", "", parsed["error"]])
+    else:
+        if user is None:
+            parsed = {"error": f"등록되지 않은 발주사 계정 폴더입니다: {username}"}
+            entries.append(["", "", "오류", "", parsed["error"]])
+        else:
+            created, error = create_parsed_orders(user, parsed)
+            if error:
+                parsed = dict(parsed, error=error)
+                entries.append(["", "", "오류", "", error])
+        for order in parsed.get("orders", []):
+            if order["idempotency_key"] in created:
+                order_no, is_new = created[order["idempotency_key"]]
+                for row_num in order["rows"]:
+                    entries.append([row_num, order["idempotency_key"], "생성" if is_new else "중복", order_no, ""])
+            elif "error" in parsed:
+                for row_num in order["rows"]:
+                    entries.append([row_num, order["idempotency_key"], "미생성", "",
+                                    "오류로 생성하지 않았습니다. 파일을 다시 넣으면 생성된 주문은 중복되지 않습니다."])
+        for row_num, message in parsed.get("row_errors", []):
+            entries.append([row_num, "", "오류", "", message])
+        for key, row_nums in parsed.get("rejected", {}).items():
+            entries.append(["", key, "제외", "", f"오류가 있는 행({', '.join(map(str, sorted(row_nums)))}) 때문에 주문을 생성하지 않았습니다."])
+
+    failed = "error" in parsed or bool(parsed.get("row_errors"))
+    stamped = f"{datetime.now():%Y%m%d_%H%M%S_%f}_{name}"
+    target = _move(processing_path, root, "error" if failed else "done", username, stamped)
+    _write_report(target + ".report.csv", sorted(entries, key=lambda e: (e[0] == "", e[0] or 0)))
+    return {
+        "file": name, "user": username, "failed": failed, "path": target,
+        "created": sum(1 for _, is_new in created.values() if is_new),
+        "duplicates": sum(1 for _, is_new in created.values() if not is_new),
+        "row_errors": len(parsed.get("row_errors", [])),
+    }
+
+
+def _settled_files(root: str, settle_s: float) -> list:
+    now = time.time()
+    found = []
+    for username in sorted(os.listdir(root)):
+        folder = os.path.join(root, username)
+        if username in STATE_DIRS or not os.path.isdir(folder):
+            continue
+        for name in sorted(os.listdir(folder)):
+            path = os.path.join(folder, name)
+            if (name.lower().endswith(FILE_EXTENSIONS) and not name.startswith(("~$", "."))
+                    and os.path.isfile(path) and now - os.path.getmtime(path) >= settle_s):
+                found.append((username, name, path))
+    return found
+
+
+def recover_processing(root: str):
+    """이전 실행이 처리 도중 중단된 파일을 수신 폴더로 되돌립니다 (멱등성 키로 중복 생성 방지)."""
+    processing = os.path.join(root, "processing")
+    if not os.path.isdir(processing):
+        return
+    for username in os.listdir(processing):
+        for name in os.listdir(os.path.join(processing, username)):
+            os.makedirs(os.path.join(root, username), exist_ok=True)
+            os.replace(os.path.join(processing, username, name), os.path.join(root, username, name))
+
+
+def scan_once(root: str, executor, settle_s: float = DROP_FOLDER_SETTLE_S) -> list:
+    """수신 폴더의 파일을 모두 처리하고 파일별 요약을 반환합니다. executor는 파일 파싱에 사용할 프로세스 풀입니다."""
+    db = get_db()
+    try:
+        users = _customer_users(db)
+        item_dict = load_item_lookup(db)
+    finally:
+        close_db(db)
+    for username in users:
+        os.makedirs(os.path.join(root, username), exist_ok=True)
+    files = _settled_files(root, settle_s)
+    if not files:
+        return []
+
+    today = date.today()
+    jobs = []
+    for username, name, path in files:
+        # 다른 수신기와 같은 파일을 동시에 처리하지 않도록 먼저 processing 폴더로 옮겨 선점합니다.
+        try:
+            processing_path = _move(path, root, "processing", username, name)
+        except OSError:
+            continue
+        jobs.append((username, name, processing_path, executor.submit(parse_order_file, processing_path, item_dict, today)))
+
+    summaries = []
+    for username, name, processing_path, future in jobs:
+        try:
+            parsed = future.result()
+        except Exception as e:
+            parsed = {"error": f"파일 처리 중 오류 발생: {e}"}
+        summaries.append(finish_file(root, username, users.get(username), processing_path, name, parsed))
+    return summaries
+
+
+def _print_summary(summary: dict):
+    status = "오류" if summary["failed"] else "완료"
+    print(f"[{status}] {summary['user']}/{summary['file']}: 생성 {summary['created']}건, 중복 {summary['duplicates']}건, "
+          f"오류 행 {summary['row_errors']}건 → {summary['path']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="드롭 폴더 주문 수신")
+    parser.add_argument("--dir", default=DROP_FOLDER_DIR, help="수신 폴더")
+    parser.add_argument("--workers", type=int, default=DROP_FOLDER_WORKERS, help="파싱 프로세스 수")
+    parser.add_argument("--poll", type=float, default=DROP_FOLDER_POLL_S, help="폴더 확인 주기 (s)")
+    parser.add_argument("--once", action="store_true", help="한 번만 처리하고 종료")
+    args = parser.parse_args()
+
+    from database.db_init import init_db
+    init_db()
+    os.makedirs(args.dir, exist_ok=True)
+    recover_processing(args.dir)
+    print(f"주문 파일 수신 폴더: {args.dir}")
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        while True:
+            for summary in scan_once(args.dir, executor, settle_s=0 if args.once else DROP_FOLDER_SETTLE_S):
+                _print_summary(summary)
+            if args.once:
+                break
+            time.sleep(args.poll)
+    get_writer().stop()
+
+
+if __name__ == "__main__":
+    main()
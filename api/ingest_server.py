@@ -0,0 +1,228 @@
+"""
+주문 일괄 수신 API
+
+고객사 시스템이 화면이나 엑셀 업로드 없이 주문을 보낼 수 있는 HTTP/JSON 엔드포인트입니다.
+표준 라이브러리 ThreadingHTTPServer로 동작하며, Streamlit 앱과 같은 데이터베이스를 사용합니다.
+
+    POST /api/orders/batch    (HTTP Basic 인증, 발주사 계정)
+    {"orders": [{"idempotency_key": "PO-1001", "order_date": "2026-10-19", "order_type": "일반",
+                 "lines": [{"item_code": "ITEM001", "order_qty": 100, "planned_shipping_date": "2026-11-20"}]}]}
+
+    → {"created": 1, "duplicates": 0, "rejected": 0,
+       "results": [{"index": 0, "idempotency_key": "PO-1001", "status": "created", "order_no": "ORD-2026-015"}]}
+
+주문은 품목 마스터로 검증한 뒤 한 트랜잭션의 다중 행 INSERT로 생성합니다(services.order_service.create_orders_bulk).
+같은 계정이 같은 멱등성 키로 다시 보내면 새 주문을 만들지 않고 처음 발급한 주문번호를 돌려주므로,
+응답을 받지 못한 요청은 그대로 다시 보내면 됩니다. 검증에 실패한 주문만 rejected로 응답하고 나머지는 생성합니다.
+
+실행:
+    python -m api.ingest_server --port 8600
+"""
+import argparse
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from auth.auth import login
+from config import (
+    ROLES, INGEST_API_ENABLED, INGEST_API_HOST, INGEST_API_PORT, INGEST_MAX_BATCH, INGEST_MAX_BODY_BYTES,
+    INGEST_AUTH_CACHE_TTL_S,
+)
+from database.change_notifier import watcher_for_session
+from database.connection import SessionLocal
+from database.write_queue import get_writer
+from services.ingest_service import validate_order_batch
+from services.order_service import create_orders_bulk
+
+logger = logging.getLogger(__name__)
+BATCH_PATH = "/api/orders/batch"
+
+# 확인된 (계정, 비밀번호)는 프로세스 전용 키의 HMAC 값으로만 보관합니다.
+_auth_cache = {}
+_auth_cache_lock = threading.Lock()
+_auth_cache_key = os.urandom(32)
+
+_server_lock = threading.Lock()
+_server_started = False
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _users_version():
+    db = SessionLocal()
+    try:
+        watcher = watcher_for_session(db)
+        return watcher.table_version("users") if watcher else None
+    finally:
+        db.close()
+
+
+def authenticate(authorization: str) -> dict:
+    """HTTP Basic 인증 헤더로 발주사 계정을 확인하고 사용자 정보를 반환합니다."""
+    if not authorization or not authorization.startswith("Basic "):
+        raise ApiError(401, "인증 정보가 필요합니다.")
+    try:
+        username, _, password = base64.b64decode(authorization[6:]).decode("utf-8").partition(":")
+    except (binascii.Error, UnicodeDecodeError):
+        raise ApiError(401, "인증 정보 형식이 올바르지 않습니다.")
+
+    digest = hmac.new(_auth_cache_key, f"{username}\0{password}".encode("utf-8"), hashlib.sha256).digest()
+    now = time.monotonic()
+    # 계정이 바뀌면(비밀번호 변경, 삭제 등, 다른 프로세스 포함) users 변경 카운터가 달라져 캐시를 쓰지 않습니다.
+    users_version = _users_version()
+    with _auth_cache_lock:
+        cached = _auth_cache.get(digest)
+    if cached and cached[1] > now and cached[2] == users_version:
+        user = cached[0]
+    else:
+        success, message, user = login(username, password)
+        if not success:
+            raise ApiError(401, message)
+        with _auth_cache_lock:
+            _auth_cache[digest] = (user, now + INGEST_AUTH_CACHE_TTL_S, users_version)
+
+    if user["role"] != ROLES["발주사"]:
+        raise ApiError(403, "발주사 계정만 주문을 등록할 수 있습니다.")
+    return user
+
+
+def ingest_orders(user: dict, payload) -> dict:
+    """검증 → 일괄 생성 → 주문별 결과 (입력 순서)"""
+    raw_orders = payload.get("orders") if isinstance(payload, dict) else None
+    if not isinstance(raw_orders, list) or not raw_orders:
+        raise ApiError(400, "orders 배열이 필요합니다.")
+    if len(raw_orders) > INGEST_MAX_BATCH:
+        raise ApiError(413, f"요청 하나에 주문은 {INGEST_MAX_BATCH}건까지 보낼 수 있습니다.")
+
+    db = SessionLocal()
+    try:
+        valid, rejected = validate_order_batch(db, raw_orders)
+    finally:
+        db.close()
+
+    # 주문번호 채번과 INSERT가 같은 쓰기 잠금 안에서 일어나도록 그룹 커밋 쓰기 큐(BEGIN IMMEDIATE)로 실행합니다.
+    created = get_writer().execute(create_orders_bulk, user, [order for _, order in valid]) if valid else []
+
+    results = [None] * len(raw_orders)
+    for (index, order), (order_no, is_new) in zip(valid, created):
+        results[index] = {"index": index, "idempotency_key": order["idempotency_key"],
+                          "status": "created" if is_new else "duplicate", "order_no": order_no}
+    for index, errors in rejected.items():
+        raw = raw_orders[index]
+        results[index] = {"index": index, "idempotency_key": raw.get("idempotency_key") if isinstance(raw, dict) else None,
+                          "status": "rejected", "errors": errors}
+
+    return {
+        "created": sum(1 for r in results if r["status"] == "created"),
+        "duplicates": sum(1 for r in results if r["status"] == "duplicate"),
+        "rejected": len(rejected),
+        "results": results,
+    }
+
+
+class _IngestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # 연결 재사용 (keep-alive)
+
+    def do_GET(self):
+        if self.path.split("?")[0] == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": "존재하지 않는 경로입니다."})
+
+    def do_POST(self):
+        try:
+            if self.path.split("?")[0] != BATCH_PATH:
+                raise ApiError(404, "존재하지 않는 경로입니다.")
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                raise ApiError(400, "Content-Length가 올바르지 않습니다.")
+            if length > INGEST_MAX_BODY_BYTES:
+                raise ApiError(413, "요청 본문이 너무 큽니다.")
+            body = self.rfile.read(length)
+            user = authenticate(self.headers.get("Authorization"))
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                raise ApiError(400, "JSON 형식이 올바르지 않습니다.")
+            self._send_json(200, ingest_orders(user, payload))
+        except ApiError as e:
+            self._send_json(e.status, {"error": e.message})
+        except Exception:
+            # 내부 오류 내용(SQL, 경로 등)은 서버 로그에만 남기고 클라이언트에는 일반 메시지만 보냅니다.
+            logger.exception("주문 일괄 수신 처리 실패 (%s)", self.client_address[0])
+            self._send_json(500, {"error": "주문 처리 중 오류가 발생했습니다. 관리자에게 문의하세요."})
+
+    def _send_json(self, status: int, body: dict):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if status == 401:
+            self.send_header("WWW-Authenticate", 'Basic realm="sebang-scm"')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_ingest_server(host: str = INGEST_API_HOST, port: int = INGEST_API_PORT) -> ThreadingHTTPServer:
+    """수신 API를 데몬 스레드에서 시작하고 서버를 반환합니다."""
+    server = ThreadingHTTPServer((host, port), _IngestHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="scm-ingest-api", daemon=True).start()
+    return server
+
+
+def start_ingest_api():
+    """
+    config.INGEST_API_ENABLED이면 수신 API를 프로세스당 한 번만 시작합니다. app.main에서 매 실행마다 호출해도 됩니다.
+    포트를 이미 다른 프로세스가 사용 중이면 건너뜁니다.
+    """
+    global _server_started
+    with _server_lock:
+        if _server_started or not INGEST_API_ENABLED:
+            return
+        _server_started = True
+        try:
+            start_ingest_server()
+        except OSError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="주문 일괄 수신 API")
+    parser.add_argument("--host", default=INGEST_API_HOST)
+    parser.add_argument("--port", type=int, default=INGEST_API_PORT)
+    args = parser.parse_args()
+
+    from database.db_init import init_db
+    init_db()
+    server = ThreadingHTTPServer((args.host, args.port), _IngestHandler)
+    server.daemon_threads = True
+    print(f"주문 수신 API: http://{args.host}:{args.port}{BATCH_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
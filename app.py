@@ -1,17 +1,16 @@
 import streamlit as st
 import os
-from auth.auth import is_authenticated, show_login_page, logout
+from functools import lru_cache
+from auth.auth import is_authenticated, show_login_page, logout, get_current_user
 from database.db_init import init_db
+from database.instrumentation import track_queries
+from database.maintenance import start_maintenance_scheduler
+from database.change_notifier import start_change_watcher
+from config import SQL_DEBUG_PANEL, INGEST_API_ENABLED
 from utils.sidebar import show_sidebar
-from pages import (
-    page_1_order_registration,
-    page_2_order_approval,
-    page_3_warehousing,
-    page_4_shipping_plan,
-    page_5_dashboard,
-    page_6_shipping_registration,
-    page_order_detail
-)
+from utils.profiling import record_page_timing, should_profile_rerun, run_profiled, show_profiling_tools
+from utils.metrics import start_metrics_exporters
+from pages import PAGE_MODULES, load_page
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -23,14 +22,22 @@ st.set_page_config(
 )
 
 # --- Custom CSS ---
+@lru_cache(maxsize=1)
+def read_custom_css():
+    """style.css 내용을 프로세스당 한 번만 읽습니다 (파일이 없으면 None)."""
+    css_path = os.path.join(os.path.dirname(__file__), ".streamlit", "style.css")
+    if not os.path.exists(css_path):
+        return None
+    with open(css_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
 def load_custom_css():
     """세방산업 디자인 시스템 CSS 로드"""
     # 외부 CSS 파일 로드
     try:
-        css_path = os.path.join(os.path.dirname(__file__), ".streamlit", "style.css")
-        if os.path.exists(css_path):
-            with open(css_path, 'r', encoding='utf-8') as f:
-                css_content = f.read()
+        css_content = read_custom_css()
+        if css_content:
             st.markdown(f"<style>{css_content}</style>", unsafe_allow_html=True)
     except Exception as e:
         # CSS 파일 로드 실패 시 인라인 스타일 사용
@@ -88,25 +95,31 @@ def load_custom_css():
         """, unsafe_allow_html=True)
 
 # --- Page Definitions ---
-PAGES = {
-    "대시보드": page_5_dashboard,
-    "주문등록": page_1_order_registration,
-    "주문승인": page_2_order_approval,
-    "입고등록": page_3_warehousing,
-    "출하계획": page_4_shipping_plan,
-    "출하등록": page_6_shipping_registration,
-    "주문상세": page_order_detail,
-}
+# Page modules are imported on first navigation (see pages.load_page)
+PAGES = PAGE_MODULES
+
+
+@st.cache_resource(show_spinner=False)
+def init_db_once():
+    """Initializes the database once per process instead of once per browser session."""
+    init_db()
+    return True
 
 # --- Main Application Logic ---
 def main():
     """Main function to run the Streamlit app."""
     load_custom_css()
+    start_metrics_exporters()
+    start_maintenance_scheduler()
+    start_change_watcher()
+    if INGEST_API_ENABLED:
+        from api.ingest_server import start_ingest_api
+        start_ingest_api()
 
     # Initialize database if not already done
     if "db_initialized" not in st.session_state:
         try:
-            init_db()
+            init_db_once()
             st.session_state.db_initialized = True
         except Exception as e:
             st.error(f"데이터베이스 초기화 실패: {e}")
@@ -124,11 +137,21 @@ def main():
     # --- Render the Current Page ---
     # Default to Dashboard if no page is set
     current_page_name = st.session_state.get("current_page", "대시보드")
-    page_function = PAGES.get(current_page_name)
+    page_function = load_page(current_page_name)
 
     if page_function:
         try:
-            page_function()
+            user = get_current_user()
+            with record_page_timing(current_page_name, user.get("role", "")):
+                with track_queries(current_page_name) as query_stats:
+                    if should_profile_rerun():
+                        run_profiled(current_page_name, page_function)
+                    else:
+                        page_function()
+            show_profiling_tools(user)
+            if SQL_DEBUG_PANEL:
+                from utils.sql_debug_panel import show_sql_debug_panel
+                show_sql_debug_panel(query_stats)
         except Exception as e:
             st.error(f"페이지 렌더링 중 오류가 발생했습니다: {str(e)}")
             import traceback
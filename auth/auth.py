@@ -1,15 +1,31 @@
 """
 인증 로직 (로그인/로그아웃/세션 관리)
 """
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta
+from functools import lru_cache
+
 import streamlit as st
 import bcrypt
+from config import BCRYPT_ROUNDS, AUTH_VERIFY_WORKERS, AUTH_VERIFY_TIMEOUT_S
+from config import SESSION_TTL_HOURS, SESSION_SECRET, SESSION_SECRET_PATH, SESSION_QUERY_PARAM
 from database.connection import get_db, close_db
-from database.models import User
+from database.models import User, UserSession
+from database.write_queue import run_write
+from utils.metrics import PASSWORD_VERIFY_DURATION, PASSWORD_REHASHES
 
 
-def hash_password(password: str) -> str:
-    """비밀번호 해싱"""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+    """비밀번호 해싱 (config.BCRYPT_ROUNDS 비용)"""
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
 
 
 def verify_password(password: str, password_hash: str) -> bool:
@@ -17,6 +33,67 @@ def verify_password(password: str, password_hash: str) -> bool:
     return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
 
 
+def hash_rounds(password_hash: str):
+    """bcrypt 해시("$2b$12$...")에 기록된 비용. 형식이 다르면 None"""
+    parts = password_hash.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(password_hash: str, rounds: int = BCRYPT_ROUNDS) -> bool:
+    """저장된 해시의 비용이 현재 설정과 다르면 True"""
+    return hash_rounds(password_hash) != rounds
+
+
+# bcrypt는 검증하는 동안 GIL을 놓으므로 스레드 풀에서 실행하면 여러 로그인이 병렬로 처리됩니다.
+# 워커 수를 제한해 로그인이 몰려도 bcrypt가 모든 CPU를 차지해 다른 세션의 화면 갱신을 막지 않도록 합니다.
+_verify_pool = None
+_verify_pool_lock = threading.Lock()
+
+
+def _get_verify_pool() -> ThreadPoolExecutor:
+    global _verify_pool
+    with _verify_pool_lock:
+        if _verify_pool is None:
+            _verify_pool = ThreadPoolExecutor(max_workers=AUTH_VERIFY_WORKERS, thread_name_prefix="scm-auth")
+        return _verify_pool
+
+
+def _verify_and_rehash(password: str, password_hash: str):
+    """검증 스레드에서 실행: (일치 여부, 비용이 바뀌었으면 새 해시)"""
+    if not verify_password(password, password_hash):
+        return False, None
+    if not needs_rehash(password_hash, BCRYPT_ROUNDS):
+        return True, None
+    return True, hash_password(password, BCRYPT_ROUNDS)
+
+
+def check_password(password: str, password_hash: str, timeout: float = AUTH_VERIFY_TIMEOUT_S):
+    """
+    비밀번호 검증 스레드 풀에서 검증합니다.
+    Returns: (일치 여부, 다시 해싱한 해시 또는 None). 풀이 밀려 timeout 안에 끝나지 않으면 TimeoutError
+    """
+    started = time.perf_counter()
+    future = _get_verify_pool().submit(_verify_and_rehash, password, password_hash)
+    try:
+        ok, new_hash = future.result(timeout=timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        PASSWORD_VERIFY_DURATION.observe(time.perf_counter() - started, outcome="timeout")
+        raise TimeoutError("비밀번호 검증 대기 시간 초과")
+    PASSWORD_VERIFY_DURATION.observe(time.perf_counter() - started, outcome="ok" if ok else "mismatch")
+    return ok, new_hash
+
+
+def update_password_hash(db, user_id: str, old_hash: str, new_hash: str) -> bool:
+    """비용이 바뀐 해시를 교체합니다 (쓰기 작업). 그사이 비밀번호가 바뀌었으면 건드리지 않습니다."""
+    updated = db.query(User).filter(User.user_id == user_id, User.password_hash == old_hash).update(
+        {User.password_hash: new_hash}, synchronize_session=False)
+    db.commit()
+    return updated > 0
+
+
 def login(username: str, password: str) -> tuple[bool, str, dict]:
     """
     로그인 처리
@@ -29,25 +106,197 @@ def login(username: str, password: str) -> tuple[bool, str, dict]:
         if not user:
             return False, "사용자명이 존재하지 않습니다.", {}
         
-        if not verify_password(password, user.password_hash):
+        try:
+            ok, new_hash = check_password(password, user.password_hash)
+        except TimeoutError:
+            return False, "로그인 요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요.", {}
+        if not ok:
             return False, "비밀번호가 일치하지 않습니다.", {}
+
+        if new_hash:
+            try:
+                if run_write(update_password_hash, user.user_id, user.password_hash, new_hash):
+                    PASSWORD_REHASHES.inc()
+            except Exception:
+                pass  # 다시 해싱하지 못해도 로그인은 성공 (다음 로그인 때 다시 시도)
         
-        user_info = {
-            "user_id": user.user_id,
-            "username": user.username,
-            "role": user.role,
-            "company_name": user.company_name
-        }
-        
-        return True, "로그인 성공", user_info
+        return True, "로그인 성공", _user_info(user)
     except Exception as e:
         return False, f"로그인 중 오류 발생: {str(e)}", {}
     finally:
         close_db(db)
 
 
+def _user_info(user: User) -> dict:
+    return {
+        "user_id": user.user_id,
+        "username": user.username,
+        "role": user.role,
+        "company_name": user.company_name
+    }
+
+
+# --- 세션 토큰 ---
+# 토큰 형식: "<session_id>.<만료 시각(epoch s)>.<HMAC-SHA256 서명>"
+# 서명과 만료는 DB 없이 확인하고, 통과한 토큰만 user_sessions 기본 키 조회 한 번으로 폐기 여부를 확인합니다.
+# 새로고침이나 새 탭에서도 bcrypt 검증 없이 로그인 상태를 이어받을 수 있습니다.
+
+def _read_secret_file(path: str):
+    """키 파일 내용, 파일이 없으면 None. 빈 키는 서명에 쓸 수 없으므로 거부합니다."""
+    try:
+        with open(path, "rb") as f:
+            key = f.read().strip()
+    except FileNotFoundError:
+        return None
+    if not key:
+        raise RuntimeError(f"세션 서명 키 파일이 비어 있습니다: {path} (파일을 지우면 새 키를 만듭니다)")
+    return key
+
+
+@lru_cache(maxsize=1)
+def _session_secret() -> bytes:
+    """
+    토큰 서명 키 (config.SESSION_SECRET, 없으면 키 파일을 만들어 프로세스 간에 공유)
+    키는 임시 파일에 다 쓴 뒤 os.link로 제자리에 놓으므로, 여러 프로세스가 동시에 시작해도 다른 프로세스가
+    쓰는 중인(빈) 파일을 읽지 않고, 먼저 놓인 키 하나를 모두 다시 읽어 사용합니다.
+    """
+    secret = (SESSION_SECRET or "").strip()
+    if secret:
+        return secret.encode("utf-8")
+    key = _read_secret_file(SESSION_SECRET_PATH)
+    if key is not None:
+        return key
+
+    directory = os.path.dirname(os.path.abspath(SESSION_SECRET_PATH))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".session_secret.")  # 0600
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(secrets.token_hex(32).encode("ascii"))
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.link(temp_path, SESSION_SECRET_PATH)
+        except FileExistsError:
+            pass  # 다른 프로세스가 먼저 만든 키를 사용
+    finally:
+        os.unlink(temp_path)
+    return _read_secret_file(SESSION_SECRET_PATH)
+
+
+def _sign(payload: str) -> str:
+    digest = hmac.new(_session_secret(), payload.encode("utf-8"), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
+def issue_session_token(db, user_id: str, now: datetime = None, ttl_hours: float = SESSION_TTL_HOURS) -> str:
+    """세션을 기록하고 서명된 토큰을 반환합니다 (쓰기 작업, run_write로 실행)."""
+    now = now or datetime.now()
+    expires_at = (now + timedelta(hours=ttl_hours)).replace(microsecond=0)
+    session_id = secrets.token_urlsafe(24)
+    db.add(UserSession(session_id=session_id, user_id=user_id, created_at=now, expires_at=expires_at))
+    db.commit()
+    payload = f"{session_id}.{int(expires_at.timestamp())}"
+    return f"{payload}.{_sign(payload)}"
+
+
+def parse_session_token(token: str, now: datetime = None):
+    """서명과 만료 시각을 확인하고 session_id를 반환합니다. 올바르지 않으면 None"""
+    try:
+        session_id, expires_ts, signature = token.split(".")
+        expires_at = datetime.fromtimestamp(int(expires_ts))
+    except (AttributeError, ValueError, OverflowError, OSError):
+        return None
+    if not hmac.compare_digest(signature, _sign(f"{session_id}.{expires_ts}")):
+        return None
+    if expires_at <= (now or datetime.now()):
+        return None
+    return session_id
+
+
+def validate_session_token(token: str, db=None, now: datetime = None):
+    """유효한 세션 토큰이면 사용자 정보를, 아니면 None을 반환합니다."""
+    now = now or datetime.now()
+    session_id = parse_session_token(token, now)
+    if session_id is None:
+        return None
+    own_session = db is None
+    db = db or get_db()
+    try:
+        row = db.query(UserSession, User).join(User, User.user_id == UserSession.user_id).filter(
+            UserSession.session_id == session_id
+        ).first()
+    finally:
+        if own_session:
+            close_db(db)
+    if row is None:
+        return None
+    session, user = row
+    if session.revoked_at is not None or session.expires_at <= now:
+        return None
+    return _user_info(user)
+
+
+def revoke_session_token(db, token: str) -> bool:
+    """세션을 폐기합니다 (쓰기 작업). 서명이 맞지 않는 토큰은 무시합니다."""
+    session_id = parse_session_token(token)
+    if session_id is None:
+        return False
+    updated = db.query(UserSession).filter(
+        UserSession.session_id == session_id, UserSession.revoked_at.is_(None)
+    ).update({UserSession.revoked_at: datetime.now()}, synchronize_session=False)
+    db.commit()
+    return updated > 0
+
+
+def purge_sessions(db, now: datetime = None) -> int:
+    """만료되었거나 폐기된 세션 삭제 (유지보수 작업)"""
+    now = now or datetime.now()
+    deleted = db.query(UserSession).filter(
+        (UserSession.expires_at <= now) | UserSession.revoked_at.isnot(None)
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+def start_session(user_info: dict):
+    """로그인 성공 후 세션 상태를 설정하고 토큰을 URL 파라미터로 넘겨 새로고침 후에도 유지합니다."""
+    st.session_state["authenticated"] = True
+    st.session_state["user"] = user_info
+    try:
+        token = run_write(issue_session_token, user_info["user_id"])
+    except Exception:
+        # 토큰을 만들지 못해도 현재 탭의 로그인은 유지합니다 (새로고침하면 다시 로그인).
+        return
+    st.session_state["session_token"] = token
+    st.query_params[SESSION_QUERY_PARAM] = token
+
+
+def _restore_session() -> bool:
+    """URL의 세션 토큰으로 로그인 상태를 복원합니다."""
+    token = st.query_params.get(SESSION_QUERY_PARAM)
+    if not token:
+        return False
+    user_info = validate_session_token(token)
+    if user_info is None:
+        del st.query_params[SESSION_QUERY_PARAM]
+        return False
+    st.session_state["authenticated"] = True
+    st.session_state["user"] = user_info
+    st.session_state["session_token"] = token
+    return True
+
+
 def logout():
     """로그아웃 처리"""
+    token = st.session_state.pop("session_token", None)
+    if token:
+        try:
+            run_write(revoke_session_token, token)
+        except Exception:
+            pass
+    if SESSION_QUERY_PARAM in st.query_params:
+        del st.query_params[SESSION_QUERY_PARAM]
     if "user" in st.session_state:
         del st.session_state["user"]
     if "authenticated" in st.session_state:
@@ -57,6 +306,8 @@ def logout():
 def is_authenticated() -> bool:
     """인증 상태 확인"""
     authenticated = st.session_state.get("authenticated", False)
+    if not authenticated:
+        authenticated = _restore_session()
     user = st.session_state.get("user", {})
     
     # 세션이 있지만 사용자 정보가 없으면 인증되지 않은 것으로 처리
@@ -123,8 +374,7 @@ def show_login_page():
             else:
                 success, message, user_info = login(username, password)
                 if success:
-                    st.session_state["authenticated"] = True
-                    st.session_state["user"] = user_info
+                    start_session(user_info)
                     st.session_state["current_page"] = "대시보드"  # 대시보드로 설정
                     st.success(message)
                     st.rerun()  # 페이지 새로고침하여 대시보드 표시
@@ -0,0 +1,231 @@
+"""
+엑셀 주문 행 검증 벤치마크
+
+10만 행 시트를 기준으로, 행마다 검증 함수를 호출하던 이전 구현(iterrows)과
+컬럼 단위로 검증하는 현재 구현(utils.excel_handler.validate_order_rows)의 시간을 비교하고
+두 구현의 결과(주문상세, 오류 메시지)가 같은지 확인합니다.
+시트에는 빈 품목명, 미등록 품목, 숫자가 아닌/0 이하 수량, 단가 불일치, 잘못된 날짜가 섞여 있습니다.
+
+--memory를 주면 같은 시트를 xlsx 파일로 저장한 뒤, 시트 전체를 읽는 parse_excel_file과
+청크 단위로 읽는 parse_excel_file_streaming을 각각 새 프로세스에서 실행하여 시간과 최대 메모리(RSS)를 비교합니다.
+
+--formats를 주면 같은 시트를 xlsx, CSV(UTF-8), CSV(CP949), TSV로 저장하여 업로드 파싱 시간(파일 읽기 + 검증)을 비교합니다.
+
+실행:
+    python -m benchmarks.bench_excel_parse --rows 100000
+    python -m benchmarks.bench_excel_parse --rows 200000 --memory
+    python -m benchmarks.bench_excel_parse --rows 100000 --formats
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.common import BENCH_ITEMS
+from utils.excel_handler import validate_order_rows
+from utils.validators import validate_item_name, validate_qty
+
+ITEM_DICT = {name: {"item_code": code, "unit_price": float(price)} for code, name, _, price in BENCH_ITEMS}
+
+
+def validate_order_rows_iterrows(df, item_dict):
+    """이전 구현 (행 단위 검증, 비교 기준)"""
+    order_details = []
+    errors = []
+    for idx, row in df.iterrows():
+        row_num = idx + 2
+        date_column = None
+        if "납품예정일" in df.columns:
+            date_column = "납품예정일"
+        elif "출하예정일" in df.columns:
+            date_column = "출하예정일"
+
+        item_name = str(row["품목명"]).strip() if pd.notna(row["품목명"]) else ""
+        is_valid, error_msg = validate_item_name(item_name)
+        if not is_valid:
+            errors.append((row_num, error_msg))
+            continue
+        if item_name not in item_dict:
+            errors.append((row_num, f"등록되지 않은 품목명입니다: {item_name}"))
+            continue
+        item_code = item_dict[item_name]["item_code"]
+        unit_price = item_dict[item_name]["unit_price"]
+        try:
+            order_qty = int(row["주문수량"])
+            is_valid, error_msg = validate_qty(order_qty)
+            if not is_valid:
+                errors.append((row_num, error_msg))
+                continue
+        except (ValueError, TypeError):
+            errors.append((row_num, "주문수량은 숫자여야 합니다."))
+            continue
+        if "단가" in df.columns and pd.notna(row["단가"]):
+            excel_unit_price = None
+            try:
+                excel_unit_price = float(row["단가"])
+            except (ValueError, TypeError):
+                pass
+            if excel_unit_price is not None and abs(excel_unit_price - unit_price) > 0.01:
+                errors.append((row_num, f"엑셀의 단가({excel_unit_price:,.0f})는 무시되고 품목 마스터의 단가({unit_price:,.0f})가 사용됩니다."))
+        planned_shipping_date = None
+        if date_column and pd.notna(row[date_column]):
+            try:
+                if isinstance(row[date_column], str):
+                    planned_shipping_date = pd.to_datetime(row[date_column]).date()
+                else:
+                    planned_shipping_date = row[date_column].date() if hasattr(row[date_column], 'date') else None
+            except Exception:
+                errors.append((row_num, "납품예정일 형식이 올바르지 않습니다."))
+        order_details.append((row_num, {
+            "item_code": item_code, "item_name": item_name, "order_qty": order_qty,
+            "unit_price": float(unit_price), "planned_shipping_date": planned_shipping_date,
+        }))
+    return order_details, errors
+
+
+def build_sheet(rows: int, seed: int = 42):
+    """오류가 섞인 주문 시트 (약 90%는 정상 행)"""
+    rng = random.Random(seed)
+    names = list(ITEM_DICT)
+    dates = [f"2026-{month:02d}-{day:02d}" for month in range(1, 13) for day in (1, 15, 28)]
+    data = {"품목명": [], "주문수량": [], "단가": [], "납품예정일": []}
+    for _ in range(rows):
+        name = rng.choice(names)
+        roll = rng.random()
+        data["품목명"].append(None if roll < 0.01 else "없는 품목" if roll < 0.02 else f" {name} ")
+        data["주문수량"].append("많이" if 0.02 <= roll < 0.03 else 0 if 0.03 <= roll < 0.04 else rng.randint(1, 500))
+        data["단가"].append(1.0 if 0.04 <= roll < 0.06 else ITEM_DICT[name]["unit_price"] if roll < 0.5 else None)
+        data["납품예정일"].append("31/31/2026" if 0.06 <= roll < 0.07 else rng.choice(dates) if roll < 0.8 else None)
+    return pd.DataFrame(data)
+
+
+class _LookupSession:
+    """품목 조회만 하는 가짜 세션 (메모리 측정 프로세스에서 DB 없이 실행)"""
+
+    def query(self, model):
+        from benchmarks.common import BENCH_ITEMS as items
+        from database.models import ItemMaster
+
+        class _Query:
+            def filter(self, *args):
+                return self
+
+            def all(self):
+                return [ItemMaster(item_code=code, item_name=name, unit_price=price) for code, name, _, price in items]
+
+        return _Query()
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss는 exec 이전 부모 프로세스의 값을 물려받으므로 Linux에서는 VmHWM을 사용
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_memory_worker(mode: str, path: str) -> dict:
+    from utils.excel_handler import parse_excel_file, parse_excel_file_streaming
+
+    parse = parse_excel_file_streaming if mode == "streaming" else parse_excel_file
+    import openpyxl, pandas  # noqa: F401  (import 비용은 비교에서 제외)
+    base_rss_mb = _peak_rss_mb()
+    t0 = time.perf_counter()
+    with open(path, "rb") as f:
+        success, details, _ = parse(f, _LookupSession())
+    elapsed_s = time.perf_counter() - t0
+    return {"elapsed_s": elapsed_s, "max_rss_mb": _peak_rss_mb(), "base_rss_mb": base_rss_mb, "details": len(details), "success": success}
+
+
+def bench_memory(df):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "orders.xlsx")
+        df.to_excel(path, index=False)
+        print(f"xlsx 파일 {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+        for mode in ("read_excel", "streaming"):
+            output = subprocess.run([sys.executable, "-m", "benchmarks.bench_excel_parse", "--worker-mode", mode, "--worker-path", path],
+                                    check=True, capture_output=True, text=True).stdout
+            r = json.loads(output)
+            print(f"  {mode:<11} {r['elapsed_s'] * 1000:>10.1f} ms  최대 RSS {r['max_rss_mb']:>7.1f} MB (+{r['max_rss_mb'] - r['base_rss_mb']:.1f})  (주문상세 {r['details']:,}행)")
+
+
+def bench_formats(df):
+    from utils.excel_handler import parse_excel_file, parse_excel_file_streaming, parse_csv_file
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files = {
+            "xlsx (전체 읽기)": ("orders.xlsx", parse_excel_file),
+            "xlsx (스트리밍)": ("orders.xlsx", parse_excel_file_streaming),
+            "CSV UTF-8": ("orders.csv", parse_csv_file),
+            "CSV CP949": ("orders_cp949.csv", parse_csv_file),
+            "TSV": ("orders.tsv", parse_csv_file),
+        }
+        df.to_excel(os.path.join(tmp_dir, "orders.xlsx"), index=False)
+        df.to_csv(os.path.join(tmp_dir, "orders.csv"), index=False, encoding="utf-8-sig")
+        df.to_csv(os.path.join(tmp_dir, "orders_cp949.csv"), index=False, encoding="cp949")
+        df.to_csv(os.path.join(tmp_dir, "orders.tsv"), index=False, sep="\t")
+
+        results, base_s = {}, None
+        for label, (file_name, parse) in files.items():
+            with open(os.path.join(tmp_dir, file_name), "rb") as f:
+                t0 = time.perf_counter()
+                results[label] = parse(f, _LookupSession())
+                elapsed_s = time.perf_counter() - t0
+            if results[label] != results["xlsx (전체 읽기)"]:
+                raise SystemExit(f"{label} 결과가 xlsx와 다릅니다.")
+            base_s = base_s or elapsed_s
+            print(f"  {label:<14} {elapsed_s * 1000:>10.1f} ms  ({base_s / elapsed_s:.1f}배)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="엑셀 주문 행 검증 벤치마크")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3, help="현재 구현 반복 횟수 (최솟값 사용)")
+    parser.add_argument("--memory", action="store_true", help="xlsx 파일 전체 읽기와 스트리밍 읽기의 메모리 비교")
+    parser.add_argument("--formats", action="store_true", help="xlsx와 CSV/TSV 업로드 파싱 시간 비교")
+    parser.add_argument("--worker-mode", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker_mode:
+        print(json.dumps(run_memory_worker(args.worker_mode, args.worker_path)))
+        return
+
+    df = build_sheet(args.rows)
+    if args.memory:
+        bench_memory(df)
+        return
+    if args.formats:
+        bench_formats(df)
+        return
+
+    t0 = time.perf_counter()
+    expected = validate_order_rows_iterrows(df, ITEM_DICT)
+    iterrows_s = time.perf_counter() - t0
+
+    vectorized_s = float("inf")
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        result = validate_order_rows(df, ITEM_DICT)
+        vectorized_s = min(vectorized_s, time.perf_counter() - t0)
+
+    if result != expected:
+        raise SystemExit("두 구현의 결과가 다릅니다.")
+    print(f"{args.rows:,}행 (정상 {len(result[0]):,}행, 오류 메시지 {len(result[1]):,}건) - 결과 동일")
+    print(f"  iterrows    {iterrows_s * 1000:>10.1f} ms")
+    print(f"  컬럼 단위   {vectorized_s * 1000:>10.1f} ms  ({iterrows_s / vectorized_s:.1f}배)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+그룹 커밋 쓰기 큐 처리량 벤치마크
+
+동시 사용자 N명(기본 50명)이 각각 주문을 연속으로 등록할 때,
+1) 사용자마다 세션을 열고 바로 커밋하는 기존 방식(direct)과
+2) GroupCommitWriter를 통해 배치로 커밋하는 방식(queued)의
+처리량과 지연 시간을 비교합니다.
+
+실행:
+    python -m benchmarks.bench_group_commit --users 50 --orders-per-user 20
+"""
+import argparse
+import threading
+import time
+from datetime import date
+
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import temp_database, percentile, BENCH_ITEMS
+from database.write_queue import GroupCommitWriter, create_writer_engine
+from services.order_service import create_order
+
+ORDER_DATA = {"order_date": date(2024, 6, 1), "order_type": "일반", "customer_company": "벤치마크회사"}
+DETAILS = [{
+    "item_code": code, "item_name": name, "order_qty": 10,
+    "unit_price": float(price), "planned_shipping_date": None,
+} for code, name, _, price in BENCH_ITEMS[:2]]
+
+
+def _run_users(users, orders_per_user, submit_one):
+    latencies, errors = [], {"locked": 0, "integrity": 0, "other": 0}
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(users)
+
+    def worker(idx):
+        user = {"username": f"bench_user_{idx:03d}"}
+        start_barrier.wait()
+        for _ in range(orders_per_user):
+            t0 = time.perf_counter()
+            try:
+                submit_one(user)
+                elapsed = time.perf_counter() - t0
+                with lock:
+                    latencies.append(elapsed)
+            except OperationalError as e:
+                with lock:
+                    errors["locked" if "locked" in str(e) else "other"] += 1
+            except IntegrityError:
+                with lock:
+                    errors["integrity"] += 1
+            except Exception:
+                with lock:
+                    errors["other"] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(users)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+    return wall, latencies, errors
+
+
+def bench_direct(users, orders_per_user):
+    with temp_database() as (_, engine, session_factory):
+        def submit_one(user):
+            db = session_factory()
+            try:
+                create_order(db, user, ORDER_DATA, DETAILS)
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+        return _run_users(users, orders_per_user, submit_one) + ({},)
+
+
+def bench_queued(users, orders_per_user, window_ms, max_batch):
+    with temp_database() as (db_path, _, _):
+        writer_engine = create_writer_engine(f"sqlite:///{db_path}")
+        writer = GroupCommitWriter(
+            session_factory=sessionmaker(autocommit=False, autoflush=False, bind=writer_engine),
+            window_ms=window_ms, max_batch=max_batch,
+        ).start()
+        try:
+            result = _run_users(users, orders_per_user, lambda user: writer.execute(create_order, user, ORDER_DATA, DETAILS))
+        finally:
+            writer.stop()
+            writer_engine.dispose()
+        return result + ({"batches": writer.batches_committed, "commands": writer.commands_processed},)
+
+
+def _report(label, wall, latencies, errors, extra):
+    ms = [v * 1000 for v in latencies]
+    print(f"[{label}]")
+    print(f"  성공: {len(latencies):,}건 / {wall:.2f}s -> {len(latencies) / wall:,.1f} orders/s")
+    print(f"  지연(ms): p50={percentile(ms, 50):.1f} p95={percentile(ms, 95):.1f} p99={percentile(ms, 99):.1f}")
+    print(f"  오류: 잠금={errors['locked']} 중복키={errors['integrity']} 기타={errors['other']}")
+    if extra.get("batches"):
+        print(f"  배치: {extra['batches']}회 커밋, 평균 {extra['commands'] / extra['batches']:.1f}건/커밋")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="그룹 커밋 쓰기 큐 처리량 벤치마크")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--orders-per-user", type=int, default=20)
+    parser.add_argument("--window-ms", type=float, default=5)
+    parser.add_argument("--max-batch", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"동시 사용자 {args.users}명, 사용자당 주문 {args.orders_per_user}건")
+    _report("direct (요청마다 커밋)", *bench_direct(args.users, args.orders_per_user))
+    _report("queued (그룹 커밋)", *bench_queued(args.users, args.orders_per_user, args.window_ms, args.max_batch))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+주문 일괄 수신 API 처리량 벤치마크
+
+임시 데이터베이스로 api.ingest_server를 별도 프로세스에서 띄우고, 로컬 클라이언트 N개가
+keep-alive 연결로 주문 묶음을 연속으로 보낼 때의 초당 주문 처리량과 요청 지연 시간을 측정합니다.
+마지막에는 같은 멱등성 키로 다시 보내 중복 요청이 새 주문 없이 처리되는지도 확인합니다.
+
+실행:
+    python -m benchmarks.bench_ingest --clients 4 --requests 20 --batch 500
+"""
+import argparse
+import base64
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from benchmarks.common import percentile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CUSTOMERS = [("samsung_sdi", "samsung123"), ("hyundai_motor", "hyundai123")]
+ITEM_CODES = ["ITEM001", "ITEM002", "ITEM003", "ITEM004"]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_until_ready(port: int, timeout_s: float = 30):
+    deadline = time.time() + timeout_s
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("수신 API가 시작되지 않았습니다.")
+
+
+def _auth_header(username: str, password: str) -> str:
+    return "Basic " + base64.b64encode(f"{username}:{password}".encode()).decode()
+
+
+def _warm_up(port: int):
+    """계정별 첫 인증(bcrypt 검증)은 측정에서 제외합니다. 빈 요청은 인증 후 400으로 끝납니다."""
+    for username, password in CUSTOMERS:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        conn.request("POST", "/api/orders/batch", body=b"{}", headers={"Authorization": _auth_header(username, password)})
+        conn.getresponse().read()
+        conn.close()
+
+
+def _batch(client: int, request: int, size: int) -> bytes:
+    order_date = date.today()
+    orders = [{
+        "idempotency_key": f"bench-{client}-{request}-{i}",
+        "order_date": order_date.isoformat(),
+        "order_type": "일반",
+        "lines": [{"item_code": ITEM_CODES[(i + n) % len(ITEM_CODES)], "order_qty": 10 * (n + 1),
+                   "planned_shipping_date": (order_date + timedelta(days=90)).isoformat()} for n in range(1 + i % 3)],
+    } for i in range(size)]
+    return json.dumps({"orders": orders}).encode("utf-8")
+
+
+def _run_clients(port: int, clients: int, requests: int, batch: int):
+    latencies, totals = [], {"created": 0, "duplicates": 0, "rejected": 0, "errors": 0}
+    lock = threading.Lock()
+    bodies = {(c, r): _batch(c, r, batch) for c in range(clients) for r in range(requests)}
+
+    def worker(client):
+        username, password = CUSTOMERS[client % len(CUSTOMERS)]
+        headers = {"Content-Type": "application/json",
+                   "Authorization": _auth_header(username, password)}
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+        for r in range(requests):
+            t0 = time.perf_counter()
+            conn.request("POST", "/api/orders/batch", body=bodies[(client, r)], headers=headers)
+            response = conn.getresponse()
+            result = json.loads(response.read())
+            elapsed = time.perf_counter() - t0
+            with lock:
+                latencies.append(elapsed)
+                if response.status != 200:
+                    totals["errors"] += 1
+                    continue
+                for key in ("created", "duplicates", "rejected"):
+                    totals[key] += result[key]
+        conn.close()
+
+    threads = [threading.Thread(target=worker, args=(c,)) for c in range(clients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - t0, latencies, totals
+
+
+def _report(label: str, wall: float, latencies: list, totals: dict):
+    ms = [v * 1000 for v in latencies]
+    processed = totals["created"] + totals["duplicates"]
+    print(f"[{label}]")
+    print(f"  주문: 생성 {totals['created']:,} / 중복 {totals['duplicates']:,} / 거부 {totals['rejected']:,} "
+          f"/ 실패 요청 {totals['errors']} ({wall:.2f}s -> {processed / wall:,.0f} orders/s)")
+    print(f"  요청 지연(ms): p50={percentile(ms, 50):.1f} p95={percentile(ms, 95):.1f} p99={percentile(ms, 99):.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="주문 일괄 수신 API 처리량 벤치마크")
+    parser.add_argument("--clients", type=int, default=4, help="동시 클라이언트 수")
+    parser.add_argument("--requests", type=int, default=20, help="클라이언트당 요청 수")
+    parser.add_argument("--batch", type=int, default=500, help="요청당 주문 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        port = _free_port()
+        env = dict(os.environ, SCM_DB_PATH=os.path.join(tmp_dir, "ingest.db"), SCM_SLOW_QUERY_MS="100000")
+        server = subprocess.Popen([sys.executable, "-m", "api.ingest_server", "--port", str(port)], cwd=ROOT_DIR, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            _wait_until_ready(port)
+            _warm_up(port)
+            print(f"클라이언트 {args.clients}개 × 요청 {args.requests}회 × 주문 {args.batch}건")
+            _report("신규 주문", *_run_clients(port, args.clients, args.requests, args.batch))
+            _report("같은 멱등성 키로 재전송", *_run_clients(port, args.clients, args.requests, args.batch))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+로그인(비밀번호 검증) 처리량 벤치마크
+
+bcrypt 비용(--costs)마다 동시 사용자 N명이 로그인을 반복할 때,
+검증 스레드 풀(--workers) 크기에 따른 처리량, 지연 시간, 로그인당 CPU 시간을 비교합니다.
+비교용으로 세션 토큰 복원(HMAC 확인)에 드는 시간도 함께 출력합니다.
+
+실행:
+    python -m benchmarks.bench_login --costs 10,11,12,13 --clients 16 --logins 10 --workers 4
+"""
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import percentile
+from auth.auth import hash_password, verify_password, parse_session_token, _sign
+
+PASSWORD = "bench-password-123"
+
+
+def bench_cost(cost: int, clients: int, logins: int, workers: int) -> dict:
+    password_hash = hash_password(PASSWORD, rounds=cost)
+    t0 = time.perf_counter()
+    verify_password(PASSWORD, password_hash)
+    single = time.perf_counter() - t0
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    latencies, lock = [], threading.Lock()
+    start_barrier = threading.Barrier(clients)
+
+    def client():
+        start_barrier.wait()
+        for _ in range(logins):
+            t = time.perf_counter()
+            pool.submit(verify_password, PASSWORD, password_hash).result()
+            elapsed = time.perf_counter() - t
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+    pool.shutdown()
+    return {"cost": cost, "single": single, "wall": wall, "cpu": cpu, "latencies": latencies}
+
+
+def bench_token(repeat: int = 10000) -> float:
+    expires_ts = int(time.time()) + 3600
+    payload = f"bench-session-id.{expires_ts}"
+    token = f"{payload}.{_sign(payload)}"
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        parse_session_token(token)
+    return (time.perf_counter() - t0) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로그인 처리량 벤치마크 (bcrypt 비용별)")
+    parser.add_argument("--costs", default="10,11,12,13", help="비교할 bcrypt 비용 (쉼표로 구분)")
+    parser.add_argument("--clients", type=int, default=16, help="동시에 로그인하는 사용자 수")
+    parser.add_argument("--logins", type=int, default=10, help="사용자당 로그인 횟수")
+    parser.add_argument("--workers", type=int, default=4, help="검증 스레드 풀 크기 (config.AUTH_VERIFY_WORKERS)")
+    args = parser.parse_args()
+
+    print(f"CPU {os.cpu_count()}개, 동시 사용자 {args.clients}명 x {args.logins}회, 검증 워커 {args.workers}개")
+    print(f"{'비용':>4} {'단건(ms)':>9} {'logins/s':>9} {'p50(ms)':>9} {'p95(ms)':>9} {'CPU/로그인(ms)':>14}")
+    for cost in (int(c) for c in args.costs.split(",")):
+        r = bench_cost(cost, args.clients, args.logins, args.workers)
+        ms = [v * 1000 for v in r["latencies"]]
+        n = len(ms)
+        print(f"{cost:>4} {r['single'] * 1000:>9.1f} {n / r['wall']:>9.1f} {percentile(ms, 50):>9.1f} "
+              f"{percentile(ms, 95):>9.1f} {r['cpu'] / n * 1000:>14.1f}")
+    print(f"세션 토큰 복원(HMAC 확인): {bench_token() * 1e6:.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
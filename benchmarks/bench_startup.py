@@ -0,0 +1,116 @@
+"""
+콜드 스타트 벤치마크
+
+새 프로세스에서 app.py를 Streamlit AppTest로 실행하여 로그인 화면까지의 시간과,
+로그인 후 각 페이지를 처음 열 때(페이지 모듈 import 포함)와 다시 열 때의 시간을 측정합니다.
+페이지마다 별도 프로세스를 사용하므로 앞선 페이지가 불러온 모듈의 영향을 받지 않습니다.
+
+실행:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --repeat 5 --json startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+# 페이지별로 접근 가능한 역할의 기본 계정
+PAGE_USERS = {
+    "대시보드": ("order_manager", "주문담당자", "세방리튬배터리"),
+    "주문등록": ("samsung_sdi", "발주사", "삼성SDI"),
+    "주문승인": ("order_manager", "주문담당자", "세방리튬배터리"),
+    "입고등록": ("manufacturing", "제조담당자", "세방리튬배터리"),
+    "출하계획": ("order_manager", "주문담당자", "세방리튬배터리"),
+    "출하등록": ("samsung_sdi", "발주사", "삼성SDI"),
+}
+HEAVY_MODULES = ("pandas", "openpyxl")
+
+
+def run_worker(page: str) -> dict:
+    """현재 프로세스에서 로그인 화면 → 페이지 첫 방문 → 재방문 순서로 측정"""
+    import time
+
+    t0 = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT_DIR, "app.py"), default_timeout=120)
+    at.run()
+    login_ms = (time.perf_counter() - t0) * 1000
+    heavy_at_login = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    username, role, company = PAGE_USERS[page]
+    at.session_state["authenticated"] = True
+    at.session_state["user"] = {"user_id": username, "username": username, "role": role, "company_name": company}
+    at.session_state["current_page"] = page
+
+    t1 = time.perf_counter()
+    at.run()
+    first_ms = (time.perf_counter() - t1) * 1000
+
+    t2 = time.perf_counter()
+    at.run()
+    warm_ms = (time.perf_counter() - t2) * 1000
+
+    if at.exception:
+        raise RuntimeError(f"{page} 페이지 실행 오류: {at.exception[0].value}")
+    return {"login_ms": login_ms, "first_ms": first_ms, "warm_ms": warm_ms, "heavy_at_login": heavy_at_login}
+
+
+def measure(page: str, db_path: str) -> dict:
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        output = f.name
+    try:
+        env = dict(os.environ, SCM_DB_PATH=db_path, SCM_METRICS_HTTP="0")
+        subprocess.run([sys.executable, "-m", "benchmarks.bench_startup", "--worker-page", page, "--worker-output", output],
+                       cwd=ROOT_DIR, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        with open(output, encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        os.unlink(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="콜드 스타트 벤치마크")
+    parser.add_argument("--repeat", type=int, default=3, help="페이지별 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--pages", default=",".join(PAGE_USERS), help="측정할 페이지 (쉼표 구분)")
+    parser.add_argument("--json", dest="json_path", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--worker-page", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker_page:
+        with open(args.worker_output, "w", encoding="utf-8") as f:
+            json.dump(run_worker(args.worker_page), f)
+        return
+
+    pages = [p for p in args.pages.split(",") if p]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "startup.db")
+        # 기본 계정/품목 생성과 스키마 점검 비용은 첫 측정에서 한 번만 발생하도록 미리 초기화합니다.
+        subprocess.run([sys.executable, "-c", "from database.db_init import init_db; init_db()"], cwd=ROOT_DIR,
+                       env=dict(os.environ, SCM_DB_PATH=db_path), check=True, stdout=subprocess.DEVNULL)
+
+        results = {}
+        for page in pages:
+            runs = [measure(page, db_path) for _ in range(args.repeat)]
+            results[page] = {key: round(statistics.median(r[key] for r in runs), 1) for key in ("login_ms", "first_ms", "warm_ms")}
+            results[page]["heavy_at_login"] = runs[-1]["heavy_at_login"]
+
+    print(f"{'페이지':<10}{'로그인 화면ms':>14}{'첫 방문ms':>12}{'재방문ms':>12}  로그인 시 로드된 무거운 모듈")
+    for page, r in results.items():
+        print(f"{page:<10}{r['login_ms']:>14.1f}{r['first_ms']:>12.1f}{r['warm_ms']:>12.1f}  {', '.join(r['heavy_at_login']) or '-'}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+벤치마크 공통 유틸리티 (임시 데이터베이스, 백분위수 계산)
+"""
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from decimal import Decimal
+
+# 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from config import SQLITE_BUSY_TIMEOUT_MS
+from database.connection import apply_sqlite_pragmas
+from database.models import Base, ItemMaster
+
+BENCH_ITEMS = [
+    ("ITEM001", "ESS (Energy Storage System)", 30, Decimal("400000.00")),
+    ("ITEM002", "EV 모듈 (Electric Vehicle Module)", 30, Decimal("150000.00")),
+    ("ITEM003", "SV (가정: 차량용 보조전원/저전압 시스템 등 소형 팩)", 45, Decimal("250000.00")),
+    ("ITEM004", "PLBM (Parking LBM, 특정 제품군)", 60, Decimal("400000.00")),
+]
+
+
+def create_bench_engine(db_path: str):
+    """애플리케이션과 같은 PRAGMA 설정을 적용한 엔진 생성"""
+    return apply_sqlite_pragmas(create_engine(
+        f"sqlite:///{db_path}",
+        echo=False,
+        connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+    ))
+
+
+@contextmanager
+def temp_database():
+    """
+    스키마와 기본 품목이 준비된 임시 SQLite 데이터베이스
+    Yields: (db_path, engine, session_factory)
+    """
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    engine = create_bench_engine(db_path)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = session_factory()
+    try:
+        for code, name, lead_time, price in BENCH_ITEMS:
+            db.add(ItemMaster(item_code=code, item_name=name, lead_time_days=lead_time, unit_price=price, is_active="Y"))
+        db.commit()
+    finally:
+        db.close()
+
+    try:
+        yield db_path, engine, session_factory
+    finally:
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.unlink(db_path + suffix)
+
+
+def percentile(values, pct: float) -> float:
+    """정렬 후 선형 보간으로 백분위수 계산 (값이 없으면 0)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lower = int(k)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
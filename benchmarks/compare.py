@@ -0,0 +1,101 @@
+"""
+벤치마크 결과 비교
+
+기준(baseline) 결과와 새 결과의 함수별 중앙값을 비교하여, 임계값을 넘게 느려진 항목을 회귀로 표시합니다.
+회귀가 하나라도 있으면 종료 코드 1을 반환하므로 릴리스 전 점검에 사용할 수 있습니다.
+
+실행:
+    python -m benchmarks.compare benchmarks/baseline.json benchmarks/results/latest.json --threshold 0.25
+    python -m benchmarks.compare --update-baseline benchmarks/results/latest.json
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def compare_results(baseline: dict, current: dict, threshold: float, min_delta_ms: float) -> list:
+    """
+    (규모, 함수명, 기준 ms, 현재 ms, 비율, 판정) 목록 반환
+    판정: "regression" / "improvement" / "ok" / "new" / "missing"
+    절대 차이가 min_delta_ms 미만이면 측정 잡음으로 보고 ok로 처리합니다.
+    """
+    rows = []
+    base_results = baseline.get("results", {})
+    cur_results = current.get("results", {})
+    for scale in sorted(set(base_results) | set(cur_results), key=int):
+        base_scale = base_results.get(scale, {})
+        cur_scale = cur_results.get(scale, {})
+        for name in sorted(set(base_scale) | set(cur_scale)):
+            base = base_scale.get(name, {}).get("median_ms")
+            cur = cur_scale.get(name, {}).get("median_ms")
+            if base is None and cur is None:
+                continue
+            if base is None:
+                rows.append((scale, name, None, cur, None, "new"))
+                continue
+            if cur is None:
+                rows.append((scale, name, base, None, None, "missing"))
+                continue
+            ratio = cur / base if base > 0 else float("inf")
+            verdict = "ok"
+            if abs(cur - base) >= min_delta_ms:
+                if ratio > 1 + threshold:
+                    verdict = "regression"
+                elif ratio < 1 / (1 + threshold):
+                    verdict = "improvement"
+            rows.append((scale, name, base, cur, ratio, verdict))
+    return rows
+
+
+def print_report(rows, show_all: bool):
+    marks = {"regression": "▲ 회귀", "improvement": "▼ 개선", "ok": "", "new": "신규", "missing": "누락"}
+    print(f"{'규모':>9}  {'함수':<72}{'기준ms':>11}{'현재ms':>11}{'비율':>8}  판정")
+    for scale, name, base, cur, ratio, verdict in rows:
+        if not show_all and verdict == "ok":
+            continue
+        base_s = f"{base:.2f}" if base is not None else "-"
+        cur_s = f"{cur:.2f}" if cur is not None else "-"
+        ratio_s = f"{ratio:.2f}x" if ratio is not None else "-"
+        print(f"{int(scale):>9,}  {name:<72}{base_s:>11}{cur_s:>11}{ratio_s:>8}  {marks[verdict]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 결과 비교")
+    parser.add_argument("baseline", nargs="?", default=BASELINE_PATH, help="기준 결과 JSON")
+    parser.add_argument("current", nargs="?", help="새 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.25, help="회귀로 판단할 상대 증가율 (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="이보다 작은 절대 차이는 무시")
+    parser.add_argument("--all", action="store_true", help="변화 없는 항목도 출력")
+    parser.add_argument("--update-baseline", metavar="RESULT", help="지정한 결과로 저장된 기준 결과를 교체")
+    args = parser.parse_args()
+
+    if args.update_baseline:
+        shutil.copyfile(args.update_baseline, BASELINE_PATH)
+        print(f"기준 결과 갱신: {BASELINE_PATH}")
+        return 0
+
+    if not args.current:
+        parser.error("비교할 결과 파일을 지정해주세요.")
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+
+    rows = compare_results(baseline, current, args.threshold, args.min_delta_ms)
+    print_report(rows, args.all)
+
+    regressions = [r for r in rows if r[5] == "regression"]
+    if regressions:
+        print(f"\n회귀 {len(regressions)}건 (임계값 {args.threshold:.0%})")
+        return 1
+    print(f"\n회귀 없음 (임계값 {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+"""
+서비스 계층 부하 테스트
+
+실제 서비스 함수(create_order → approve_order → register_receipts → create_shipping_plans
+→ instruct_shipping_plans → confirm_shipment_received)를 여러 스레드/프로세스에서 역할별 비율에 맞춰
+동시에 호출하고, 작업별 처리량과 p50/p95/p99 지연 시간, 잠금 경합/동시성 충돌 오류를 보고합니다.
+기본적으로 임시 SQLite 데이터베이스를 사용하므로 운영 데이터에 영향을 주지 않습니다.
+
+실행:
+    python -m benchmarks.load_test --threads 16 --duration 30 --mix 발주사=2,주문담당자=1,제조담당자=1
+    python -m benchmarks.load_test --processes 4 --threads 8 --json load_result.json
+    python -m benchmarks.load_test --preload-orders 100000   # 합성 데이터 10만 건을 미리 적재
+"""
+import argparse
+import json
+import multiprocessing
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import date
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import temp_database, create_bench_engine, percentile, BENCH_ITEMS
+from database.models import OrderMaster, OrderDetail, ShippingPlan
+from database.seed_data import generate
+from services.exceptions import ConcurrencyConflictError
+from services.order_service import create_order
+from services.approval_service import approve_order
+from services.warehousing_service import get_detailed_receipt_status, register_receipts
+from services.shipping_service import create_shipping_plans, instruct_shipping_plans
+from services.shipping_registration_service import confirm_shipment_received
+
+ROLES = ("발주사", "주문담당자", "제조담당자")
+CUSTOMERS = ("삼성SDI", "현대자동차")
+DEFAULT_MIX = "발주사=2,주문담당자=1,제조담당자=1"
+
+
+class _NoWork(Exception):
+    """현재 역할이 처리할 대상이 없음 (오류가 아니라 유휴 상태)"""
+
+
+def _pick(db, query):
+    """대기열 앞쪽 몇 건 중 하나를 무작위로 골라 작업자 간 충돌을 현실적인 수준으로 유지"""
+    candidates = query.limit(8).all()
+    if not candidates:
+        raise _NoWork()
+    return random.choice(candidates)
+
+
+def op_create_order(db, worker):
+    items = random.sample(BENCH_ITEMS, k=random.randint(1, 3))
+    details = [{
+        "item_code": code, "item_name": name, "order_qty": random.randint(10, 200),
+        "unit_price": float(price), "planned_shipping_date": None,
+    } for code, name, _, price in items]
+    order_data = {"order_date": date.today(), "order_type": random.choice(["일반", "일반", "긴급"]),
+                  "customer_company": worker["company"]}
+    create_order(db, {"username": worker["username"]}, order_data, details)
+
+
+def op_approve_order(db, worker):
+    order = _pick(db, db.query(OrderMaster).filter(OrderMaster.status == "대기").order_by(OrderMaster.created_at))
+    approve_order(db, order, random.randint(1, 9), worker["username"])
+
+
+def op_register_receipts(db, worker):
+    order = _pick(db, db.query(OrderMaster).filter(OrderMaster.status.in_(["승인", "생산중"])).order_by(OrderMaster.order_no))
+    items = []
+    for status in get_detailed_receipt_status(db, order.order_no):
+        if status["remaining_qty"] <= 0:
+            continue
+        detail = status["detail"]
+        qty = status["remaining_qty"] if random.random() < 0.6 else random.randint(1, status["remaining_qty"])
+        items.append({"order_no": detail.order_no, "order_seq": detail.order_seq, "item_code": detail.item_code,
+                      "item_name": detail.item_name, "received_qty": qty, "received_date": date.today()})
+    if not items:
+        raise _NoWork()
+    register_receipts(db, order, items, worker["username"])
+
+
+def op_create_shipping_plans(db, worker):
+    detail = _pick(db, db.query(OrderDetail).join(OrderMaster).filter(
+        OrderMaster.status == "입고완료", OrderDetail.planned_qty < OrderDetail.received_qty))
+    available = detail.received_qty - detail.planned_qty
+    create_shipping_plans(db, [{"order_no": detail.order_no, "order_seq": detail.order_seq,
+                                "planned_qty": available, "planned_date": date.today()}], worker["username"])
+
+
+def op_instruct_shipping_plans(db, worker):
+    plan = _pick(db, db.query(ShippingPlan).filter(ShippingPlan.status == "계획"))
+    plans = db.query(ShippingPlan).filter_by(order_no=plan.order_no, status="계획").all()
+    instruct_shipping_plans(db, plans)
+
+
+def op_confirm_shipment(db, worker):
+    plan = _pick(db, db.query(ShippingPlan).join(OrderMaster).filter(
+        ShippingPlan.status == "지시", OrderMaster.customer_company == worker["company"]))
+    order = db.get(OrderMaster, plan.order_no)
+    detail = db.get(OrderDetail, (plan.order_no, plan.order_seq))
+    confirm_shipment_received(db, order, [{"plan": plan, "detail": detail, "received_qty": plan.planned_qty,
+                                           "received_date": date.today()}])
+
+
+# 역할별로 시도하는 작업과 가중치
+ROLE_OPERATIONS = {
+    "발주사": [(op_create_order, 3), (op_confirm_shipment, 2)],
+    "주문담당자": [(op_approve_order, 2), (op_create_shipping_plans, 2), (op_instruct_shipping_plans, 1)],
+    "제조담당자": [(op_register_receipts, 1)],
+}
+
+
+def parse_mix(text: str) -> dict:
+    """'발주사=2,주문담당자=1' 형식의 역할 비율 파싱"""
+    mix = {}
+    for part in text.split(","):
+        role, _, weight = part.partition("=")
+        role = role.strip()
+        if role not in ROLES:
+            raise ValueError(f"알 수 없는 역할입니다: {role} (가능한 값: {', '.join(ROLES)})")
+        mix[role] = int(weight or 1)
+    return mix
+
+
+def assign_roles(mix: dict, count: int, offset: int = 0) -> list:
+    """비율에 맞게 작업자 역할 배정 (가장 부족한 역할부터 채움)"""
+    total = sum(mix.values())
+    assigned = defaultdict(int)
+    roles = []
+    for i in range(offset, offset + count):
+        role = max(mix, key=lambda r: mix[r] / total * (i + 1) - assigned[r])
+        assigned[role] += 1
+        roles.append(role)
+    return roles
+
+
+def _classify_error(error) -> str:
+    if isinstance(error, ConcurrencyConflictError):
+        return "conflict"
+    if isinstance(error, OperationalError) and ("locked" in str(error) or "busy" in str(error)):
+        return "locked"
+    if isinstance(error, IntegrityError):
+        return "integrity"
+    return "other"
+
+
+def _worker_loop(session_factory, worker, deadline, results, lock):
+    operations, weights = zip(*ROLE_OPERATIONS[worker["role"]])
+    local = defaultdict(lambda: {"latencies": [], "errors": defaultdict(int), "idle": 0})
+    while time.perf_counter() < deadline:
+        op = random.choices(operations, weights)[0]
+        stats = local[op.__name__]
+        db = session_factory()
+        t0 = time.perf_counter()
+        try:
+            op(db, worker)
+            stats["latencies"].append(time.perf_counter() - t0)
+        except _NoWork:
+            stats["idle"] += 1
+            time.sleep(0.005)
+        except Exception as e:
+            db.rollback()
+            stats["errors"][_classify_error(e)] += 1
+        finally:
+            db.close()
+    with lock:
+        for name, stats in local.items():
+            merged = results.setdefault(name, {"latencies": [], "errors": defaultdict(int), "idle": 0})
+            merged["latencies"].extend(stats["latencies"])
+            merged["idle"] += stats["idle"]
+            for kind, count in stats["errors"].items():
+                merged["errors"][kind] += count
+
+
+def run_workers(db_path, roles, duration, worker_offset=0, seed=None):
+    """한 프로세스 안에서 역할별 스레드를 실행하고 작업별 결과를 반환"""
+    random.seed(seed)
+    engine = create_bench_engine(db_path)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    results, lock = {}, threading.Lock()
+    deadline = time.perf_counter() + duration
+    threads = []
+    for i, role in enumerate(roles):
+        idx = worker_offset + i
+        worker = {"role": role, "username": f"load_{role}_{idx:03d}", "company": CUSTOMERS[idx % len(CUSTOMERS)]}
+        threads.append(threading.Thread(target=_worker_loop, args=(session_factory, worker, deadline, results, lock)))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    engine.dispose()
+    # 프로세스 경계를 넘기기 위해 일반 dict로 변환
+    return {name: {"latencies": s["latencies"], "errors": dict(s["errors"]), "idle": s["idle"]} for name, s in results.items()}
+
+
+def _run_process(args):
+    return run_workers(*args)
+
+
+def summarize(results, wall):
+    """작업별 처리량/지연 시간/오류 요약"""
+    summary = {"wall_seconds": round(wall, 3), "operations": {}}
+    total_ok, total_errors = 0, defaultdict(int)
+    for name in sorted(results):
+        stats = results[name]
+        ms = [v * 1000 for v in stats["latencies"]]
+        total_ok += len(ms)
+        for kind, count in stats["errors"].items():
+            total_errors[kind] += count
+        summary["operations"][name] = {
+            "ok": len(ms),
+            "throughput_per_s": round(len(ms) / wall, 2),
+            "p50_ms": round(percentile(ms, 50), 2),
+            "p95_ms": round(percentile(ms, 95), 2),
+            "p99_ms": round(percentile(ms, 99), 2),
+            "errors": dict(stats["errors"]),
+            "idle": stats["idle"],
+        }
+    summary["total"] = {"ok": total_ok, "throughput_per_s": round(total_ok / wall, 2), "errors": dict(total_errors)}
+    return summary
+
+
+def print_summary(summary):
+    print(f"{'작업':<28}{'성공':>8}{'ops/s':>10}{'p50ms':>9}{'p95ms':>9}{'p99ms':>9}  {'잠금':>5}{'충돌':>5}{'중복':>5}{'기타':>5}")
+    for name, s in summary["operations"].items():
+        e = s["errors"]
+        print(f"{name:<28}{s['ok']:>8}{s['throughput_per_s']:>10.1f}{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}{s['p99_ms']:>9.1f}  "
+              f"{e.get('locked', 0):>5}{e.get('conflict', 0):>5}{e.get('integrity', 0):>5}{e.get('other', 0):>5}")
+    t = summary["total"]
+    print(f"합계: {t['ok']:,}건 / {summary['wall_seconds']:.1f}s -> {t['throughput_per_s']:,.1f} ops/s, 오류 {t['errors']}")
+
+
+def run_load_test(db_path, threads, processes, duration, mix, seed=None):
+    """프로세스 × 스레드 작업자를 실행하고 요약을 반환"""
+    per_process = [assign_roles(mix, threads, offset=p * threads) for p in range(processes)]
+    t0 = time.perf_counter()
+    if processes == 1:
+        partials = [run_workers(db_path, per_process[0], duration, 0, seed)]
+    else:
+        jobs = [(db_path, roles, duration, p * threads, None if seed is None else seed + p) for p, roles in enumerate(per_process)]
+        with multiprocessing.Pool(processes) as pool:
+            partials = pool.map(_run_process, jobs)
+    wall = time.perf_counter() - t0
+
+    merged = {}
+    for partial in partials:
+        for name, stats in partial.items():
+            m = merged.setdefault(name, {"latencies": [], "errors": defaultdict(int), "idle": 0})
+            m["latencies"].extend(stats["latencies"])
+            m["idle"] += stats["idle"]
+            for kind, count in stats["errors"].items():
+                m["errors"][kind] += count
+    return summarize(merged, wall)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서비스 계층 부하 테스트")
+    parser.add_argument("--threads", type=int, default=16, help="프로세스당 작업자 스레드 수")
+    parser.add_argument("--processes", type=int, default=1, help="작업자 프로세스 수")
+    parser.add_argument("--duration", type=float, default=20, help="실행 시간(초)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="역할 비율 (예: 발주사=2,주문담당자=1,제조담당자=1)")
+    parser.add_argument("--db", help="기존 데이터베이스 파일 경로 (지정하지 않으면 임시 DB 사용)")
+    parser.add_argument("--seed", type=int, help="난수 시드")
+    parser.add_argument("--preload-orders", type=int, default=0, help="임시 DB에 미리 적재할 합성 주문 수")
+    parser.add_argument("--json", dest="json_path", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    print(f"작업자: {args.processes} 프로세스 × {args.threads} 스레드, 역할 비율 {mix}, {args.duration:.0f}초")
+
+    if args.db:
+        summary = run_load_test(args.db, args.threads, args.processes, args.duration, mix, args.seed)
+    else:
+        with temp_database() as (db_path, engine, _):
+            if args.preload_orders:
+                t0 = time.perf_counter()
+                generate(engine, args.preload_orders, seed=args.seed if args.seed is not None else 42)
+                print(f"합성 데이터 적재: 주문 {args.preload_orders:,}건 ({time.perf_counter() - t0:.1f}s)")
+            summary = run_load_test(db_path, args.threads, args.processes, args.duration, mix, args.seed)
+
+    summary["config"] = {"threads": args.threads, "processes": args.processes, "duration": args.duration, "mix": mix}
+    print_summary(summary)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
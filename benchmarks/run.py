@@ -0,0 +1,365 @@
+"""
+서비스 함수 벤치마크 실행
+
+services/의 모든 함수와 utils.excel_handler.parse_excel_file, utils.order_utils.generate_order_no를
+주문 1천/1만/10만/100만 건 규모의 데이터셋에서 측정하여 JSON으로 저장합니다.
+규모마다 별도의 프로세스에서 SCM_DB_PATH로 해당 데이터셋을 가리켜 실행하므로,
+get_db()를 직접 여는 함수도 운영 데이터베이스가 아닌 벤치마크 데이터베이스를 사용합니다.
+
+실행:
+    python -m benchmarks.run --scales 1000,10000 --output benchmarks/results/latest.json
+    python -m benchmarks.compare benchmarks/baseline.json benchmarks/results/latest.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from io import BytesIO
+from itertools import count
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+DATASET_DIR = os.path.join(BENCH_DIR, ".datasets")
+DEFAULT_SCALES = "1000,10000,100000,1000000"
+DATASET_SEED = 42
+DATASET_END_DATE = date(2025, 12, 31)
+BULK_ORDERS = 100  # 일괄 검증/생성 케이스의 호출당 주문 수
+
+
+def _dataset_path(scale: int) -> str:
+    return os.path.join(DATASET_DIR, f"scm_{scale}_seed{DATASET_SEED}.db")
+
+
+def ensure_dataset(scale: int) -> str:
+    """규모별 원본 데이터셋을 만들어 캐시합니다 (이미 있으면 재사용)."""
+    from database.seed_data import create_seed_engine, generate
+
+    path = _dataset_path(scale)
+    if not os.path.exists(path):
+        os.makedirs(DATASET_DIR, exist_ok=True)
+        tmp_path = path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        engine = create_seed_engine(tmp_path)
+        t0 = time.perf_counter()
+        generate(engine, scale, seed=DATASET_SEED, end_date=DATASET_END_DATE)
+        engine.dispose()
+        # WAL 내용을 본 파일로 합쳐 복사 가능한 단일 파일로 만듭니다.
+        conn = sqlite3.connect(tmp_path)
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.close()
+        os.replace(tmp_path, path)
+        print(f"  데이터셋 생성: 주문 {scale:,}건 ({time.perf_counter() - t0:.1f}s)", file=sys.stderr)
+    return path
+
+
+# --- 측정 대상 정의 (워커 프로세스 안에서만 import) ---
+
+def _build_cases(session_factory, repeat):
+    """(이름, 준비 함수) 목록. 준비 함수는 세션을 받아 매 반복마다 호출할 인자 리스트를 반환합니다."""
+    from database.models import OrderMaster, OrderDetail, ShippingPlan
+    from benchmarks.common import BENCH_ITEMS
+    from services import (
+        approval_service, dashboard_service, export_service, ingest_service, item_catalog, order_service,
+        shipping_registration_service, shipping_service, warehousing_service,
+    )
+    from utils.excel_handler import parse_excel_file
+    from utils.order_utils import generate_order_no
+
+    def orders_with_status(db, *statuses):
+        return [o.order_no for o in db.query(OrderMaster.order_no).filter(OrderMaster.status.in_(statuses))
+                .order_by(OrderMaster.order_no.desc()).limit(repeat)]
+
+    def read(fn, *args):
+        """세션만 받아 읽기 함수를 호출하는 케이스"""
+        return lambda db, _: fn(db, *args)
+
+    cases = []
+
+    def case(name, call, targets=None):
+        cases.append((name, call, targets))
+
+    # approval_service
+    case("services.approval_service.get_orders_for_approval",
+         read(approval_service.get_orders_for_approval, {"status": "대기", "order_type": "전체", "search_no": ""}))
+    case("services.approval_service.get_orders_for_approval[search]",
+         read(approval_service.get_orders_for_approval, {"status": "전체", "order_type": "전체", "search_no": "-00012"}))
+    case("services.approval_service.get_order_details",
+         lambda db, no: approval_service.get_order_details(db, no), lambda db: orders_with_status(db, "출하완료"))
+    case("services.approval_service.approve_order",
+         lambda db, no: approval_service.approve_order(db, db.get(OrderMaster, no), 5, "bench"),
+         lambda db: orders_with_status(db, "대기")[: repeat // 2 or 1])
+    case("services.approval_service.reject_order",
+         lambda db, no: approval_service.reject_order(db, db.get(OrderMaster, no)),
+         lambda db: orders_with_status(db, "대기")[repeat // 2 or 1:])
+    case("services.approval_service.set_order_in_production",
+         lambda db, no: approval_service.set_order_in_production(db, db.get(OrderMaster, no)),
+         lambda db: orders_with_status(db, "승인"))
+
+    # dashboard_service
+    case("services.dashboard_service.get_client_dashboard_data", read(dashboard_service.get_client_dashboard_data, "samsung_sdi"))
+    case("services.dashboard_service.get_manager_dashboard_data", read(dashboard_service.get_manager_dashboard_data))
+    case("services.dashboard_service.get_manufacturer_dashboard_data", read(dashboard_service.get_manufacturer_dashboard_data, "manufacturing"))
+    case("services.dashboard_service.get_common_activity_data", read(dashboard_service.get_common_activity_data))
+
+    # order_service
+    case("services.order_service.get_active_items", read(order_service.get_active_items))
+    detail_rows = [{"item_code": "ITEM001", "item_name": "ESS (Energy Storage System)", "order_qty": 10,
+                    "unit_price": 400000.0, "planned_shipping_date": None}]
+    case("services.order_service.create_order",
+         lambda db, _: order_service.create_order(db, {"username": "samsung_sdi"},
+                                                  {"order_date": date(2025, 12, 31), "order_type": "일반",
+                                                   "customer_company": "삼성SDI"}, detail_rows))
+
+    raw_orders = [{"idempotency_key": f"bench-{i}", "order_date": "2025-12-31",
+                   "lines": [{"item_code": BENCH_ITEMS[i % len(BENCH_ITEMS)][0], "order_qty": (i % 50) + 1}]}
+                  for i in range(BULK_ORDERS)]
+    case("services.ingest_service.validate_order_batch",
+         read(ingest_service.validate_order_batch, raw_orders, date(2025, 12, 31)))
+
+    bulk_calls = count()
+
+    def create_bulk(db, _):
+        # 호출마다 새 멱등성 키를 써야 기존 주문 조회가 아닌 실제 생성이 측정됩니다.
+        call_no = next(bulk_calls)
+        orders = [{"idempotency_key": f"bench-bulk-{call_no}-{i}", "order_date": date(2025, 12, 31),
+                   "order_type": "일반", "details": detail_rows} for i in range(BULK_ORDERS)]
+        order_service.create_orders_bulk(db, {"username": "samsung_sdi", "company_name": "삼성SDI"}, orders)
+
+    case("services.order_service.create_orders_bulk", create_bulk)
+
+    # item_catalog
+    case("services.item_catalog.get_item_catalog", read(item_catalog.get_item_catalog))
+
+    def rebuild_catalog(db, _):
+        item_catalog.invalidate_item_catalog()
+        item_catalog.get_item_catalog(db)
+
+    case("services.item_catalog.get_item_catalog[rebuild]", rebuild_catalog)
+
+    # export_service
+    def export_month(db, _):
+        for _row in export_service.iter_export_rows(db, "order_lines", date(2025, 12, 1), date(2025, 12, 31)):
+            pass
+
+    case("services.export_service.iter_export_rows", export_month)
+
+    # shipping_registration_service
+    case("services.shipping_registration_service.get_orders_for_registration",
+         read(shipping_registration_service.get_orders_for_registration, "삼성SDI"))
+
+    def instructed_plans(db):
+        return [p.plan_id for p in db.query(ShippingPlan.plan_id).filter(ShippingPlan.status == "지시")
+                .order_by(ShippingPlan.plan_id.desc()).limit(repeat)]
+
+    case("services.shipping_registration_service.get_plans_for_registration",
+         lambda db, plan_id: shipping_registration_service.get_plans_for_registration(db, db.get(ShippingPlan, plan_id).order_no),
+         instructed_plans)
+
+    def confirm(db, plan_id):
+        plan = db.get(ShippingPlan, plan_id)
+        detail = db.get(OrderDetail, (plan.order_no, plan.order_seq))
+        shipping_registration_service.confirm_shipment_received(db, db.get(OrderMaster, plan.order_no), [
+            {"plan": plan, "detail": detail, "received_qty": plan.planned_qty, "received_date": date(2025, 12, 31)}])
+
+    case("services.shipping_registration_service.confirm_shipment_received", confirm, instructed_plans)
+
+    # shipping_service
+    case("services.shipping_service.get_orders_for_shipping_plan", read(shipping_service.get_orders_for_shipping_plan))
+    case("services.shipping_service.get_item_inventory_status",
+         lambda db, no: shipping_service.get_item_inventory_status(db, no, 1), lambda db: orders_with_status(db, "입고완료"))
+
+    def plannable_lines(db):
+        return [(d.order_no, d.order_seq, d.received_qty - d.planned_qty) for d in
+                db.query(OrderDetail).join(OrderMaster).filter(
+                    OrderMaster.status == "입고완료", OrderDetail.planned_qty < OrderDetail.received_qty).limit(repeat)]
+
+    case("services.shipping_service.create_shipping_plans",
+         lambda db, line: shipping_service.create_shipping_plans(db, [
+             {"order_no": line[0], "order_seq": line[1], "planned_qty": line[2], "planned_date": date(2025, 12, 31)}], "bench"),
+         plannable_lines)
+    case("services.shipping_service.get_shipping_plans_for_order",
+         lambda db, no: shipping_service.get_shipping_plans_for_order(db, no), lambda db: orders_with_status(db, "출하완료"))
+
+    def planned_orders(db):
+        return [p.order_no for p in db.query(ShippingPlan.order_no).filter(ShippingPlan.status == "계획")
+                .distinct().limit(repeat)]
+
+    case("services.shipping_service.instruct_shipping_plans",
+         lambda db, no: shipping_service.instruct_shipping_plans(db, db.query(ShippingPlan).filter_by(order_no=no, status="계획").all()),
+         planned_orders)
+
+    # warehousing_service
+    case("services.warehousing_service.get_orders_for_warehousing", read(warehousing_service.get_orders_for_warehousing))
+    case("services.warehousing_service.get_order_receipt_status",
+         lambda db, no: warehousing_service.get_order_receipt_status(db, no), lambda db: orders_with_status(db, "생산중"))
+    case("services.warehousing_service.get_detailed_receipt_status",
+         lambda db, no: warehousing_service.get_detailed_receipt_status(db, no), lambda db: orders_with_status(db, "생산중"))
+    case("services.warehousing_service.get_receipt_history",
+         lambda db, no: warehousing_service.get_receipt_history(db, no), lambda db: orders_with_status(db, "출하완료"))
+
+    def receive_remaining(db, no):
+        order = db.get(OrderMaster, no)
+        items = [{"order_no": d.order_no, "order_seq": d.order_seq, "item_code": d.item_code, "item_name": d.item_name,
+                  "received_qty": d.order_qty - d.received_qty, "received_date": date(2025, 12, 31)}
+                 for d in db.query(OrderDetail).filter_by(order_no=no) if d.order_qty > d.received_qty]
+        warehousing_service.register_receipts(db, order, items, "bench")
+
+    case("services.warehousing_service.register_receipts", receive_remaining, lambda db: orders_with_status(db, "생산중", "승인"))
+
+    # utils
+    case("utils.order_utils.generate_order_no", lambda db, _: generate_order_no(date(2025, 12, 31), db))
+    return cases, parse_excel_file, order_service.process_excel_file
+
+
+def _excel_bytes(rows: int) -> bytes:
+    import pandas as pd
+    from benchmarks.common import BENCH_ITEMS
+
+    names = [name for _, name, _, _ in BENCH_ITEMS]
+    df = pd.DataFrame({
+        "품목명": [names[i % len(names)] for i in range(rows)],
+        "주문수량": [(i % 50) + 1 for i in range(rows)],
+        "납품예정일": ["2025-12-31"] * rows,
+    })
+    buffer = BytesIO()
+    df.to_excel(buffer, index=False, engine="openpyxl")
+    return buffer.getvalue()
+
+
+def _time_calls(session_factory, call, targets, repeat):
+    """대상마다 새 세션으로 호출하며 소요 시간(ms)을 측정"""
+    timings = []
+    for target in (targets if targets is not None else [None] * repeat):
+        db = session_factory()
+        try:
+            t0 = time.perf_counter()
+            call(db, target)
+            timings.append((time.perf_counter() - t0) * 1000)
+        finally:
+            db.rollback()
+            db.close()
+    return timings
+
+
+def run_worker(scale: int, repeat: int, excel_max_rows: int) -> dict:
+    """SCM_DB_PATH가 가리키는 데이터셋에서 모든 케이스를 측정"""
+    from database.connection import SessionLocal
+
+    cases, parse_excel_file, process_excel_file = _build_cases(SessionLocal, repeat)
+    results = {}
+    for name, call, target_fn in cases:
+        targets = None
+        if target_fn is not None:
+            db = SessionLocal()
+            try:
+                targets = target_fn(db)
+            finally:
+                db.close()
+            if not targets:
+                results[name] = {"skipped": "측정 대상 데이터 없음"}
+                continue
+        # 첫 호출은 캐시/커넥션 준비 비용이 섞이므로 읽기 케이스는 한 번 예열합니다.
+        if targets is None:
+            _time_calls(SessionLocal, call, None, 1)
+        timings = _time_calls(SessionLocal, call, targets, repeat)
+        results[name] = _stats(timings)
+
+    rows = min(scale, excel_max_rows)
+    payload = _excel_bytes(rows)
+    for name, fn in (("utils.excel_handler.parse_excel_file", parse_excel_file),
+                     ("services.order_service.process_excel_file", process_excel_file)):
+        timings = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            success, details, _ = fn(BytesIO(payload))
+            timings.append((time.perf_counter() - t0) * 1000)
+            assert success and len(details) == rows, "엑셀 파싱 결과가 올바르지 않습니다."
+        results[name] = {**_stats(timings), "rows": rows}
+    return results
+
+
+def _stats(timings):
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "runs": len(timings),
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, text=True).strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서비스 함수 벤치마크")
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help="주문 건수 목록 (쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=5, help="함수별 반복 측정 횟수")
+    parser.add_argument("--excel-max-rows", type=int, default=10000, help="엑셀 파싱 측정 시 최대 행 수")
+    parser.add_argument("--output", default=os.path.join(BENCH_DIR, "results", "latest.json"))
+    parser.add_argument("--worker-scale", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker_scale:
+        results = run_worker(args.worker_scale, args.repeat, args.excel_max_rows)
+        with open(args.worker_output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False)
+        return
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+
+    for scale in scales:
+        print(f"[주문 {scale:,}건]", file=sys.stderr)
+        source = ensure_dataset(scale)
+        work_dir = tempfile.mkdtemp(prefix="scm_bench_")
+        try:
+            db_path = os.path.join(work_dir, "bench.db")
+            shutil.copyfile(source, db_path)
+            worker_output = os.path.join(work_dir, "result.json")
+            env = {**os.environ, "SCM_DB_PATH": db_path}
+            subprocess.run([sys.executable, "-m", "benchmarks.run", "--worker-scale", str(scale),
+                            "--worker-output", worker_output, "--repeat", str(args.repeat),
+                            "--excel-max-rows", str(args.excel_max_rows)],
+                           cwd=ROOT_DIR, env=env, check=True)
+            with open(worker_output, encoding="utf-8") as f:
+                report["results"][str(scale)] = json.load(f)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        for name, stats in report["results"][str(scale)].items():
+            if "median_ms" in stats:
+                print(f"  {name:<72}{stats['median_ms']:>12.2f} ms", file=sys.stderr)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
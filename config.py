@@ -4,8 +4,9 @@
 import os
 
 # 데이터베이스 설정
-DB_PATH = os.path.join(os.path.dirname(__file__), "data", "sebang_scm.db")
-DB_DIR = os.path.join(os.path.dirname(__file__), "data")
+# SCM_DB_PATH 환경 변수로 다른 데이터베이스 파일을 지정할 수 있습니다 (벤치마크, 부하 테스트 등)
+DB_PATH = os.environ.get("SCM_DB_PATH") or os.path.join(os.path.dirname(__file__), "data", "sebang_scm.db")
+DB_DIR = os.path.dirname(DB_PATH)
 
 # 역할 정의
 ROLES = {
@@ -49,3 +50,105 @@ COLORS = {
     "text_secondary": "#666666" # 보조 텍스트
 }
 
+
+# SQLite 연결 설정
+SQLITE_BUSY_TIMEOUT_MS = 5000   # 잠금 대기 시간 (ms)
+SQLITE_JOURNAL_MODE = "WAL"     # 동시 읽기/쓰기를 위한 저널 모드
+SQLITE_SYNCHRONOUS = "NORMAL"   # WAL 모드에서 안전한 fsync 수준
+SQLITE_AUTO_VACUUM = "INCREMENTAL"  # 빈 공간을 유지보수 작업에서 조금씩 반환 (새 데이터베이스 또는 VACUUM 이후 적용)
+
+# 그룹 커밋 쓰기 큐 설정 (database/write_queue.py)
+WRITE_QUEUE_ENABLED = os.environ.get("SCM_WRITE_QUEUE", "0") == "1"
+WRITE_QUEUE_WINDOW_MS = 5       # 명령을 모으는 최대 대기 시간 (ms)
+WRITE_QUEUE_MAX_BATCH = 64      # 한 번의 커밋에 묶을 최대 명령 수
+WRITE_QUEUE_TIMEOUT_S = 30      # 호출자가 결과를 기다리는 최대 시간 (s)
+
+# SQL 계측 설정 (database/instrumentation.py)
+SQL_INSTRUMENTATION_ENABLED = True
+SQL_DEBUG_PANEL = os.environ.get("SCM_SQL_DEBUG", "0") == "1"   # 페이지 하단 SQL 진단 패널 표시
+SQL_N_PLUS_ONE_THRESHOLD = 5    # 한 번의 재실행에서 같은 형태의 문장이 이 횟수 이상이면 N+1 의심
+SQL_LOG_PATH = os.path.join(os.path.dirname(__file__), "logs", "sql_queries.log")
+
+# 페이지 실행 시간 기록 및 프로파일링 (utils/profiling.py)
+PAGE_TIMING_BUFFER_SIZE = 1000  # 최근 페이지 실행 기록 보관 개수
+PROFILING_ADMIN_USERS = [u for u in os.environ.get("SCM_PROFILING_ADMINS", "").split(",") if u]  # 쉼표로 구분한 계정 (기본: 없음)
+PROFILE_EVERY_RERUN = os.environ.get("SCM_PROFILE", "0") == "1"   # 모든 재실행을 프로파일링 (진단 시에만 사용)
+
+# 느린 쿼리 로그 설정 (database/slow_query_log.py)
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get("SCM_SLOW_QUERY_MS", "200"))   # 이 시간 이상 걸린 SQL을 기록
+SLOW_QUERY_EXPLAIN = True       # 기록 시 EXPLAIN QUERY PLAN 결과 포함
+SLOW_QUERY_LOG_PATH = os.path.join(os.path.dirname(__file__), "logs", "slow_queries.log")
+
+# 지표 내보내기 설정 (utils/metrics.py)
+METRICS_HTTP_ENABLED = os.environ.get("SCM_METRICS_HTTP", "1") == "1"
+METRICS_HTTP_HOST = os.environ.get("SCM_METRICS_HOST", "127.0.0.1")
+METRICS_HTTP_PORT = int(os.environ.get("SCM_METRICS_PORT", "9464"))   # Prometheus 수집 주소: http://host:port/metrics
+METRICS_JSON_PATH = os.path.join(os.path.dirname(__file__), "logs", "metrics.json")
+METRICS_JSON_INTERVAL_S = 60    # JSON 저장 주기 (s), 0이면 저장하지 않음
+
+# 종료 주문 보관 설정 (database/archive.py)
+ARCHIVE_AFTER_DAYS = int(os.environ.get("SCM_ARCHIVE_AFTER_DAYS", "180"))   # 출하완료/거부 후 이 기간이 지난 주문을 보관
+ARCHIVE_BATCH_SIZE = 200        # 한 트랜잭션에서 옮기는 주문 수 (쓰기 잠금 시간을 짧게 유지)
+ARCHIVE_BATCH_PAUSE_S = 0.05    # 배치 사이 대기 시간 (s), 다른 쓰기 작업에 잠금을 양보
+
+# 백업 및 유지보수 설정 (database/maintenance.py)
+BACKUP_DIR = os.path.join(DB_DIR, "backups")
+BACKUP_KEEP = 14                # 보관할 최근 백업 파일 수
+BACKUP_PAGES_PER_STEP = 256     # 백업 API 한 단계에서 복사할 페이지 수
+BACKUP_STEP_PAUSE_S = 0.005     # 단계 사이 대기 시간 (s), 쓰기 작업에 양보
+BACKUP_MAX_RESTARTS = 5         # 복사 중 원본이 계속 바뀌어 이 횟수만큼 다시 시작되면 한 번에 복사
+VACUUM_PAGES_PER_STEP = 1000    # incremental_vacuum 한 번에 반환할 페이지 수
+MAINTENANCE_LOG_PATH = os.path.join(os.path.dirname(__file__), "logs", "maintenance.log")
+MAINTENANCE_SCHEDULER_ENABLED = os.environ.get("SCM_MAINTENANCE", "0") == "1"  # 1이면 앱 프로세스에서 스케줄러 시작
+MAINTENANCE_CHECK_INTERVAL_S = 300  # 실행할 작업이 있는지 확인하는 주기 (s)
+MAINTENANCE_LEASE_S = 3600          # 유지보수 임대 유효 시간 (s), 작업마다 연장. 프로세스가 죽으면 이 시간 뒤 다른 프로세스가 이어받음
+MAINTENANCE_SCHEDULE = {            # 작업별 실행 주기 (s)
+    "backup": 6 * 3600,
+    "optimize": 24 * 3600,
+    "analyze": 7 * 24 * 3600,
+    "vacuum": 24 * 3600,
+    "archive": 24 * 3600,
+    "sessions": 24 * 3600,
+    "changes": 24 * 3600,
+}
+
+# 주문 일괄 수신 API 설정 (api/ingest_server.py)
+INGEST_API_ENABLED = os.environ.get("SCM_INGEST_API", "0") == "1"   # 1이면 Streamlit 앱 프로세스에서 함께 시작
+INGEST_API_HOST = os.environ.get("SCM_INGEST_HOST", "127.0.0.1")
+INGEST_API_PORT = int(os.environ.get("SCM_INGEST_PORT", "8600"))
+INGEST_MAX_BATCH = 1000             # 요청 하나에 담을 수 있는 최대 주문 수
+INGEST_MAX_BODY_BYTES = 16 * 1024 * 1024
+INGEST_AUTH_CACHE_TTL_S = 300       # 확인된 계정 정보를 재사용하는 시간 (s), 요청마다 bcrypt 검증을 반복하지 않음
+
+# 프로세스 간 변경 알림 설정 (database/change_notifier.py)
+CHANGE_WATCHER_ENABLED = os.environ.get("SCM_CHANGE_WATCHER", "1") == "1"  # 0이면 감시 스레드를 시작하지 않음 (조회 시 확인은 유지)
+CHANGE_POLL_INTERVAL_S = float(os.environ.get("SCM_CHANGE_POLL_S", "1"))  # 감시 스레드가 PRAGMA data_version을 확인하는 주기
+ORDER_CHANGES_KEEP = 100_000  # order_changes에 남길 최근 변경 순번 수 (유지보수 작업 changes가 정리)
+
+# 비밀번호 해싱 설정 (auth/auth.py)
+BCRYPT_ROUNDS = int(os.environ.get("SCM_BCRYPT_ROUNDS", "12"))  # bcrypt 비용 (2^n회), 바꾸면 다음 로그인 때 다시 해싱
+AUTH_VERIFY_WORKERS = int(os.environ.get("SCM_AUTH_VERIFY_WORKERS", "4"))  # 동시에 실행하는 비밀번호 검증 수
+AUTH_VERIFY_TIMEOUT_S = 30          # 검증 스레드 풀 대기를 포함한 최대 시간 (s)
+
+# 로그인 세션 토큰 설정 (auth/auth.py)
+SESSION_TTL_HOURS = float(os.environ.get("SCM_SESSION_TTL_HOURS", "12"))  # 세션 토큰 유효 시간
+SESSION_SECRET = os.environ.get("SCM_SESSION_SECRET") or None  # 토큰 서명 키 (없으면 SESSION_SECRET_PATH에 생성해 재사용)
+SESSION_SECRET_PATH = os.path.join(DB_DIR, "session_secret.key")
+SESSION_QUERY_PARAM = "session"     # 새로고침/새 탭에서 로그인 상태를 이어받는 URL 파라미터
+
+# 드롭 폴더 주문 수신 설정 (api/drop_folder.py)
+DROP_FOLDER_DIR = os.environ.get("SCM_DROP_DIR") or os.path.join(DB_DIR, "inbound")
+DROP_FOLDER_WORKERS = 2             # 파일 파싱 프로세스 수
+DROP_FOLDER_POLL_S = 5              # 폴더 확인 주기 (s)
+DROP_FOLDER_SETTLE_S = 2            # 마지막 수정 후 이 시간이 지난 파일만 처리 (복사 중인 파일 제외)
+DROP_FOLDER_ORDERS_PER_COMMIT = 500 # 한 번에 생성하는 주문 수
+
+# 엑셀 업로드 설정
+EXCEL_STREAMING_THRESHOLD_BYTES = 2 * 1024 * 1024  # 이 크기 이상의 업로드는 스트리밍 모드로 읽음
+EXCEL_CHUNK_ROWS = 5000                           # 스트리밍 모드에서 한 번에 검증하는 행 수
+UPLOAD_SPOOL_DIR = os.environ.get("SCM_UPLOAD_SPOOL_DIR") or None  # 업로드 임시 파일 위치 (기본: 시스템 임시 폴더)
+CSV_CHUNK_ROWS = 50000                            # CSV/TSV 업로드를 한 번에 읽고 검증하는 행 수
+EXPORT_FETCH_ROWS = 2000                          # 내보내기에서 DB 커서로 한 번에 가져오는 행 수
+EXPORT_DOWNLOAD_MAX_ROWS = 100_000                # 다운로드 버튼 한 번에 내보낼 최대 행 수 (Streamlit이 파일 전체를 메모리에 둠)
+TEMPLATE_ITEM_DROPDOWN = True                     # 주문 템플릿에 품목명 드롭다운/주문수량 검증 포함
+TEMPLATE_VALIDATION_ROWS = 1000                   # 드롭다운/검증을 적용할 템플릿 행 수
@@ -0,0 +1,153 @@
+"""
+종료 주문 보관(아카이브)
+
+출하완료/거부 후 config.ARCHIVE_AFTER_DAYS일이 지난 주문을 order_master/order_detail/warehouse/shipping_plan에서
+archived_* 테이블로 옮겨, 작업 목록과 대시보드 쿼리가 계속 늘어나는 이력 전체를 훑지 않도록 합니다.
+
+한 배치(config.ARCHIVE_BATCH_SIZE건)를 BEGIN IMMEDIATE 트랜잭션 하나로 복사·삭제하고 바로 커밋한 뒤
+잠시 쉬므로, 운영 중에 실행해도 쓰기 잠금을 오래 잡지 않습니다.
+보관된 주문은 서비스 조회 함수(get_order_details 등)가 보관 테이블에서 이어서 찾습니다.
+
+실행:
+    python -m database.archive
+    python -m database.archive --days 365 --batch-size 500 --dry-run
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, delete, func, insert, literal, select
+
+from config import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE, ARCHIVE_BATCH_PAUSE_S, DB_PATH
+from database.change_notifier import bulk_changes
+from database.models import (
+    Base, OrderMaster, OrderDetail, Warehouse, ShippingPlan,
+    ArchivedOrderMaster, ArchivedOrderDetail, ArchivedWarehouse, ArchivedShippingPlan,
+)
+from database.write_queue import create_writer_engine
+
+CLOSED_STATUSES = ("출하완료", "거부")
+
+# 복사 순서(부모 → 자식). 삭제는 역순으로 합니다.
+ARCHIVE_MODELS = (
+    (OrderMaster, ArchivedOrderMaster),
+    (OrderDetail, ArchivedOrderDetail),
+    (Warehouse, ArchivedWarehouse),
+    (ShippingPlan, ArchivedShippingPlan),
+)
+
+
+def archivable_orders_query(cutoff: datetime, limit: int):
+    """보관 대상 주문번호 (오래 전에 종료된 순)"""
+    return (
+        select(OrderMaster.order_no)
+        .where(OrderMaster.status.in_(CLOSED_STATUSES), OrderMaster.closed_at < cutoff)
+        .order_by(OrderMaster.closed_at, OrderMaster.order_no)
+        .limit(limit)
+    )
+
+
+def count_archivable(conn, cutoff: datetime) -> int:
+    return conn.execute(
+        select(func.count()).select_from(OrderMaster)
+        .where(OrderMaster.status.in_(CLOSED_STATUSES), OrderMaster.closed_at < cutoff)
+    ).scalar()
+
+
+def _archive_batch(conn, order_nos: list, archived_at: datetime) -> dict:
+    with bulk_changes(conn, [hot.__tablename__ for hot, _ in ARCHIVE_MODELS]) as changed_orders:
+        changed_orders.update(order_nos)
+        return _move_rows(conn, order_nos, archived_at)
+
+
+def _move_rows(conn, order_nos: list, archived_at: datetime) -> dict:
+    counts = {}
+    for hot, cold in ARCHIVE_MODELS:
+        hot_columns = [hot.__table__.c[col.name] for col in cold.__table__.columns if col.name != "archived_at"]
+        conn.execute(
+            insert(cold.__table__).from_select(
+                [col.name for col in hot_columns] + ["archived_at"],
+                select(*hot_columns, literal(archived_at)).where(hot.__table__.c.order_no.in_(order_nos)),
+            )
+        )
+    for hot, _ in reversed(ARCHIVE_MODELS):
+        result = conn.execute(delete(hot.__table__).where(hot.__table__.c.order_no.in_(order_nos)))
+        counts[hot.__tablename__] = result.rowcount
+    return counts
+
+
+def archive_closed_orders(bind=None, older_than_days: int = ARCHIVE_AFTER_DAYS, batch_size: int = ARCHIVE_BATCH_SIZE,
+                          pause_s: float = ARCHIVE_BATCH_PAUSE_S, max_batches: int = None, dry_run: bool = False,
+                          now: datetime = None) -> dict:
+    """
+    종료 후 older_than_days일이 지난 주문을 배치 단위로 보관 테이블로 옮깁니다.
+
+    bind는 BEGIN IMMEDIATE로 트랜잭션을 시작하는 엔진이어야 하며, 생략하면 쓰기 전용 엔진을 만듭니다.
+    테이블별로 옮긴 행 수와 배치 수를 반환합니다. dry_run이면 대상 주문 수만 셉니다.
+    """
+    owns_engine = bind is None
+    bind = bind or create_writer_engine()
+    cutoff = (now or datetime.now()) - timedelta(days=older_than_days)
+    totals = {hot.__tablename__: 0 for hot, _ in ARCHIVE_MODELS}
+    totals["batches"] = 0
+
+    try:
+        if dry_run:
+            with bind.connect() as conn:
+                totals[OrderMaster.__tablename__] = count_archivable(conn, cutoff)
+            return totals
+
+        while max_batches is None or totals["batches"] < max_batches:
+            with bind.begin() as conn:
+                order_nos = conn.execute(archivable_orders_query(cutoff, batch_size)).scalars().all()
+                if not order_nos:
+                    break
+                counts = _archive_batch(conn, order_nos, datetime.now())
+            for table_name, count in counts.items():
+                totals[table_name] += count
+            totals["batches"] += 1
+            if len(order_nos) < batch_size:
+                break
+            time.sleep(pause_s)
+    finally:
+        if owns_engine:
+            bind.dispose()
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="종료 주문 보관")
+    parser.add_argument("--db", default=DB_PATH, help="데이터베이스 파일 경로")
+    parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS, help="종료 후 보관까지의 일수")
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE, help="트랜잭션당 주문 수")
+    parser.add_argument("--max-batches", type=int, help="이번 실행에서 처리할 최대 배치 수")
+    parser.add_argument("--dry-run", action="store_true", help="옮기지 않고 대상 주문 수만 출력")
+    args = parser.parse_args()
+
+    from database.db_init import migrate_schema
+
+    db_url = f"sqlite:///{args.db}"
+    # 보관 테이블과 closed_at 컬럼이 없는 기존 데이터베이스도 바로 처리할 수 있도록 스키마를 맞춥니다.
+    schema_engine = create_engine(db_url)
+    Base.metadata.create_all(schema_engine)
+    migrate_schema(schema_engine)
+    schema_engine.dispose()
+
+    engine = create_writer_engine(db_url)
+    started = time.perf_counter()
+    try:
+        totals = archive_closed_orders(engine, args.days, args.batch_size, max_batches=args.max_batches,
+                                       dry_run=args.dry_run)
+    finally:
+        engine.dispose()
+
+    if args.dry_run:
+        print(f"보관 대상 주문: {totals['order_master']:,}건 (종료 후 {args.days}일 경과)")
+        return
+    print(f"보관 완료: 주문 {totals['order_master']:,}건, 상세 {totals['order_detail']:,}건, "
+          f"입고 {totals['warehouse']:,}건, 출하계획 {totals['shipping_plan']:,}건 "
+          f"({totals['batches']}배치, {time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
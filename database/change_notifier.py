@@ -0,0 +1,210 @@
+"""
+프로세스 간 변경 알림
+
+여러 Streamlit 서버 프로세스(레플리카)가 같은 SQLite 파일을 사용할 때, 각 프로세스의 메모리 캐시가
+다른 프로세스의 변경을 알 수 있도록 합니다.
+
+- 트리거가 테이블별 변경 카운터(change_counter)와 주문별 변경 순번(order_changes)을 같은 트랜잭션에서 갱신합니다
+  (database/models.py의 CHANGE_COUNTED_TABLES, ORDER_KEYED_TABLES).
+- ChangeWatcher는 쓰기를 하지 않는 전용 연결에서 PRAGMA data_version을 확인합니다. 이 값은 다른 연결이
+  커밋했을 때만 바뀌므로, 변경이 없으면 카운터 테이블을 읽지 않고 메모리 비교만으로 끝납니다.
+- 값이 바뀌면 카운터를 다시 읽어 변경된 테이블과 주문번호(ChangeSet)를 구독자에게 알립니다.
+
+캐시는 조회할 때 table_version()으로 버전을 비교하면 다른 프로세스의 커밋도 바로 반영되며,
+start_change_watcher()가 시작한 스레드는 조회가 없어도 config.CHANGE_POLL_INTERVAL_S마다 구독자에게 알립니다.
+
+대량 쓰기(합성 데이터 적재, 일괄 주문 생성, 보관 작업)는 bulk_changes()로 행 단위 트리거를 건너뛰고
+테이블 카운터를 배치마다 한 번만 올립니다. order_changes는 유지보수 작업(changes)이
+최근 config.ORDER_CHANGES_KEEP개 순번만 남기고 정리합니다 (prune_order_changes).
+"""
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from sqlalchemy import text
+
+from config import DB_PATH, CHANGE_WATCHER_ENABLED, CHANGE_POLL_INTERVAL_S, SQLITE_BUSY_TIMEOUT_MS, ORDER_CHANGES_KEEP
+from utils.metrics import CHANGE_NOTIFICATIONS
+
+ORDER_CHANGES = "order_changes"
+ORDER_CHANGES_PRUNED = "order_changes_pruned"  # change_counter: 정리된 order_changes의 마지막 순번
+_INTERNAL_COUNTERS = {ORDER_CHANGES, ORDER_CHANGES_PRUNED}
+
+_BUMP_COUNTER = text("INSERT INTO change_counter (name, version) VALUES (:name, 1) "
+                     "ON CONFLICT(name) DO UPDATE SET version = version + 1")
+_RECORD_ORDER_CHANGE = text(
+    "INSERT INTO order_changes (order_no, seq) VALUES "
+    "(:order_no, (SELECT version FROM change_counter WHERE name = 'order_changes')) "
+    "ON CONFLICT(order_no) DO UPDATE SET seq = excluded.seq"
+)
+
+
+@dataclass(frozen=True)
+class ChangeSet:
+    """직전 확인 이후 다른 연결이 커밋한 변경"""
+    tables: frozenset      # 행이 바뀐 테이블 이름
+    order_nos: frozenset   # 주문/상세/입고/출하 계획 행이 바뀐 주문번호
+    order_nos_complete: bool = True  # False면 확인하지 못한 사이 기록이 정리되어 일부만 있음 (tables로 판단)
+
+
+class ChangeWatcher:
+    """데이터베이스 파일 하나의 변경 감시 (스레드 안전)"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+        self._conn.execute("PRAGMA query_only = 1")
+        self._lock = threading.Lock()
+        self._data_version = None
+        self._versions = None  # 테이블 이름 -> 카운터 (change_counter가 없으면 None)
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        """변경이 있을 때마다 callback(ChangeSet)을 호출합니다 (확인한 스레드에서 실행)."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def _read_versions(self):
+        try:
+            return dict(self._conn.execute("SELECT name, version FROM change_counter").fetchall())
+        except sqlite3.OperationalError:
+            return None  # init_db가 아직 마이그레이션하지 않은 데이터베이스
+
+    def _changed_orders(self, since_seq: int) -> frozenset:
+        rows = self._conn.execute("SELECT order_no FROM order_changes WHERE seq > ?", (since_seq,)).fetchall()
+        return frozenset(row[0] for row in rows)
+
+    def poll(self):
+        """
+        다른 연결의 커밋이 있었으면 변경 내용을 구독자에게 알리고 반환합니다. 없으면 None
+        첫 호출은 기준값만 기록합니다.
+        """
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version:
+                return None
+            first = self._data_version is None
+            self._data_version = data_version
+            previous, self._versions = self._versions, self._read_versions()
+            if first or previous is None or self._versions is None:
+                return None
+
+            tables = frozenset(name for name, version in self._versions.items()
+                               if name not in _INTERNAL_COUNTERS and previous.get(name) != version)
+            order_nos, complete = frozenset(), True
+            since_seq = previous.get(ORDER_CHANGES, 0)
+            if since_seq != self._versions.get(ORDER_CHANGES):
+                order_nos = self._changed_orders(since_seq)
+                complete = since_seq >= self._versions.get(ORDER_CHANGES_PRUNED, 0)
+            if not tables and not order_nos:
+                return None
+            changes = ChangeSet(tables=tables, order_nos=order_nos, order_nos_complete=complete)
+            subscribers = list(self._subscribers)
+
+        for table in changes.tables:
+            CHANGE_NOTIFICATIONS.inc(table=table)
+        for callback in subscribers:
+            try:
+                callback(changes)
+            except Exception:
+                pass  # 구독자 오류가 다른 구독자와 감시 스레드를 멈추지 않도록 합니다.
+        return changes
+
+    def table_version(self, table_name: str):
+        """테이블의 현재 변경 카운터. change_counter 테이블이 없으면 None"""
+        self.poll()
+        versions = self._versions
+        if versions is None:
+            return None
+        return versions.get(table_name, 0)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+@contextmanager
+def bulk_changes(conn, tables):
+    """
+    대량 쓰기 동안 행 단위 변경 트리거를 건너뛰고, 블록이 끝나면 tables의 카운터를 한 번씩만 올립니다.
+    conn은 쓰기 트랜잭션 중인 Connection 또는 Session입니다. 블록 안에서 바꾼 주문번호를 yield되는 set에 넣으면
+    order_changes에 같은 순번으로 함께 기록합니다. 멈춤 표시(change_tracking_pause) 행은 같은 트랜잭션에서
+    지우므로 커밋되지 않고, 다른 연결에는 보이지 않습니다.
+    """
+    changed_orders = set()
+    conn.execute(text("INSERT INTO change_tracking_pause (id) VALUES (1)"))
+    try:
+        yield changed_orders
+    finally:
+        conn.execute(text("DELETE FROM change_tracking_pause"))
+    for table in tables:
+        conn.execute(_BUMP_COUNTER, {"name": table})
+    if changed_orders:
+        conn.execute(_BUMP_COUNTER, {"name": ORDER_CHANGES})
+        conn.execute(_RECORD_ORDER_CHANGE, [{"order_no": order_no} for order_no in changed_orders])
+
+
+def prune_order_changes(conn, keep: int = ORDER_CHANGES_KEEP) -> int:
+    """
+    최근 keep개 순번보다 오래된 order_changes 행을 지우고 지운 행 수를 반환합니다 (쓰기 트랜잭션 안에서 호출).
+    정리한 순번은 change_counter에 남겨, 그보다 오래전에 확인한 감시 객체가 order_nos가 불완전함을 알 수 있게 합니다.
+    """
+    current = conn.execute(text("SELECT version FROM change_counter WHERE name = :name"), {"name": ORDER_CHANGES}).scalar()
+    cutoff = (current or 0) - keep
+    if cutoff <= 0:
+        return 0
+    deleted = conn.execute(text("DELETE FROM order_changes WHERE seq <= :cutoff"), {"cutoff": cutoff}).rowcount
+    conn.execute(text("INSERT INTO change_counter (name, version) VALUES (:name, :cutoff) "
+                      "ON CONFLICT(name) DO UPDATE SET version = MAX(version, excluded.version)"),
+                 {"name": ORDER_CHANGES_PRUNED, "cutoff": cutoff})
+    return deleted
+
+
+_watchers = {}  # 데이터베이스 파일 경로 -> ChangeWatcher
+_watchers_lock = threading.Lock()
+
+
+def get_change_watcher(db_path: str = DB_PATH) -> ChangeWatcher:
+    """데이터베이스 파일별 감시 객체 (프로세스당 하나)"""
+    with _watchers_lock:
+        watcher = _watchers.get(db_path)
+        if watcher is None:
+            watcher = _watchers[db_path] = ChangeWatcher(db_path)
+        return watcher
+
+
+def watcher_for_session(db):
+    """세션이 사용하는 SQLite 파일의 감시 객체. 파일 데이터베이스가 아니면 None"""
+    url = db.get_bind().url
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    return get_change_watcher(url.database)
+
+
+_thread_lock = threading.Lock()
+_thread_started = False
+
+
+def _watch_loop(watcher: ChangeWatcher, interval_s: float):
+    while True:
+        time.sleep(interval_s)
+        try:
+            watcher.poll()
+        except sqlite3.Error:
+            continue
+
+
+def start_change_watcher(db_path: str = DB_PATH):
+    """
+    구독자에게 주기적으로 알리는 감시 스레드를 프로세스당 한 번만 시작합니다. app.main에서 매 실행마다 호출해도 됩니다.
+    조회 시점의 캐시 확인(table_version)은 스레드 없이도 동작합니다.
+    """
+    global _thread_started
+    with _thread_lock:
+        if _thread_started or not CHANGE_WATCHER_ENABLED:
+            return
+        _thread_started = True
+        threading.Thread(target=_watch_loop, args=(get_change_watcher(db_path), CHANGE_POLL_INTERVAL_S),
+                         name="scm-change-watcher", daemon=True).start()
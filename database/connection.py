@@ -1,16 +1,54 @@
 """
 데이터베이스 연결 관리
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
-from config import DB_PATH, DB_DIR
+from config import (
+    DB_PATH, DB_DIR,
+    SQLITE_BUSY_TIMEOUT_MS, SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS, SQLITE_AUTO_VACUUM,
+)
+from database.instrumentation import install_query_instrumentation
+from database.slow_query_log import install_slow_query_log
+from utils.metrics import DB_LOCK_ERRORS
 import os
 
 # 데이터 디렉토리 생성
 os.makedirs(DB_DIR, exist_ok=True)
 
+
+def apply_sqlite_pragmas(engine):
+    """
+    새 SQLite 연결마다 잠금 대기 시간, 자동 vacuum 방식과 저널 모드를 설정합니다.
+    WAL 모드에서는 읽기가 쓰기를 막지 않으며, synchronous=NORMAL로 커밋당 fsync 비용을 줄입니다.
+    잠금 대기 시간 초과 오류는 지표(scm_db_lock_errors_total)로 집계합니다.
+    """
+    @event.listens_for(engine, "handle_error")
+    def _count_lock_errors(context):
+        if "database is locked" in str(context.original_exception):
+            DB_LOCK_ERRORS.inc()
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"PRAGMA busy_timeout = {int(SQLITE_BUSY_TIMEOUT_MS)}")
+            cursor.execute(f"PRAGMA auto_vacuum = {SQLITE_AUTO_VACUUM}")
+            cursor.execute(f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}")
+            cursor.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+        finally:
+            cursor.close()
+
+    return engine
+
+
 # SQLite 엔진 생성
-engine = create_engine(f"sqlite:///{DB_PATH}", echo=False)
+engine = apply_sqlite_pragmas(create_engine(
+    f"sqlite:///{DB_PATH}",
+    echo=False,
+    connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+))
+install_query_instrumentation(engine)
+install_slow_query_log(engine)
 
 # 세션 팩토리 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -28,4 +66,3 @@ def get_db() -> Session:
 def close_db(db: Session):
     """데이터베이스 세션 닫기"""
     db.close()
-
@@ -1,18 +1,94 @@
 """
 데이터베이스 초기화 스크립트
 """
+from sqlalchemy import inspect, text
 from database.connection import engine
-from database.models import Base, User, ItemMaster
-from config import DB_PATH
+from database.models import (
+    Base, User, ItemMaster, CHANGE_COUNTED_TABLES, LEGACY_TRIGGER_NAME, change_counter_triggers,
+)
+from config import DB_PATH, BCRYPT_ROUNDS
 import bcrypt
 import os
 from datetime import datetime
 
 
+# 기존 데이터베이스에 추가해야 하는 컬럼 (테이블명: [(컬럼명, DDL), ...])
+SCHEMA_MIGRATIONS = {
+    "order_master": [
+        ("version", "INTEGER NOT NULL DEFAULT 1"),
+        ("closed_at", "DATETIME"),
+    ],
+    "order_detail": [
+        ("received_qty", "INTEGER NOT NULL DEFAULT 0"),
+        ("planned_qty", "INTEGER NOT NULL DEFAULT 0"),
+        ("version", "INTEGER NOT NULL DEFAULT 1"),
+    ],
+}
+
+# 컬럼 추가 후 기존 이력으로 값을 채우는 SQL
+SCHEMA_BACKFILLS = {
+    ("order_detail", "received_qty"): """
+        UPDATE order_detail SET received_qty = (
+            SELECT COALESCE(SUM(w.received_qty), 0) FROM warehouse w
+            WHERE w.order_no = order_detail.order_no AND w.order_seq = order_detail.order_seq
+        )
+    """,
+    ("order_detail", "planned_qty"): """
+        UPDATE order_detail SET planned_qty = (
+            SELECT COALESCE(SUM(p.planned_qty), 0) FROM shipping_plan p
+            WHERE p.order_no = order_detail.order_no AND p.order_seq = order_detail.order_seq
+        )
+    """,
+    # 출하완료는 마지막 출하일, 거부는 등록일시를 종료 일시로 봅니다.
+    ("order_master", "closed_at"): """
+        UPDATE order_master SET closed_at = CASE status
+            WHEN '출하완료' THEN COALESCE(
+                (SELECT MAX(d.actual_shipping_date) || ' 00:00:00.000000' FROM order_detail d
+                 WHERE d.order_no = order_master.order_no),
+                created_at)
+            ELSE created_at END
+        WHERE status IN ('출하완료', '거부')
+    """,
+}
+
+
+def migrate_schema(bind=engine):
+    """create_all로는 추가되지 않는 신규 컬럼을 기존 테이블에 추가하고 값을 채웁니다."""
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    with bind.begin() as conn:
+        for table_name, columns in SCHEMA_MIGRATIONS.items():
+            if table_name not in existing_tables:
+                continue
+            existing_columns = {col["name"] for col in inspector.get_columns(table_name)}
+            for column_name, ddl in columns:
+                if column_name in existing_columns:
+                    continue
+                conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {ddl}"))
+                backfill = SCHEMA_BACKFILLS.get((table_name, column_name))
+                if backfill:
+                    conn.execute(text(backfill))
+                print(f"컬럼 추가: {table_name}.{column_name}")
+
+        # 모델에 새로 추가된 인덱스 (create_all은 이미 있는 테이블의 인덱스를 만들지 않음)
+        for table in Base.metadata.sorted_tables:
+            if table.name in existing_tables:
+                for index in table.indexes:
+                    index.create(conn, checkfirst=True)
+
+        # 변경 카운터 트리거 (기존 데이터베이스에는 create_all이 만들지 않음)
+        for table in CHANGE_COUNTED_TABLES:
+            for op in ("insert", "update", "delete"):
+                conn.execute(text(f"DROP TRIGGER IF EXISTS {LEGACY_TRIGGER_NAME.format(table=table.name, op=op)}"))
+            for ddl in change_counter_triggers(table.name):
+                conn.execute(text(ddl))
+
+
 def init_db():
     """데이터베이스 초기화 및 기본 사용자 생성"""
     # 테이블 생성
     Base.metadata.create_all(bind=engine)
+    migrate_schema(engine)
 
     from database.connection import SessionLocal
     db = SessionLocal()
@@ -56,7 +132,7 @@ def init_db():
             for user_data in default_users:
                 password_hash = bcrypt.hashpw(
                     user_data["password"].encode('utf-8'),
-                    bcrypt.gensalt()
+                    bcrypt.gensalt(BCRYPT_ROUNDS)
                 ).decode('utf-8')
 
                 user = User(
@@ -0,0 +1,173 @@
+"""
+SQL 실행 계측
+
+엔진의 before_cursor_execute/after_cursor_execute 이벤트로 쿼리 수, 총 SQL 시간, 반복되는 문장 형태를
+Streamlit 재실행(rerun) 단위로 수집합니다. 같은 형태의 문장이 한 번의 재실행에서 여러 번 실행되면
+N+1 패턴으로 표시하고, 재실행마다 요약을 로그 파일에 JSON 한 줄로 기록합니다.
+
+사용:
+    with track_queries("출하계획") as stats:
+        page_function()
+    stats.flagged_shapes()  # [(문장 형태, 횟수, 총 ms), ...]
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from sqlalchemy import event
+
+from config import SQL_INSTRUMENTATION_ENABLED, SQL_LOG_PATH, SQL_N_PLUS_ONE_THRESHOLD
+
+_current_stats = ContextVar("scm_query_stats", default=None)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,)*\s*\?\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+_loggers = {}
+_page_totals = defaultdict(lambda: {"reruns": 0, "queries": 0, "sql_ms": 0.0, "n_plus_one_reruns": 0})
+_page_totals_lock = threading.Lock()
+
+
+def normalize_statement(statement: str) -> str:
+    """리터럴과 IN 목록 길이를 지워 같은 형태의 문장이 같은 문자열이 되도록 정규화"""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _IN_LIST.sub("IN (?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """한 번의 재실행(또는 작업) 동안 실행된 SQL 통계"""
+
+    def __init__(self, page: str, threshold: int = SQL_N_PLUS_ONE_THRESHOLD):
+        self.page = page
+        self.threshold = threshold
+        self.started_at = datetime.now()
+        self.query_count = 0
+        self.total_ms = 0.0
+        self.wall_ms = 0.0
+        self.shapes = defaultdict(lambda: [0, 0.0])  # 문장 형태 -> [횟수, 총 ms]
+
+    def record(self, statement: str, elapsed_ms: float):
+        self.query_count += 1
+        self.total_ms += elapsed_ms
+        entry = self.shapes[normalize_statement(statement)]
+        entry[0] += 1
+        entry[1] += elapsed_ms
+
+    def flagged_shapes(self) -> list:
+        """임계값 이상 반복된 문장 형태 (N+1 의심) 목록, 많이 반복된 순"""
+        flagged = [(shape, count, total) for shape, (count, total) in self.shapes.items() if count >= self.threshold]
+        return sorted(flagged, key=lambda row: (-row[1], -row[2]))
+
+    def top_shapes(self, limit: int = 10) -> list:
+        """총 시간이 긴 문장 형태 목록"""
+        rows = [(shape, count, total) for shape, (count, total) in self.shapes.items()]
+        return sorted(rows, key=lambda row: -row[2])[:limit]
+
+    def to_dict(self) -> dict:
+        return {
+            "time": self.started_at.isoformat(timespec="seconds"),
+            "page": self.page,
+            "queries": self.query_count,
+            "sql_ms": round(self.total_ms, 2),
+            "wall_ms": round(self.wall_ms, 2),
+            "distinct_shapes": len(self.shapes),
+            "n_plus_one": [{"shape": shape, "count": count, "sql_ms": round(total, 2)}
+                           for shape, count, total in self.flagged_shapes()],
+        }
+
+
+def install_query_instrumentation(engine):
+    """엔진에 쿼리 계측 이벤트를 등록합니다. 수집 중인 재실행이 없으면 기록하지 않습니다."""
+    if not SQL_INSTRUMENTATION_ENABLED:
+        return engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_stats.get() is not None:
+            conn.info.setdefault("scm_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current_stats.get()
+        starts = conn.info.get("scm_query_start")
+        if stats is None or not starts:
+            return
+        stats.record(statement, (time.perf_counter() - starts.pop()) * 1000)
+
+    return engine
+
+
+def current_query_stats():
+    """현재 수집 중인 QueryStats (없으면 None)"""
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries(page: str, log: bool = True):
+    """
+    블록 안에서 실행되는 SQL을 수집합니다.
+    st.rerun()/st.stop()으로 블록이 중단되어도 수집 결과는 로그에 남습니다.
+    """
+    stats = QueryStats(page)
+    token = _current_stats.set(stats)
+    started = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats.wall_ms = (time.perf_counter() - started) * 1000
+        _current_stats.reset(token)
+        _add_page_totals(stats)
+        if log and stats.query_count:
+            _write_log(stats)
+
+
+def page_totals() -> dict:
+    """프로세스 시작 후 페이지별 누적 통계 {페이지: {reruns, queries, sql_ms, n_plus_one_reruns}}"""
+    with _page_totals_lock:
+        return {page: dict(totals) for page, totals in _page_totals.items()}
+
+
+def _add_page_totals(stats: QueryStats):
+    with _page_totals_lock:
+        totals = _page_totals[stats.page]
+        totals["reruns"] += 1
+        totals["queries"] += stats.query_count
+        totals["sql_ms"] += stats.total_ms
+        if stats.flagged_shapes():
+            totals["n_plus_one_reruns"] += 1
+
+
+def json_line_logger(name: str, path: str):
+    """JSON 한 줄씩 기록하는 회전 파일 로거 (5MB × 4개). 로그 디렉토리를 만들 수 없으면 기록하지 않습니다."""
+    if name not in _loggers:
+        logger = logging.getLogger(name)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        if not logger.handlers:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                handler = RotatingFileHandler(path, maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8")
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger.addHandler(handler)
+            except OSError:
+                logger.addHandler(logging.NullHandler())
+        _loggers[name] = logger
+    return _loggers[name]
+
+
+def _write_log(stats: QueryStats):
+    record = stats.to_dict()
+    level = logging.WARNING if record["n_plus_one"] else logging.INFO
+    json_line_logger("scm.sql", SQL_LOG_PATH).log(level, json.dumps(record, ensure_ascii=False))
@@ -0,0 +1,402 @@
+"""
+온라인 백업 및 데이터베이스 유지보수
+
+- backup: SQLite 백업 API로 작은 페이지 단위씩 복사하여 쓰기 작업을 막지 않고 백업 파일을 만듭니다.
+- optimize / analyze: PRAGMA optimize, ANALYZE로 쿼리 플래너 통계를 갱신합니다.
+- vacuum: PRAGMA incremental_vacuum으로 빈 페이지를 조금씩 파일 시스템에 반환합니다.
+- archive: 오래된 종료 주문을 보관 테이블로 옮깁니다 (database/archive.py).
+- sessions / changes: 만료된 로그인 세션과 오래된 주문별 변경 기록(order_changes)을 지웁니다.
+
+작업마다 소요 시간과 결과(반환한 공간, 복사 단계 수 등)를 logs/maintenance.log에 JSON 한 줄로 기록하며,
+app.main이 시작하는 스케줄러 스레드(SCM_MAINTENANCE=1)나 cron의 due 명령이 이 기록을 보고
+config.MAINTENANCE_SCHEDULE 주기가 지난 작업을 실행합니다.
+여러 프로세스가 동시에 실행하지 않도록, 주기가 지난 작업은 데이터베이스의 maintenance_lease 행을
+BEGIN IMMEDIATE로 확보(임대)한 프로세스 하나만 실행합니다.
+
+실행:
+    python -m database.maintenance run backup optimize
+    python -m database.maintenance run vacuum --convert   # auto_vacuum이 꺼진 기존 파일을 한 번 전환 (전체 VACUUM)
+    python -m database.maintenance due                    # 주기가 지난 작업만 실행 (cron 등에서 사용)
+    python -m database.maintenance status
+"""
+import argparse
+import glob
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from config import (
+    DB_PATH, SQLITE_BUSY_TIMEOUT_MS,
+    BACKUP_DIR, BACKUP_KEEP, BACKUP_PAGES_PER_STEP, BACKUP_STEP_PAUSE_S, BACKUP_MAX_RESTARTS,
+    VACUUM_PAGES_PER_STEP, MAINTENANCE_LOG_PATH, MAINTENANCE_SCHEDULER_ENABLED, MAINTENANCE_CHECK_INTERVAL_S,
+    MAINTENANCE_SCHEDULE, MAINTENANCE_LEASE_S,
+)
+from database.instrumentation import json_line_logger
+from utils.metrics import MAINTENANCE_DURATION, MAINTENANCE_RECLAIMED_BYTES
+
+_run_lock = threading.Lock()
+_scheduler_lock = threading.Lock()
+_scheduler_started = False
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    return sqlite3.connect(db_path, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+
+
+def backup_database(db_path: str = DB_PATH, backup_dir: str = BACKUP_DIR, pages_per_step: int = BACKUP_PAGES_PER_STEP,
+                    pause_s: float = BACKUP_STEP_PAUSE_S, max_restarts: int = BACKUP_MAX_RESTARTS,
+                    keep: int = BACKUP_KEEP) -> dict:
+    """
+    pages_per_step 페이지씩 복사하며 단계 사이에 잠시 쉬어, 백업 중에도 쓰기 작업이 진행되도록 합니다.
+    복사 도중 다른 연결이 원본을 바꾸면 SQLite가 복사를 처음부터 다시 시작하는데,
+    이것이 max_restarts번을 넘으면 한 번에 복사합니다 (WAL 모드에서는 읽기 트랜잭션만 잡으므로 쓰기를 막지 않습니다).
+    """
+    os.makedirs(backup_dir, exist_ok=True)
+    dest_path = os.path.join(backup_dir, f"scm_{datetime.now():%Y%m%d_%H%M%S}.db")
+    part_path = dest_path + ".part"
+    step_times = []
+    state = {"remaining": None, "restarts": 0, "last": time.perf_counter()}
+
+    def progress(status, remaining, total):
+        now = time.perf_counter()
+        step_times.append((now - state["last"]) * 1000)
+        if state["remaining"] is not None and remaining > state["remaining"]:
+            state["restarts"] += 1
+            if state["restarts"] > max_restarts:
+                raise _TooManyRestarts()
+        state["remaining"] = remaining
+        if remaining and pause_s:
+            time.sleep(pause_s)
+        state["last"] = time.perf_counter()
+
+    source = _connect(db_path)
+    target = sqlite3.connect(part_path)
+    try:
+        try:
+            source.backup(target, pages=pages_per_step, progress=progress)
+            single_pass = False
+        except _TooManyRestarts:
+            source.backup(target)
+            single_pass = True
+        integrity = target.execute("PRAGMA quick_check").fetchone()[0]
+        page_count = target.execute("PRAGMA page_count").fetchone()[0]
+    except Exception:
+        target.close()
+        os.remove(part_path)
+        raise
+    finally:
+        target.close()
+        source.close()
+    os.replace(part_path, dest_path)
+
+    pruned = sorted(glob.glob(os.path.join(backup_dir, "scm_*.db")), reverse=True)[keep:]
+    pruned_bytes = 0
+    for path in pruned:
+        pruned_bytes += os.path.getsize(path)
+        os.remove(path)
+
+    return {
+        "path": dest_path,
+        "size_bytes": os.path.getsize(dest_path),
+        "pages": page_count,
+        "steps": len(step_times),
+        "max_step_ms": round(max(step_times), 2) if step_times else 0,
+        "restarts": state["restarts"],
+        "single_pass": single_pass,
+        "integrity": integrity,
+        "pruned_files": len(pruned),
+        "pruned_bytes": pruned_bytes,
+    }
+
+
+def optimize_database(db_path: str = DB_PATH) -> dict:
+    """PRAGMA optimize: 통계가 오래되었거나 없는 테이블만 골라 ANALYZE합니다."""
+    conn = _connect(db_path)
+    try:
+        conn.execute("PRAGMA optimize").fetchall()
+    finally:
+        conn.close()
+    return {}
+
+
+def analyze_database(db_path: str = DB_PATH) -> dict:
+    """전체 ANALYZE로 모든 인덱스 통계를 다시 수집합니다."""
+    conn = _connect(db_path)
+    try:
+        conn.execute("ANALYZE")
+        stat_rows = conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0]
+    finally:
+        conn.close()
+    return {"stat_rows": stat_rows}
+
+
+def vacuum_database(db_path: str = DB_PATH, pages_per_step: int = VACUUM_PAGES_PER_STEP, convert: bool = False) -> dict:
+    """
+    빈 페이지(freelist)를 pages_per_step개씩 반환합니다. 단계마다 별도 트랜잭션이므로 쓰기 잠금은 짧게만 잡힙니다.
+    auto_vacuum이 꺼진 기존 파일은 건너뛰며, convert=True이면 한 번 전체 VACUUM으로 INCREMENTAL 모드로 전환합니다.
+    """
+    conn = _connect(db_path)
+    try:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        free_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        size_before = os.path.getsize(db_path)
+        auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        steps = 0
+
+        if auto_vacuum != 2:
+            if not convert:
+                return {"skipped": "auto_vacuum 비활성 (run vacuum --convert로 전환)", "free_pages": free_before,
+                        "reclaimable_bytes": free_before * page_size}
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+            steps = 1
+        else:
+            while conn.execute("PRAGMA freelist_count").fetchone()[0] > 0:
+                conn.execute(f"PRAGMA incremental_vacuum({int(pages_per_step)})").fetchall()
+                steps += 1
+
+        # WAL에 남은 변경을 본 파일에 반영해야 파일 크기가 줄어듭니다 (PASSIVE는 다른 연결을 기다리지 않음).
+        conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchall()
+        free_after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    finally:
+        conn.close()
+
+    reclaimed = max(size_before - os.path.getsize(db_path), 0)
+    MAINTENANCE_RECLAIMED_BYTES.inc(reclaimed)
+    return {
+        "steps": steps,
+        "freed_pages": free_before - free_after,
+        "reclaimed_bytes": reclaimed,
+        "file_size_before": size_before,
+        "file_size_after": os.path.getsize(db_path),
+    }
+
+
+def archive_orders(db_path: str = DB_PATH) -> dict:
+    """오래된 종료 주문 보관 (database.archive.archive_closed_orders)"""
+    from database.archive import archive_closed_orders
+    from database.write_queue import create_writer_engine
+
+    engine = create_writer_engine(f"sqlite:///{db_path}")
+    try:
+        return archive_closed_orders(engine)
+    finally:
+        engine.dispose()
+
+
+def purge_expired_sessions(db_path: str = DB_PATH) -> dict:
+    """만료되었거나 로그아웃으로 폐기된 로그인 세션 삭제 (auth.auth.purge_sessions)"""
+    from auth.auth import purge_sessions
+    from database.write_queue import create_writer_engine
+    from sqlalchemy.orm import Session
+
+    engine = create_writer_engine(f"sqlite:///{db_path}")
+    try:
+        with Session(engine) as db:
+            return {"deleted_sessions": purge_sessions(db)}
+    finally:
+        engine.dispose()
+
+
+def prune_change_log(db_path: str = DB_PATH) -> dict:
+    """오래된 주문별 변경 기록(order_changes) 정리 (database.change_notifier.prune_order_changes)"""
+    from database.change_notifier import prune_order_changes
+    from database.write_queue import create_writer_engine
+
+    engine = create_writer_engine(f"sqlite:///{db_path}")
+    try:
+        with engine.begin() as conn:
+            return {"deleted_order_changes": prune_order_changes(conn)}
+    finally:
+        engine.dispose()
+
+
+MAINTENANCE_TASKS = {
+    "backup": backup_database,
+    "optimize": optimize_database,
+    "analyze": analyze_database,
+    "vacuum": vacuum_database,
+    "archive": archive_orders,
+    "sessions": purge_expired_sessions,
+    "changes": prune_change_log,
+}
+
+
+def run_task(name: str, db_path: str = DB_PATH, log_path: str = MAINTENANCE_LOG_PATH, **options) -> dict:
+    """작업 하나를 실행하고 소요 시간과 결과를 유지보수 로그에 기록합니다. 실패해도 예외 대신 기록을 반환합니다."""
+    started_at = datetime.now()
+    started = time.perf_counter()
+    entry = {"task": name, "started_at": started_at.isoformat(timespec="seconds"), "ok": True}
+    with _run_lock:
+        try:
+            entry.update(MAINTENANCE_TASKS[name](db_path, **options))
+        except Exception as e:
+            entry.update(ok=False, error=f"{type(e).__name__}: {e}")
+    elapsed = time.perf_counter() - started
+    entry["duration_ms"] = round(elapsed * 1000, 1)
+    MAINTENANCE_DURATION.observe(elapsed, task=name, outcome="ok" if entry["ok"] else "error")
+    json_line_logger(f"scm.maintenance.{log_path}", log_path).info(json.dumps(entry, ensure_ascii=False))
+    return entry
+
+
+def read_log(log_path: str = MAINTENANCE_LOG_PATH) -> list:
+    entries = []
+    for path in (log_path + ".1", log_path):
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+    return entries
+
+
+def last_successful_runs(log_path: str = MAINTENANCE_LOG_PATH) -> dict:
+    """작업별 마지막 성공 시각"""
+    last = {}
+    for entry in read_log(log_path):
+        if entry.get("ok"):
+            last[entry["task"]] = max(last.get(entry["task"], ""), entry["started_at"])
+    return {task: datetime.fromisoformat(started_at) for task, started_at in last.items()}
+
+
+def due_tasks(now: datetime = None, schedule: dict = MAINTENANCE_SCHEDULE, last_runs: dict = None) -> list:
+    """주기가 지났거나 한 번도 성공하지 않은 작업 목록 (schedule 순서)"""
+    now = now or datetime.now()
+    last_runs = last_successful_runs() if last_runs is None else last_runs
+    return [task for task, interval_s in schedule.items()
+            if task not in last_runs or (now - last_runs[task]).total_seconds() >= interval_s]
+
+
+_LEASE_NAME = "maintenance"
+
+
+def acquire_lease(db_path: str, holder: str, lease_s: float = MAINTENANCE_LEASE_S) -> bool:
+    """
+    유지보수 임대를 얻거나 연장합니다. 다른 holder의 임대가 아직 유효하면 False
+    확인과 갱신을 BEGIN IMMEDIATE 트랜잭션 하나에서 하므로 여러 프로세스 중 하나만 성공합니다.
+    """
+    conn = _connect(db_path)
+    try:
+        conn.execute("CREATE TABLE IF NOT EXISTS maintenance_lease "
+                     "(name TEXT PRIMARY KEY, holder TEXT NOT NULL, expires_at REAL NOT NULL)")
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT holder, expires_at FROM maintenance_lease WHERE name = ?", (_LEASE_NAME,)).fetchone()
+        now = time.time()
+        if row and row[0] != holder and row[1] > now:
+            conn.execute("ROLLBACK")
+            return False
+        conn.execute("INSERT OR REPLACE INTO maintenance_lease (name, holder, expires_at) VALUES (?, ?, ?)",
+                     (_LEASE_NAME, holder, now + lease_s))
+        conn.execute("COMMIT")
+        return True
+    finally:
+        conn.close()
+
+
+def release_lease(db_path: str, holder: str):
+    conn = _connect(db_path)
+    try:
+        conn.execute("DELETE FROM maintenance_lease WHERE name = ? AND holder = ?", (_LEASE_NAME, holder))
+    finally:
+        conn.close()
+
+
+def run_due_tasks(db_path: str = DB_PATH, log_path: str = MAINTENANCE_LOG_PATH) -> list:
+    """
+    주기가 지난 작업을 실행합니다. 다른 프로세스가 유지보수 임대를 가지고 있으면 아무것도 하지 않고 빈 목록을 반환합니다.
+    실행할 작업은 임대를 얻은 뒤 로그를 읽어 정하므로, 앞선 프로세스가 방금 실행한 작업은 다시 실행하지 않습니다.
+    """
+    holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    try:
+        if not acquire_lease(db_path, holder):
+            return []
+    except sqlite3.Error:
+        return []  # 잠금 대기 시간 초과 등: 다음 확인 때 다시 시도
+    entries = []
+    try:
+        for task in due_tasks(last_runs=last_successful_runs(log_path)):
+            if entries and not acquire_lease(db_path, holder):  # 긴 작업이 이어져도 임대가 만료되지 않도록 연장
+                break
+            entries.append(run_task(task, db_path, log_path))
+    finally:
+        try:
+            release_lease(db_path, holder)
+        except sqlite3.Error:
+            pass  # 임대는 MAINTENANCE_LEASE_S 뒤 만료됩니다.
+    return entries
+
+
+def _scheduler_loop(interval_s: float):
+    while True:
+        time.sleep(interval_s)
+        try:
+            run_due_tasks()
+        except Exception:
+            continue  # 한 번의 실패가 스케줄러 스레드를 멈추지 않도록 합니다.
+
+
+def start_maintenance_scheduler():
+    """
+    유지보수 스케줄러 스레드를 프로세스당 한 번만 시작합니다. app.main에서 매 실행마다 호출해도 됩니다.
+    첫 확인은 config.MAINTENANCE_CHECK_INTERVAL_S 뒤에 하므로 앱 시작을 늦추지 않습니다.
+    """
+    global _scheduler_started
+    with _scheduler_lock:
+        if _scheduler_started or not MAINTENANCE_SCHEDULER_ENABLED:
+            return
+        _scheduler_started = True
+        threading.Thread(target=_scheduler_loop, args=(MAINTENANCE_CHECK_INTERVAL_S,),
+                         name="scm-maintenance", daemon=True).start()
+
+
+def _print_entry(entry: dict):
+    status = "성공" if entry["ok"] else f"실패 ({entry.get('error')})"
+    details = ", ".join(f"{k}={v}" for k, v in entry.items() if k not in ("task", "started_at", "ok", "error", "duration_ms"))
+    print(f"[{entry['task']}] {status} {entry['duration_ms']:.0f}ms {details}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="데이터베이스 백업 및 유지보수")
+    parser.add_argument("--db", default=DB_PATH, help="데이터베이스 파일 경로")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_parser = sub.add_parser("run", help="지정한 작업 실행")
+    run_parser.add_argument("tasks", nargs="+", choices=list(MAINTENANCE_TASKS) + ["all"])
+    run_parser.add_argument("--convert", action="store_true", help="vacuum: auto_vacuum을 INCREMENTAL로 전환 (전체 VACUUM)")
+    sub.add_parser("due", help="주기가 지난 작업만 실행")
+    sub.add_parser("status", help="작업별 마지막 실행 결과")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        tasks = list(MAINTENANCE_TASKS) if "all" in args.tasks else args.tasks
+        for task in tasks:
+            options = {"convert": True} if task == "vacuum" and args.convert else {}
+            _print_entry(run_task(task, args.db, **options))
+    elif args.command == "due":
+        for entry in run_due_tasks(args.db):
+            _print_entry(entry)
+    else:
+        latest = {}
+        for entry in read_log():
+            latest[entry["task"]] = entry
+        if not latest:
+            print("유지보수 기록이 없습니다.")
+        for task in MAINTENANCE_TASKS:
+            if task in latest:
+                print(f"{latest[task]['started_at']}  ", end="")
+                _print_entry(latest[task])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 """
 SQLAlchemy 모델 정의
 """
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Text, Numeric
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Text, Numeric, Table, Index, DDL, event
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime
 
@@ -47,10 +47,18 @@ class OrderMaster(Base):
     approved_at = Column(DateTime, nullable=True)
     created_by = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.now, nullable=False)
+    version = Column(Integer, default=1, nullable=False)  # 낙관적 동시성 제어용 버전
+    closed_at = Column(DateTime, nullable=True)  # 출하완료/거부 처리 일시 (보관 대상 판단 기준)
 
     # 관계
     details = relationship("OrderDetail", back_populates="master", cascade="all, delete-orphan")
 
+    # ORM UPDATE 시 버전을 조건으로 걸어, 다른 사용자가 먼저 변경한 경우 StaleDataError 발생
+    __mapper_args__ = {"version_id_col": version}
+    # 보관 대상 조회(closed_at < 기준일 ORDER BY closed_at, order_no LIMIT n)가 정렬 없이 범위 검색만 하도록 합니다.
+    # 진행 중인 주문은 closed_at이 NULL이므로 범위에 들어가지 않습니다.
+    __table_args__ = (Index("ix_order_master_closed_at", "closed_at", "order_no"),)
+
 
 class OrderDetail(Base):
     """주문 상세 테이블"""
@@ -66,6 +74,9 @@ class OrderDetail(Base):
     shipping_amount = Column(Numeric(10, 2), default=0)
     planned_shipping_date = Column(Date, nullable=True)
     actual_shipping_date = Column(Date, nullable=True)
+    received_qty = Column(Integer, default=0, nullable=False)  # 누적 입고수량 (received_qty <= order_qty)
+    planned_qty = Column(Integer, default=0, nullable=False)  # 누적 출하계획수량 (planned_qty <= received_qty)
+    version = Column(Integer, default=1, nullable=False)  # 수량 잔고 변경 시 증가
 
     # 관계
     master = relationship("OrderMaster", back_populates="details")
@@ -99,3 +110,138 @@ class ShippingPlan(Base):
     created_by = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.now, nullable=False)
 
+
+class OrderIdempotencyKey(Base):
+    """주문 API 멱등성 키 (같은 고객사 사용자가 같은 키로 다시 보내면 기존 주문번호를 돌려줌)"""
+    __tablename__ = "order_idempotency_key"
+
+    username = Column(String, primary_key=True)
+    idempotency_key = Column(String, primary_key=True)
+    order_no = Column(String, nullable=False)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+
+
+class UserSession(Base):
+    """로그인 세션 (서명된 세션 토큰의 서버 측 기록, 로그아웃하면 revoked_at이 채워짐)"""
+    __tablename__ = "user_sessions"
+
+    session_id = Column(String, primary_key=True)
+    user_id = Column(String, ForeignKey("users.user_id"), nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+
+
+class ChangeCounter(Base):
+    """테이블별 변경 카운터 (캐시 무효화용, 아래 트리거가 행 변경마다 증가시킴)"""
+    __tablename__ = "change_counter"
+
+    name = Column(String, primary_key=True)  # 테이블 이름
+    version = Column(Integer, default=0, nullable=False)
+
+
+class OrderChange(Base):
+    """주문별 마지막 변경 순번 (주문 관련 테이블의 트리거가 기록, 순번은 change_counter의 'order_changes' 값)"""
+    __tablename__ = "order_changes"
+
+    order_no = Column(String, primary_key=True)
+    seq = Column(Integer, nullable=False, index=True)
+
+
+class ChangeTrackingPause(Base):
+    """
+    행이 있으면 변경 카운터 트리거가 동작하지 않음 (대량 쓰기 전용, database/change_notifier.bulk_changes)
+    같은 쓰기 트랜잭션 안에서 넣고 지우므로 커밋되지 않으며 다른 연결의 쓰기에는 영향이 없습니다.
+    """
+    __tablename__ = "change_tracking_pause"
+
+    id = Column(Integer, primary_key=True)
+
+
+# 변경 카운터를 유지하는 테이블. 어떤 프로세스나 도구가 행을 바꾸어도 카운터가 증가하므로
+# 같은 데이터베이스 파일을 쓰는 모든 프로세스의 캐시가 바로 알 수 있습니다 (database/change_notifier.py).
+CHANGE_COUNTED_TABLES = (
+    ItemMaster.__table__,
+    User.__table__,
+    OrderMaster.__table__,
+    OrderDetail.__table__,
+    Warehouse.__table__,
+    ShippingPlan.__table__,
+)
+
+# 변경된 주문번호를 order_changes에 함께 기록하는 테이블
+ORDER_KEYED_TABLES = {OrderMaster.__tablename__, OrderDetail.__tablename__, Warehouse.__tablename__, ShippingPlan.__tablename__}
+
+
+def _bump_counter(name: str) -> str:
+    return (f"INSERT INTO change_counter (name, version) VALUES ('{name}', 1) "
+            f"ON CONFLICT(name) DO UPDATE SET version = version + 1;")
+
+
+# 이전 버전의 트리거 이름 (init_db가 지우고 아래 트리거로 바꿉니다)
+LEGACY_TRIGGER_NAME = "trg_{table}_{op}_counter"
+TRIGGER_NAME = "trg_{table}_{op}_changes"
+
+
+def change_counter_triggers(table_name: str) -> list:
+    """
+    table_name의 INSERT/UPDATE/DELETE마다 change_counter를 증가시키는 트리거 DDL
+    주문 관련 테이블은 변경된 주문번호와 순번도 order_changes에 기록합니다.
+    대량 쓰기는 change_tracking_pause에 행을 넣어 트리거를 건너뛰고 문장/배치마다 한 번만 기록합니다.
+    """
+    triggers = []
+    for op in ("INSERT", "UPDATE", "DELETE"):
+        body = _bump_counter(table_name)
+        if table_name in ORDER_KEYED_TABLES:
+            row = "OLD" if op == "DELETE" else "NEW"
+            body += (
+                f" {_bump_counter('order_changes')}"
+                f" INSERT INTO order_changes (order_no, seq) VALUES ({row}.order_no, "
+                f"(SELECT version FROM change_counter WHERE name = 'order_changes')) "
+                f"ON CONFLICT(order_no) DO UPDATE SET seq = excluded.seq;"
+            )
+        name = TRIGGER_NAME.format(table=table_name, op=op.lower())
+        triggers.append(
+            f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {op} ON {table_name} "
+            f"WHEN NOT EXISTS (SELECT 1 FROM change_tracking_pause) BEGIN {body} END"
+        )
+    return triggers
+
+
+for _table in CHANGE_COUNTED_TABLES:
+    for _ddl in change_counter_triggers(_table.name):
+        event.listen(_table, "after_create", DDL(_ddl))
+
+
+# --- 보관(아카이브) 테이블 ---
+# 오래전에 종료된(출하완료/거부) 주문은 database/archive.py가 아래 테이블로 옮깁니다.
+# 원본과 같은 컬럼에 보관 일시(archived_at)를 더하며, 외래 키 없이 주문번호 인덱스만 둡니다.
+
+def _archive_table(source: Table) -> Table:
+    columns = [
+        Column(col.name, col.type, primary_key=col.primary_key, nullable=col.nullable, autoincrement=False,
+               index=(col.name == "order_no" and not col.primary_key))
+        for col in source.columns
+    ]
+    return Table(f"archived_{source.name}", Base.metadata, *columns,
+                 Column("archived_at", DateTime, default=datetime.now, nullable=False))
+
+
+class ArchivedOrderMaster(Base):
+    """보관된 주문 마스터"""
+    __table__ = _archive_table(OrderMaster.__table__)
+
+
+class ArchivedOrderDetail(Base):
+    """보관된 주문 상세"""
+    __table__ = _archive_table(OrderDetail.__table__)
+
+
+class ArchivedWarehouse(Base):
+    """보관된 입고 내역"""
+    __table__ = _archive_table(Warehouse.__table__)
+
+
+class ArchivedShippingPlan(Base):
+    """보관된 출하 계획"""
+    __table__ = _archive_table(ShippingPlan.__table__)
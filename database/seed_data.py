@@ -0,0 +1,307 @@
+"""
+대용량 합성 데이터 생성기
+
+고객사(발주사 사용자), 품목, 주문, 주문 상세, 입고, 출하 계획/출하 완료 데이터를
+현실적인 상태 분포와 기간에 맞춰 생성합니다. Core bulk insert를 사용하여 수백만 행을 빠르게 적재하며,
+같은 시드와 옵션이면 항상 같은 데이터가 만들어집니다 (비밀번호 해시 제외).
+
+실행:
+    python -m database.seed_data --db data/synthetic.db --orders 1000000 --seed 42
+    python -m database.seed_data --orders 10000 --end-date 2026-06-30   # 기본 파일(data/synthetic.db)에 추가
+
+적재 속도를 위해 동기화(synchronous)를 끄므로 합성 데이터 전용 파일에만 생성하며, 운영 데이터베이스(DB_PATH)는 거부합니다.
+"""
+import argparse
+import bisect
+import itertools
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import Integer, cast, create_engine, event, func, insert, select
+
+# 프로젝트 루트를 경로에 추가 (python database/seed_data.py 로 실행하는 경우)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DB_PATH, BCRYPT_ROUNDS
+from database.change_notifier import bulk_changes
+from database.models import Base, User, ItemMaster, OrderMaster, OrderDetail, Warehouse, ShippingPlan
+
+CHUNK_SIZE = 20_000
+ORDER_TABLES = (OrderMaster.__table__, OrderDetail.__table__, Warehouse.__table__, ShippingPlan.__table__)
+DEFAULT_SEED_DB = "data/synthetic.db"
+DEFAULT_END_DATE = date(2025, 12, 31)  # 실행 날짜와 무관하게 같은 시드면 같은 데이터가 되도록 고정
+
+# 기본 계정 (database/db_init.py와 동일)
+DEFAULT_USERS = [
+    ("user001", "samsung_sdi", "samsung123", "발주사", "삼성SDI"),
+    ("user002", "hyundai_motor", "hyundai123", "발주사", "현대자동차"),
+    ("user003", "order_manager", "order123", "주문담당자", "세방리튬배터리"),
+    ("user004", "manufacturing", "mfg123", "제조담당자", "세방리튬배터리"),
+]
+
+# 기본 품목 (database/db_init.py와 동일)
+DEFAULT_ITEMS = [
+    ("ITEM001", "ESS (Energy Storage System)", 30, 400000.00),
+    ("ITEM002", "EV 모듈 (Electric Vehicle Module)", 30, 150000.00),
+    ("ITEM003", "SV (가정: 차량용 보조전원/저전압 시스템 등 소형 팩)", 45, 250000.00),
+    ("ITEM004", "PLBM (Parking LBM, 특정 제품군)", 60, 400000.00),
+]
+
+EXTRA_COMPANIES = ["LG에너지솔루션", "SK온", "기아", "한화큐셀", "두산에너빌리티", "포스코퓨처엠", "에코프로", "LS일렉트릭"]
+ITEM_FAMILIES = [("ESS", 30, 300000, 600000), ("EV 모듈", 30, 100000, 250000),
+                 ("SV 팩", 45, 150000, 350000), ("PLBM", 60, 250000, 500000)]
+GENERATED_USER_PASSWORD = "customer123"
+
+
+def _cumulative(weights):
+    return list(itertools.accumulate(weights))
+
+
+def _weighted_index(rng, cumulative):
+    return bisect.bisect_right(cumulative, rng.random() * cumulative[-1])
+
+
+def _order_status(rng, age_days: int, lead_days: int) -> str:
+    """주문일로부터 경과일과 납기를 기준으로 현실적인 진행 상태를 고릅니다."""
+    if rng.random() < 0.05:
+        return "거부"
+    progress = age_days / (lead_days + 20) + rng.uniform(-0.15, 0.15)
+    if progress < 0.04:
+        return "대기"
+    if progress < 0.12:
+        return "승인"
+    if progress < 0.75:
+        return "생산중"
+    if progress < 0.95:
+        return "입고완료"
+    return "출하완료" if rng.random() < 0.985 else "입고완료"
+
+
+def _split(rng, total: int, parts: int) -> list:
+    """total을 parts개의 양의 정수로 나눕니다."""
+    parts = max(1, min(parts, total))
+    cuts = sorted(rng.sample(range(1, total), parts - 1)) if parts > 1 else []
+    return [b - a for a, b in zip([0] + cuts, cuts + [total])]
+
+
+def _build_users(customers: int):
+    import bcrypt
+
+    rows = []
+    for user_id, username, password, role, company in DEFAULT_USERS:
+        rows.append((user_id, username, bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(BCRYPT_ROUNDS)).decode("utf-8"), role, company))
+    shared_hash = bcrypt.hashpw(GENERATED_USER_PASSWORD.encode("utf-8"), bcrypt.gensalt(BCRYPT_ROUNDS)).decode("utf-8")
+    companies = [("samsung_sdi", "삼성SDI"), ("hyundai_motor", "현대자동차")]
+    for n in range(max(0, customers - 2)):
+        company = EXTRA_COMPANIES[n] if n < len(EXTRA_COMPANIES) else f"고객사{n + 1:03d}"
+        username = f"customer{n + 1:03d}"
+        rows.append((f"cust{n + 1:05d}", username, shared_hash, "발주사", company))
+        companies.append((username, company))
+    return rows, companies[:max(customers, 1)]
+
+
+def _build_items(rng, count: int):
+    """(품목코드, 품목명, 리드타임, 단가, 사용여부) 목록. 기본 품목 뒤에 생성 품목이 이어집니다."""
+    items = [item + ("Y",) for item in DEFAULT_ITEMS]
+    for n in range(len(DEFAULT_ITEMS), count):
+        family, lead, low, high = ITEM_FAMILIES[n % len(ITEM_FAMILIES)]
+        capacity = rng.choice([5, 10, 20, 50, 100, 200])
+        items.append((f"ITEM{n + 1:03d}", f"{family} {capacity}kWh 타입{n + 1:03d}", lead + rng.choice([0, 0, 15]),
+                      float(rng.randrange(low, high, 5000)), "N" if rng.random() < 0.05 else "Y"))
+    return items[:max(count, 1)]
+
+
+def generate(engine, orders: int, seed: int = 42, customers: int = 10, items: int = 40, days: int = 730,
+             end_date: date = DEFAULT_END_DATE, progress=None) -> dict:
+    """
+    합성 데이터를 생성하여 engine의 데이터베이스에 적재합니다.
+    Returns: 테이블별 생성 행 수
+    """
+    rng = random.Random(seed)
+    Base.metadata.create_all(bind=engine)
+
+    user_rows, companies = _build_users(customers)
+    item_rows = _build_items(rng, items)
+    orderable = [item[:4] for item in item_rows if item[4] == "Y"]
+    customer_weights = _cumulative([1 / (rank + 1) ** 0.8 for rank in range(len(companies))])
+    item_weights = _cumulative([1 / (rank + 1) ** 0.6 for rank in range(len(orderable))])
+    lines_weights = _cumulative([30, 30, 20, 12, 8])  # 주문당 품목 수 1~5
+    now = datetime.combine(end_date, datetime.min.time())
+    counts = {"users": 0, "item_master": 0, "order_master": 0, "order_detail": 0, "warehouse": 0, "shipping_plan": 0}
+
+    with engine.begin() as conn:
+        existing_users = set(conn.execute(select(User.username)).scalars())
+        new_users = [{"user_id": u, "username": n, "password_hash": h, "role": r, "company_name": c, "created_at": now}
+                     for u, n, h, r, c in user_rows if n not in existing_users]
+        if new_users:
+            conn.execute(insert(User.__table__), new_users)
+        existing_items = set(conn.execute(select(ItemMaster.item_code)).scalars())
+        new_items = [{"item_code": code, "item_name": name, "lead_time_days": lead, "unit_price": price,
+                      "is_active": active, "created_at": now}
+                     for code, name, lead, price, active in item_rows if code not in existing_items]
+        if new_items:
+            conn.execute(insert(ItemMaster.__table__), new_items)
+        counts["users"], counts["item_master"] = len(new_users), len(new_items)
+
+        # 주문 관련 테이블은 행 단위 변경 트리거 대신 적재가 끝날 때 카운터를 한 번만 올립니다.
+        with bulk_changes(conn, [table.name for table in ORDER_TABLES]):
+            # 연도별 채번은 이미 있는 마지막 주문번호 다음부터 시작
+            year_seq = {}
+            masters, details, receipts, plans = [], [], [], []
+
+            def flush():
+                for table, rows, key in ((OrderMaster.__table__, masters, "order_master"), (OrderDetail.__table__, details, "order_detail"),
+                                         (Warehouse.__table__, receipts, "warehouse"), (ShippingPlan.__table__, plans, "shipping_plan")):
+                    if rows:
+                        conn.execute(insert(table), rows)
+                        counts[key] += len(rows)
+                        rows.clear()
+
+            for i in range(orders):
+                # 주문량이 시간에 따라 완만하게 증가하도록 최근 날짜에 더 많이 배치
+                age_days = int(days * (1 - ((i + rng.random()) / orders) ** 0.8))
+                order_date = end_date - timedelta(days=age_days)
+                year = order_date.year
+                if year not in year_seq:
+                    # 일련번호는 3자리 이상으로 늘어나므로 문자열이 아닌 숫자로 최댓값을 구합니다.
+                    prefix = f"ORD-{year}-"
+                    last = conn.execute(select(func.max(cast(func.substr(OrderMaster.order_no, len(prefix) + 1), Integer))).where(
+                        OrderMaster.order_no >= prefix, OrderMaster.order_no < f"ORD-{year}.")).scalar()
+                    year_seq[year] = last or 0
+                year_seq[year] += 1
+                order_no = f"ORD-{year}-{year_seq[year]:03d}"
+
+                username, company = companies[_weighted_index(rng, customer_weights)]
+                created_at = datetime.combine(order_date, datetime.min.time()) + timedelta(seconds=rng.randrange(8 * 3600, 19 * 3600))
+                line_items = {orderable[_weighted_index(rng, item_weights)] for _ in range(_weighted_index(rng, lines_weights) + 1)}
+                max_lead = max(item[2] for item in line_items)
+                status = _order_status(rng, age_days, max_lead)
+                approved = status not in ("대기", "거부")
+                approved_at = created_at + timedelta(hours=rng.randint(1, 48)) if approved else None
+
+                masters.append({
+                    "order_no": order_no, "order_date": order_date, "order_type": "긴급" if rng.random() < 0.12 else "일반",
+                    "customer_company": company, "status": status, "priority": rng.randint(1, 9) if approved else 5,
+                    "approved_by": "order_manager" if approved else None, "approved_at": approved_at,
+                    "created_by": username, "created_at": created_at, "version": 1,
+                    "closed_at": created_at + timedelta(days=1) if status == "거부" else None,
+                })
+                last_shipped = None
+
+                for seq, (code, name, lead, price) in enumerate(sorted(line_items), start=1):
+                    qty = rng.choice([10, 20, 50, 100, 200, 500]) * rng.randint(1, 4)
+                    due = order_date + timedelta(days=lead)
+
+                    if status in ("입고완료", "출하완료"):
+                        received = qty
+                    elif status == "생산중":
+                        received = rng.choice([0, qty // 4, qty // 2, qty]) if seq > 1 else qty // 2
+                    else:
+                        received = 0
+
+                    if received:
+                        receipt_day = min(order_date + timedelta(days=max(lead - 5, 1)), end_date)
+                        for part_idx, part in enumerate(_split(rng, received, rng.randint(1, 3))):
+                            day = min(receipt_day + timedelta(days=part_idx * 2), end_date)
+                            receipts.append({
+                                "order_no": order_no, "order_seq": seq, "item_code": code, "item_name": name,
+                                "received_qty": part, "received_date": day, "received_by": "manufacturing",
+                                "created_at": datetime.combine(day, datetime.min.time()) + timedelta(hours=rng.randint(8, 18)),
+                            })
+
+                    planned, shipped, shipped_date = 0, 0, None
+                    if status == "출하완료":
+                        planned = shipped = qty
+                        plan_status = ["출하완료"]
+                    elif status == "입고완료":
+                        planned = rng.choice([0, qty // 2, qty])
+                        plan_status = ["계획", "지시"]
+                    if planned:
+                        plan_day = min(due + timedelta(days=rng.randint(-3, 5)), end_date)
+                        shipped_date = plan_day if shipped else None
+                        if shipped_date and (last_shipped is None or shipped_date > last_shipped):
+                            last_shipped = shipped_date
+                        for part in _split(rng, planned, rng.randint(1, 2)):
+                            plans.append({
+                                "order_no": order_no, "order_seq": seq, "planned_shipping_date": plan_day,
+                                "planned_qty": part, "status": rng.choice(plan_status), "created_by": "order_manager",
+                                "created_at": datetime.combine(plan_day, datetime.min.time()) - timedelta(days=2),
+                            })
+
+                    details.append({
+                        "order_no": order_no, "order_seq": seq, "item_code": code, "item_name": name, "order_qty": qty,
+                        "unit_price": price, "shipping_qty": shipped, "shipping_amount": price * shipped,
+                        "planned_shipping_date": due, "actual_shipping_date": shipped_date,
+                        "received_qty": received, "planned_qty": planned, "version": 1,
+                    })
+
+                if last_shipped:
+                    masters[-1]["closed_at"] = datetime.combine(last_shipped, datetime.min.time()) + timedelta(hours=17)
+
+                if len(masters) >= CHUNK_SIZE:
+                    flush()
+                    if progress:
+                        progress(i + 1, orders)
+            flush()
+            if progress:
+                progress(orders, orders)
+    return counts
+
+
+def create_seed_engine(db_path: str):
+    """적재 속도를 위해 동기화를 끈 전용 엔진 (새로 만드는 합성 데이터베이스용)"""
+    engine = create_engine(f"sqlite:///{db_path}", echo=False)
+
+    @event.listens_for(engine, "connect")
+    def _bulk_load_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.execute("PRAGMA synchronous = OFF")
+        cursor.execute("PRAGMA cache_size = -262144")  # 256MB
+        cursor.execute("PRAGMA temp_store = MEMORY")
+        cursor.close()
+
+    return engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대용량 합성 SCM 데이터 생성")
+    parser.add_argument("--db", default=DEFAULT_SEED_DB, help=f"대상 SQLite 파일 (기본값: {DEFAULT_SEED_DB})")
+    parser.add_argument("--orders", type=int, default=10000, help="생성할 주문 수")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+    parser.add_argument("--customers", type=int, default=10, help="발주사(고객사) 수")
+    parser.add_argument("--items", type=int, default=40, help="품목 수")
+    parser.add_argument("--days", type=int, default=730, help="주문 기간 (종료일 이전 일수)")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=DEFAULT_END_DATE,
+                        help=f"주문 기간 종료일 (YYYY-MM-DD, 기본값: {DEFAULT_END_DATE})")
+    args = parser.parse_args()
+    if os.path.abspath(args.db) == os.path.abspath(DB_PATH):
+        parser.error(f"운영 데이터베이스({DB_PATH})에는 합성 데이터를 생성할 수 없습니다. --db로 별도 파일을 지정하세요.")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.db)), exist_ok=True)
+    engine = create_seed_engine(args.db)
+    started = time.perf_counter()
+
+    def progress(done, total):
+        elapsed = time.perf_counter() - started
+        print(f"\r  주문 {done:,}/{total:,} ({elapsed:.1f}s)", end="", file=sys.stderr, flush=True)
+
+    counts = generate(engine, args.orders, seed=args.seed, customers=args.customers, items=args.items,
+                      days=args.days, end_date=args.end_date, progress=progress)
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    engine.dispose()
+
+    elapsed = time.perf_counter() - started
+    total_rows = sum(counts.values())
+    print(file=sys.stderr)
+    for table, count in counts.items():
+        print(f"  {table:<14}{count:>12,}행")
+    print(f"합계 {total_rows:,}행 / {elapsed:.1f}s ({total_rows / elapsed:,.0f} rows/s) -> {args.db}")
+
+
+if __name__ == "__main__":
+    main()
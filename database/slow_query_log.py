@@ -0,0 +1,175 @@
+"""
+느린 쿼리 로그
+
+config.SLOW_QUERY_THRESHOLD_MS 이상 걸린 SQL을 실행 시간, 값이 가려진 파라미터, 호출한 서비스 함수,
+EXPLAIN QUERY PLAN 결과와 함께 회전 로그 파일(logs/slow_queries.log)에 JSON 한 줄로 기록합니다.
+
+요약 (총 소요 시간 기준 상위 문장):
+    python -m database.slow_query_log --top 20
+    python -m database.slow_query_log --since 2025-01-01 --log logs/slow_queries.log
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import event
+
+# 프로젝트 루트를 경로에 추가 (python database/slow_query_log.py 로 실행하는 경우)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from config import SLOW_QUERY_THRESHOLD_MS, SLOW_QUERY_LOG_PATH, SLOW_QUERY_EXPLAIN
+from database.instrumentation import json_line_logger, normalize_statement
+
+# 호출 위치로 인정할 애플리케이션 코드 디렉토리 (앞쪽이 우선)
+_CALLER_DIRS = [os.path.join(ROOT_DIR, name) + os.sep for name in ("services", "pages", "utils", "auth")]
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+
+def redact_value(value):
+    """숫자/날짜/None은 그대로 두고 문자열과 바이트는 길이만 남깁니다."""
+    if value is None or isinstance(value, (bool, int, float, Decimal)):
+        return value if not isinstance(value, Decimal) else float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def redact_parameters(parameters, executemany: bool = False):
+    if executemany:
+        rows = list(parameters or [])
+        return {"rows": len(rows), "first": redact_parameters(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: redact_value(value) for key, value in parameters.items()}
+    return [redact_value(value) for value in (parameters or ())]
+
+
+def find_caller() -> str:
+    """쿼리를 실행한 애플리케이션 함수 ('services/order_service.py:create_order:42'). 서비스 계층을 우선합니다."""
+    frame = sys._getframe(2)
+    found = {}
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        for rank, directory in enumerate(_CALLER_DIRS):
+            if filename.startswith(directory) and rank not in found:
+                found[rank] = f"{os.path.relpath(filename, ROOT_DIR)}:{frame.f_code.co_name}:{frame.f_lineno}"
+        if 0 in found:
+            break
+        frame = frame.f_back
+    return found[min(found)] if found else None
+
+
+def explain_query_plan(dbapi_connection, statement: str, parameters):
+    """같은 연결에서 EXPLAIN QUERY PLAN 실행 (문장은 실제로 실행되지 않음)"""
+    if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+        return [row[-1] for row in cursor.fetchall()]
+    except Exception as e:
+        return [f"EXPLAIN 실패: {e}"]
+    finally:
+        cursor.close()
+
+
+def install_slow_query_log(engine, threshold_ms: float = SLOW_QUERY_THRESHOLD_MS, log_path: str = SLOW_QUERY_LOG_PATH):
+    """엔진에 느린 쿼리 기록 이벤트를 등록합니다. threshold_ms가 None이면 등록하지 않습니다."""
+    if threshold_ms is None:
+        return engine
+    logger = json_line_logger(f"scm.slow_query.{log_path}", log_path)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("scm_slow_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("scm_slow_query_start")
+        if not starts:
+            return
+        elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+        if elapsed_ms < threshold_ms:
+            return
+
+        plan = None
+        if SLOW_QUERY_EXPLAIN:
+            plan_params = (parameters[0] if parameters else None) if executemany else parameters
+            plan = explain_query_plan(cursor.connection, statement, plan_params)
+        logger.warning(json.dumps({
+            "time": datetime.now().isoformat(timespec="milliseconds"),
+            "duration_ms": round(elapsed_ms, 2),
+            "caller": find_caller(),
+            "sql": statement,
+            "params": redact_parameters(parameters, executemany),
+            "plan": plan,
+        }, ensure_ascii=False))
+
+    return engine
+
+
+# --- 요약 CLI ---
+
+def read_entries(log_path: str = SLOW_QUERY_LOG_PATH, since: datetime = None):
+    """회전된 파일까지 포함하여 기록을 읽습니다 (손상된 줄은 건너뜀)."""
+    for path in sorted(glob.glob(log_path + "*"), reverse=True):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if since and datetime.fromisoformat(entry["time"]) < since:
+                    continue
+                yield entry
+
+
+def summarize(entries) -> list:
+    """문장 형태별 횟수, 총/평균/최대 시간, 호출 위치, 가장 느린 실행의 쿼리 계획 (총 시간 내림차순)"""
+    groups = {}
+    for entry in entries:
+        shape = normalize_statement(entry["sql"])
+        group = groups.setdefault(shape, {"shape": shape, "count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                          "callers": {}, "plan": None})
+        group["count"] += 1
+        group["total_ms"] += entry["duration_ms"]
+        caller = entry.get("caller") or "-"
+        group["callers"][caller] = group["callers"].get(caller, 0) + 1
+        if entry["duration_ms"] >= group["max_ms"]:
+            group["max_ms"] = entry["duration_ms"]
+            group["plan"] = entry.get("plan")
+    return sorted(groups.values(), key=lambda g: -g["total_ms"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="느린 쿼리 로그 요약")
+    parser.add_argument("--log", default=SLOW_QUERY_LOG_PATH, help="로그 파일 경로")
+    parser.add_argument("--top", type=int, default=10, help="출력할 문장 수")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="이 시각 이후 기록만 (YYYY-MM-DD[THH:MM])")
+    args = parser.parse_args()
+
+    groups = summarize(read_entries(args.log, args.since))
+    if not groups:
+        print(f"기록된 느린 쿼리가 없습니다: {args.log}")
+        return
+
+    for rank, group in enumerate(groups[:args.top], start=1):
+        avg_ms = group["total_ms"] / group["count"]
+        print(f"{rank}. 총 {group['total_ms']:,.0f}ms / {group['count']}회 (평균 {avg_ms:,.1f}ms, 최대 {group['max_ms']:,.1f}ms)")
+        print(f"   {group['shape'][:300]}")
+        for caller, count in sorted(group["callers"].items(), key=lambda item: -item[1])[:3]:
+            print(f"   호출: {caller} ({count}회)")
+        for step in group["plan"] or []:
+            print(f"   계획: {step}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+그룹 커밋 쓰기 큐
+
+Streamlit 세션들이 제출한 쓰기 작업(unit-of-work)을 하나의 백그라운드 스레드가 받아
+짧은 시간 창 안에 모인 작업들을 하나의 트랜잭션으로 커밋합니다.
+각 작업은 SAVEPOINT 안에서 실행되므로 한 작업의 실패는 같은 배치의 다른 작업에 영향을 주지 않으며,
+호출자는 자신의 작업 결과 또는 예외를 그대로 돌려받습니다.
+
+작업은 `fn(db, *args, **kwargs)` 형태의 함수이며, 기존 서비스 함수(create_order 등)를 그대로 사용할 수 있습니다.
+작업 안에서 호출되는 `db.commit()`은 flush로 대체되고, 실제 커밋은 배치 단위로 한 번만 일어납니다.
+작업에 넘기는 ORM 객체는 쓰기 스레드의 세션에 속하지 않으므로, 키(주문번호 등)를 넘기고 작업 안에서 다시 조회해야 합니다.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from config import (
+    DB_PATH,
+    WRITE_QUEUE_ENABLED, WRITE_QUEUE_WINDOW_MS, WRITE_QUEUE_MAX_BATCH, WRITE_QUEUE_TIMEOUT_S,
+    SQLITE_BUSY_TIMEOUT_MS,
+)
+from database.connection import SessionLocal, apply_sqlite_pragmas
+from database.slow_query_log import install_slow_query_log
+from utils.metrics import DB_LOCK_WAIT, WRITE_BATCH_SIZE, WRITE_QUEUE_DEPTH
+
+
+def create_writer_engine(db_url: str = None):
+    """
+    쓰기 스레드 전용 엔진 생성
+    pysqlite의 암묵적 트랜잭션 처리를 끄고 BEGIN IMMEDIATE를 직접 실행하여
+    SAVEPOINT가 배치 트랜잭션 안에서 올바르게 동작하도록 합니다.
+    """
+    engine = apply_sqlite_pragmas(create_engine(
+        db_url or f"sqlite:///{DB_PATH}",
+        echo=False,
+        pool_size=1,
+        connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+    ))
+
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin_immediate(conn):
+        started = time.perf_counter()
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        DB_LOCK_WAIT.observe(time.perf_counter() - started)
+
+    return install_slow_query_log(engine)
+
+
+class _DeferredCommitSession:
+    """작업 실행 중 commit()을 flush()로 바꿔 배치 전체를 한 번에 커밋하도록 하는 세션 래퍼"""
+
+    def __init__(self, session):
+        self._session = session
+        self.rollback_requested = False
+
+    def commit(self):
+        self._session.flush()
+
+    def rollback(self):
+        # 배치 전체가 아니라 현재 작업의 SAVEPOINT만 되돌리도록 표시만 해 둡니다.
+        self.rollback_requested = True
+
+    def close(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+class _Command:
+    __slots__ = ("fn", "args", "kwargs", "future", "enqueued_at")
+
+    def __init__(self, fn, args, kwargs):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class GroupCommitWriter:
+    """작업을 모아 그룹 커밋하는 백그라운드 쓰기 스레드"""
+
+    def __init__(self, session_factory=None, window_ms: float = WRITE_QUEUE_WINDOW_MS,
+                 max_batch: int = WRITE_QUEUE_MAX_BATCH):
+        if session_factory is None:
+            session_factory = sessionmaker(autocommit=False, autoflush=False, bind=create_writer_engine())
+        self._session_factory = session_factory
+        self._window = window_ms / 1000
+        self._max_batch = max_batch
+        self._queue = queue.Queue()
+        self._stopping = threading.Event()
+        self._thread = None
+        self.batches_committed = 0
+        self.commands_processed = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """처리 대기 중인 작업 수"""
+        return self._queue.qsize()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="scm-group-commit-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = None):
+        """대기 중인 작업을 모두 처리한 뒤 스레드를 종료합니다."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """작업을 큐에 넣고 결과를 받을 Future를 반환합니다."""
+        if self._stopping.is_set():
+            raise RuntimeError("쓰기 큐가 종료되었습니다.")
+        command = _Command(fn, args, kwargs)
+        self._queue.put(command)
+        return command.future
+
+    def execute(self, fn, *args, timeout: float = WRITE_QUEUE_TIMEOUT_S, **kwargs):
+        """작업을 제출하고 커밋될 때까지 기다려 결과를 반환합니다. 작업의 예외는 그대로 다시 발생합니다."""
+        return self.submit(fn, *args, **kwargs).result(timeout)
+
+    def _run(self):
+        while not (self._stopping.is_set() and self._queue.empty()):
+            try:
+                first = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            deadline = time.perf_counter() + self._window
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.perf_counter()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            self._process_batch(batch)
+
+    def _process_batch(self, batch):
+        outcomes = []
+        db = self._session_factory()
+        try:
+            for command in batch:
+                if not command.future.set_running_or_notify_cancel():
+                    continue
+                proxy = _DeferredCommitSession(db)
+                savepoint = db.begin_nested()
+                try:
+                    result = command.fn(proxy, *command.args, **command.kwargs)
+                    if proxy.rollback_requested:
+                        savepoint.rollback()
+                    else:
+                        savepoint.commit()
+                    outcomes.append((command, result, None))
+                except Exception as e:
+                    if savepoint.is_active:
+                        savepoint.rollback()
+                    outcomes.append((command, None, e))
+            db.commit()
+        except Exception as e:
+            # 배치 커밋 자체가 실패하면 성공했던 작업도 반영되지 않았으므로 모두 실패로 알립니다.
+            db.rollback()
+            errors = {id(command): error for command, _, error in outcomes if error is not None}
+            outcomes = [(command, None, errors.get(id(command), e)) for command in batch if command.future.running()]
+        finally:
+            db.close()
+
+        self.batches_committed += 1
+        self.commands_processed += len(outcomes)
+        WRITE_BATCH_SIZE.observe(len(batch))
+        for command, result, error in outcomes:
+            if error is not None:
+                command.future.set_exception(error)
+            else:
+                command.future.set_result(result)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> GroupCommitWriter:
+    """프로세스 전역 쓰기 큐를 반환합니다. 최초 호출 시 스레드를 시작합니다."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = GroupCommitWriter().start()
+            WRITE_QUEUE_DEPTH.set_function(lambda: _writer.queue_depth)
+        return _writer
+
+
+def run_write(fn, *args, **kwargs):
+    """
+    쓰기 작업 실행
+    WRITE_QUEUE_ENABLED면 그룹 커밋 큐를 통해 실행하고, 아니면 새 세션에서 바로 실행하여 커밋합니다.
+    """
+    if WRITE_QUEUE_ENABLED:
+        return get_writer().execute(fn, *args, **kwargs)
+
+    db = SessionLocal()
+    try:
+        return fn(db, *args, **kwargs)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -1,10 +1,26 @@
 """
-This file makes the pages directory a Python package and exposes the page functions.
+This file makes the pages directory a Python package and resolves page functions lazily.
+
+Page modules import pandas, the services and the Excel helpers, so they are only imported
+the first time a user navigates to them instead of before the login screen renders.
 """
-from .page_1_order_registration import show_page as page_1_order_registration
-from .page_2_order_approval import show_page as page_2_order_approval
-from .page_3_warehousing import show_page as page_3_warehousing
-from .page_4_shipping_plan import show_page as page_4_shipping_plan
-from .page_5_dashboard import show_page as page_5_dashboard
-from .page_6_shipping_registration import show_page as page_6_shipping_registration
-from .page_order_detail import show_page as page_order_detail
\ No newline at end of file
+import importlib
+
+# Page name -> module that defines show_page()
+PAGE_MODULES = {
+    "대시보드": "pages.page_5_dashboard",
+    "주문등록": "pages.page_1_order_registration",
+    "주문승인": "pages.page_2_order_approval",
+    "입고등록": "pages.page_3_warehousing",
+    "출하계획": "pages.page_4_shipping_plan",
+    "출하등록": "pages.page_6_shipping_registration",
+    "주문상세": "pages.page_order_detail",
+}
+
+
+def load_page(page_name: str):
+    """Returns the show_page function for the given page name, importing its module on first use (None if unknown)."""
+    module_name = PAGE_MODULES.get(page_name)
+    if module_name is None:
+        return None
+    return importlib.import_module(module_name).show_page
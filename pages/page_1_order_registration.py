@@ -4,6 +4,7 @@ import pandas as pd
 from datetime import datetime, date, timedelta
 from auth.auth import get_current_user
 from database.connection import get_db, close_db
+from database.write_queue import run_write
 from utils.excel_handler import download_template
 from utils.validators import validate_order_date, validate_order_type, validate_customer_company, validate_qty
 from config import ORDER_TYPE
@@ -140,7 +141,7 @@ def render_create_order_form(db, user, page_state, order_data):
     with st.form("manual_order_form"):
         if st.form_submit_button("📄 발주서 생성 및 등록", use_container_width=True, type="primary"):
             try:
-                order_no = create_order(db, user, order_data, page_state["order_details"])
+                order_no = run_write(create_order, user, order_data, page_state["order_details"])
                 st.success(f"주문이 성공적으로 등록되었습니다. (주문번호: {order_no})")
                 page_state["order_details"] = []
                 st.rerun()
@@ -151,15 +152,32 @@ def render_excel_upload_tab(db, user):
     """Renders the Excel upload tab."""
     st.subheader("엑셀 업로드")
     
-    st.download_button("주문 템플릿 다운로드", download_template(), "주문템플릿.xlsx")
+    # 템플릿은 버튼을 누를 때 만들며, 품목 마스터가 바뀌지 않았으면 메모리에 보관한 파일을 그대로 사용
+    role = user.get("role")
+    st.download_button("주문 템플릿 다운로드", lambda: download_template(role=role), "주문템플릿.xlsx",
+                       mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
     
-    uploaded_file = st.file_uploader("엑셀 파일 업로드", type=['xlsx', 'xls'])
+    uploaded_file = st.file_uploader("엑셀/CSV 파일 업로드", type=['xlsx', 'xls', 'csv', 'tsv'],
+                                     help="CSV/TSV는 UTF-8 또는 CP949로 저장된 파일을 읽을 수 있으며 엑셀보다 빠르게 처리됩니다.")
     if not uploaded_file:
         return
 
-    success, details, error_msg = process_excel_file(uploaded_file)
+    # 같은 업로드는 다시 파싱하지 않음 (폼 입력 등으로 페이지가 다시 실행될 때)
+    parsed = st.session_state.get("excel_upload_parsed")
+    if not parsed or parsed[0] != uploaded_file.file_id:
+        progress_bar = st.progress(0.0, text="파일을 읽는 중...")
+
+        def report_progress(rows_read, total_rows):
+            ratio = min(rows_read / max(total_rows - 1, 1), 1.0) if total_rows else 0.0
+            progress_bar.progress(ratio, text=f"파일을 읽는 중... {rows_read:,}행")
+
+        parsed = (uploaded_file.file_id, process_excel_file(uploaded_file, db, progress=report_progress))
+        st.session_state["excel_upload_parsed"] = parsed
+        progress_bar.empty()
+
+    success, details, error_msg = parsed[1]
     if not success:
-        st.error(f"엑셀 처리 실패: {error_msg}")
+        st.error(f"파일 처리 실패: {error_msg}")
         return
         
     st.success(f"{len(details)}개 항목을 읽었습니다.")
@@ -177,7 +195,7 @@ def render_excel_upload_tab(db, user):
 
         if st.form_submit_button("발주서 생성", use_container_width=True, type="primary"):
             try:
-                order_no = create_order(db, user, {
+                order_no = run_write(create_order, user, {
                     "order_date": order_date, "order_type": order_type, "customer_company": customer_company
                 }, details)
                 st.success(f"주문이 성공적으로 등록되었습니다. (주문번호: {order_no})")
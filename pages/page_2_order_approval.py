@@ -4,6 +4,9 @@ from auth.auth import get_current_user
 from database.connection import get_db, close_db
 from utils.validators import validate_priority
 from utils.order_dialog import show_order_detail_modal
+from utils.order_card import order_card_fragment, rerun_card, show_card_notice, show_card_closed, show_page_notice
+from utils.concurrency_notice import reload_with_conflict_notice, show_conflict_notice
+from services.exceptions import ConcurrencyConflictError
 from config import PRIORITY_MIN, PRIORITY_MAX, PRIORITY_DEFAULT, ORDER_STATUS
 from services.approval_service import (
     get_orders_for_approval,
@@ -19,6 +22,8 @@ def show_page():
     """
     st.title("주문 승인")
     st.markdown("---")
+    show_conflict_notice()
+    show_page_notice()
 
     user = get_current_user()
     db = get_db()
@@ -58,9 +63,28 @@ def render_page_content(db, user):
     
     # --- Interactive Order List ---
     for order in orders:
-        # Fetch details for each order
-        _ , details, total_amount = get_order_details(db, order.order_no)
-        
+        render_order_card(order.order_no, user, filters)
+
+def _matches_filters(order, filters):
+    return all(
+        filters.get(field) in (None, "", "전체") or getattr(order, field) == filters[field]
+        for field in ("status", "order_type")
+    )
+
+@order_card_fragment
+def render_order_card(order_no, user, filters):
+    """
+    Renders one order row and its approval form as a fragment with its own
+    session and queries, so processing an order reruns only this card.
+    """
+    db = get_db()
+    try:
+        order, details, total_amount = get_order_details(db, order_no)
+        if order is None or not _matches_filters(order, filters):
+            show_card_closed(order_no, order.status if order else None)
+            return
+
+        show_card_notice(order_no)
         # 주문 행
         row_cols = st.columns([2, 2, 2, 2, 1])
         row_cols[0].write(order.order_no)
@@ -75,6 +99,8 @@ def render_page_content(db, user):
         with st.expander(f"주문 상세 및 처리: {order.order_no}", expanded=False):
             render_order_details(order, details, total_amount)
             render_approval_form(db, user, order)
+    finally:
+        close_db(db)
 
 def render_order_details(order, details, total_amount):
     """Displays the master and detail information for a selected order."""
@@ -106,18 +132,23 @@ def render_approval_form(db, user, order):
                 if not is_valid:
                     st.error(msg)
                 else:
-                    if action == "승인":
-                        approve_order(db, order, priority, user["username"])
-                        st.success(f"주문 {order.order_no}이(가) 승인되었습니다.")
-                    else:
-                        reject_order(db, order)
-                        st.success(f"주문 {order.order_no}이(가) 거부되었습니다.")
-                    st.rerun()
+                    try:
+                        if action == "승인":
+                            approve_order(db, order, priority, user["username"])
+                            message = f"주문 {order.order_no}이(가) 승인되었습니다."
+                        else:
+                            reject_order(db, order)
+                            message = f"주문 {order.order_no}이(가) 거부되었습니다."
+                    except ConcurrencyConflictError as e:
+                        reload_with_conflict_notice(e)
+                    rerun_card(order.order_no, message)
 
     elif order.status == "승인":
         if st.button("생산중으로 상태 변경", key=f"in_prod_{order.order_no}", type="primary"):
-            set_order_in_production(db, order)
-            st.success(f"주문 {order.order_no}의 상태가 변경되었습니다.")
-            st.rerun()
+            try:
+                set_order_in_production(db, order)
+            except ConcurrencyConflictError as e:
+                reload_with_conflict_notice(e)
+            rerun_card(order.order_no, f"주문 {order.order_no}의 상태가 변경되었습니다.")
     else:
         st.info(f"이 주문은 현재 작업을 수행할 수 없는 '{order.status}' 상태입니다.")
\ No newline at end of file
@@ -3,8 +3,13 @@ import pandas as pd
 from datetime import date
 from auth.auth import get_current_user
 from database.connection import get_db, close_db
+from database.models import OrderMaster
 from utils.order_dialog import show_order_detail_modal
+from utils.order_card import order_card_fragment, rerun_card, show_card_notice, show_card_closed, show_page_notice
+from utils.concurrency_notice import reload_with_conflict_notice, show_conflict_notice
+from services.exceptions import ConcurrencyConflictError
 from services.warehousing_service import (
+    WAREHOUSING_STATUSES,
     get_orders_for_warehousing,
     get_order_receipt_status,
     get_detailed_receipt_status,
@@ -18,6 +23,8 @@ def show_page():
     """
     st.title("입고 등록")
     st.markdown("---")
+    show_conflict_notice()
+    show_page_notice()
 
     user = get_current_user()
     db = get_db()
@@ -39,7 +46,23 @@ def render_page_content(db, user):
     st.markdown(f"### 입고 등록 가능 주문 (총 {len(orders_to_process)}건)")
     
     for order in orders_to_process:
-        status = get_order_receipt_status(db, order.order_no)
+        render_order_card(order.order_no, user)
+
+@order_card_fragment
+def render_order_card(order_no, user):
+    """
+    Renders one order card as a fragment with its own session and queries,
+    so submitting its form reruns only this card.
+    """
+    db = get_db()
+    try:
+        order = db.get(OrderMaster, order_no)
+        if order is None or order.status not in WAREHOUSING_STATUSES:
+            show_card_closed(order_no, order.status if order else None)
+            return
+
+        show_card_notice(order_no)
+        status = get_order_receipt_status(db, order_no)
         
         # 주문 카드 레이아웃
         col1, col2 = st.columns([5, 1])
@@ -56,6 +79,8 @@ def render_page_content(db, user):
         with col2:
             if st.button("📋", key=f"detail_{order.order_no}", help=f"{order.order_no} 상세보기"):
                 show_order_detail_modal(order.order_no)
+    finally:
+        close_db(db)
 
 def render_receipt_form(db, user, order):
     """Renders the form for registering incoming goods for a specific order."""
@@ -94,9 +119,11 @@ def render_receipt_form(db, user, order):
             else:
                 try:
                     register_receipts(db, order, receipt_items, user["username"])
-                    st.success(f"✅ 주문 {order.order_no}에 대한 입고 등록이 완료되었습니다.")
-                    st.rerun()
+                    rerun_card(order.order_no, f"✅ 주문 {order.order_no}에 대한 입고 등록이 완료되었습니다.")
+                except ConcurrencyConflictError as e:
+                    reload_with_conflict_notice(e)
                 except Exception as e:
+                    db.rollback()
                     st.error(f"❌ 입고 등록 중 오류 발생: {e}")
 
 def render_receipt_history(db, order_no):
@@ -3,8 +3,11 @@ import pandas as pd
 from datetime import date
 from auth.auth import get_current_user
 from database.connection import get_db, close_db
-from database.models import OrderDetail
+from database.models import OrderMaster, OrderDetail
 from utils.order_dialog import show_order_detail_modal
+from utils.order_card import order_card_fragment, rerun_card, show_card_notice, show_card_closed, show_page_notice
+from utils.concurrency_notice import reload_with_conflict_notice, show_conflict_notice
+from services.exceptions import ConcurrencyConflictError
 from services.shipping_service import (
     get_orders_for_shipping_plan,
     get_item_inventory_status,
@@ -19,6 +22,8 @@ def show_page():
     """
     st.title("출하 계획")
     st.markdown("---")
+    show_conflict_notice()
+    show_page_notice()
 
     user = get_current_user()
     db = get_db()
@@ -40,6 +45,22 @@ def render_page_content(db, user):
         return
 
     for order in orders_for_planning:
+        render_order_card(order.order_no, user)
+
+@order_card_fragment
+def render_order_card(order_no, user):
+    """
+    Renders one order card as a fragment with its own session and queries,
+    so submitting its form reruns only this card.
+    """
+    db = get_db()
+    try:
+        order = db.get(OrderMaster, order_no)
+        if order is None or order.status != "입고완료":
+            show_card_closed(order_no, order.status if order else None)
+            return
+
+        show_card_notice(order_no)
         # 주문 카드 레이아웃
         col1, col2 = st.columns([5, 1])
         with col1:
@@ -50,6 +71,8 @@ def render_page_content(db, user):
         with col2:
             if st.button("📋", key=f"detail_{order.order_no}", help=f"{order.order_no} 상세보기"):
                 show_order_detail_modal(order.order_no)
+    finally:
+        close_db(db)
 
 def render_shipping_item_form(db, user, order):
     """Renders the form to input shipping quantities and dates for a specific order."""
@@ -83,9 +106,11 @@ def render_shipping_item_form(db, user, order):
             if shipping_items:
                 try:
                     create_shipping_plans(db, shipping_items, user["username"])
-                    st.success(f"✅ {len(shipping_items)}개 항목의 출하 계획이 등록되었습니다.")
-                    st.rerun()
+                    rerun_card(order.order_no, f"✅ {len(shipping_items)}개 항목의 출하 계획이 등록되었습니다.")
+                except ConcurrencyConflictError as e:
+                    reload_with_conflict_notice(e)
                 except Exception as e:
+                    db.rollback()
                     st.error(f"❌ 출하 계획 등록 중 오류: {e}")
             else:
                 st.warning("출하할 항목이 없습니다.")
@@ -110,8 +135,7 @@ def render_shipping_plan_history(db, order):
         if st.button("📤 출하 지시", key=f"instruct_{order.order_no}", type="primary"):
             try:
                 instruct_shipping_plans(db, pending_plans)
-                st.success(f"✅ {len(pending_plans)}개 항목에 대한 출하 지시가 완료되었습니다.")
-                st.rerun()
+                rerun_card(order.order_no, f"✅ {len(pending_plans)}개 항목에 대한 출하 지시가 완료되었습니다.")
             except Exception as e:
                 db.rollback()
                 st.error(f"❌ 출하 지시 중 오류: {e}")
\ No newline at end of file
@@ -1,9 +1,13 @@
 
 import streamlit as st
 import pandas as pd
+from datetime import date, timedelta
+from config import EXPORT_DOWNLOAD_MAX_ROWS
 from auth.auth import get_current_user
 from database.connection import get_db, close_db
 from utils.order_dialog import show_order_detail_modal
+from utils.export_handler import EXPORT_FORMATS, export_bytes, export_file_name
+from services.export_service import EXPORTS
 from services.dashboard_service import (
     get_client_dashboard_data,
     get_manager_dashboard_data,
@@ -40,10 +44,13 @@ def show_page():
             render_common_activity(common_data)
         else:
             st.warning("알 수 없는 역할입니다. 대시보드를 표시할 수 없습니다.")
-        
+            return
+
     finally:
         close_db(db)
 
+    render_export_section(user)
+
 def render_client_dashboard(data):
     """Dashboard for '발주사' (Client)."""
     st.subheader("발주사 대시보드")
@@ -179,3 +186,30 @@ def render_common_activity(data):
             "담당자": o.created_by, "상태": o.status
         } for o in data["recent_orders"]])
         st.dataframe(df, use_container_width=True, hide_index=True)
+
+def render_export_section(user):
+    """Renders CSV/xlsx download buttons for orders, lines, receipts and shipping plans."""
+    st.markdown("---")
+    with st.expander("데이터 내보내기"):
+        col1, col2, col3 = st.columns(3)
+        name = col1.selectbox("데이터", list(EXPORTS), format_func=lambda key: EXPORTS[key]["label"], key="export_name")
+        period = col2.date_input("기간", (date.today() - timedelta(days=90), date.today()), key="export_period")
+        filters = {"start_date": period[0], "end_date": period[1] if len(period) > 1 else period[0]}
+        if user.get("role") == "발주사":
+            # 발주사는 자신이 등록한 주문만 내보낼 수 있음
+            filters["created_by"] = user["username"]
+            col3.text_input("고객사", user.get("company_name", ""), disabled=True, key="export_customer_fixed")
+        else:
+            filters["customer"] = col3.text_input("고객사 (비우면 전체)", key="export_customer").strip() or None
+
+        st.caption(f"다운로드는 최대 {EXPORT_DOWNLOAD_MAX_ROWS:,}행까지 가능합니다. 더 많은 데이터는 "
+                   "`python -m utils.export_handler`로 파일을 만드세요.")
+        # 버튼을 누를 때 별도 스레드에서 파일을 만들므로 페이지 실행은 조회를 기다리지 않음
+        button_cols = st.columns(len(EXPORT_FORMATS))
+        for col, (fmt, mime) in zip(button_cols, EXPORT_FORMATS.items()):
+            col.download_button(
+                f"{fmt.upper()} 다운로드",
+                data=lambda fmt=fmt: export_bytes(name, fmt, **filters),
+                file_name=export_file_name(name, fmt, filters["start_date"], filters["end_date"]),
+                mime=mime, use_container_width=True, key=f"export_{fmt}",
+            )
@@ -3,8 +3,11 @@ import pandas as pd
 from datetime import date
 from auth.auth import get_current_user
 from database.connection import get_db, close_db
-from database.models import OrderDetail
+from database.models import OrderMaster, OrderDetail
 from utils.order_dialog import show_order_detail_modal
+from utils.order_card import order_card_fragment, rerun_card, show_card_notice, show_card_closed, show_page_notice
+from utils.concurrency_notice import reload_with_conflict_notice, show_conflict_notice
+from services.exceptions import ConcurrencyConflictError
 from services.shipping_registration_service import (
     get_orders_for_registration,
     get_plans_for_registration,
@@ -17,6 +20,8 @@ def show_page():
     """
     st.title("출하 등록 (수신 확인)")
     st.markdown("---")
+    show_conflict_notice()
+    show_page_notice()
 
     user = get_current_user()
     db = get_db()
@@ -38,17 +43,36 @@ def render_page_content(db, user):
         return
 
     for order in orders_to_register:
+        render_order_card(order.order_no, user)
+
+@order_card_fragment
+def render_order_card(order_no, user):
+    """
+    Renders one order card as a fragment with its own session and queries,
+    so submitting its form reruns only this card.
+    """
+    db = get_db()
+    try:
+        order = db.get(OrderMaster, order_no)
+        plans_to_update = get_plans_for_registration(db, order_no) if order else []
+        if not plans_to_update:
+            show_card_closed(order_no, order.status if order else None)
+            return
+
+        show_card_notice(order_no)
         # 주문 카드 레이아웃
         col1, col2 = st.columns([5, 1])
         with col1:
             expander_title = f"**{order.order_no}** | {order.order_date.strftime('%Y-%m-%d')}"
             with st.expander(expander_title):
-                render_confirmation_form(db, user, order)
+                render_confirmation_form(db, user, order, plans_to_update)
         with col2:
             if st.button("📋", key=f"detail_{order.order_no}", help=f"{order.order_no} 상세보기"):
                 show_order_detail_modal(order.order_no)
+    finally:
+        close_db(db)
 
-def render_confirmation_form(db, user, order):
+def render_confirmation_form(db, user, order, plans_to_update):
     """
     Renders the form for a client to confirm receipt of goods for a specific order.
     """
@@ -56,7 +80,6 @@ def render_confirmation_form(db, user, order):
         st.markdown("#### 수신 항목 확인")
         
         received_items = []
-        plans_to_update = get_plans_for_registration(db, order.order_no)
 
         for plan in plans_to_update:
             detail = db.query(OrderDetail).filter_by(order_no=plan.order_no, order_seq=plan.order_seq).first()
@@ -81,9 +104,11 @@ def render_confirmation_form(db, user, order):
             if received_items:
                 try:
                     confirm_shipment_received(db, order, received_items)
-                    st.success("출하 완료가 성공적으로 등록되었습니다.")
-                    st.rerun()
+                    rerun_card(order.order_no, "출하 완료가 성공적으로 등록되었습니다.")
+                except ConcurrencyConflictError as e:
+                    reload_with_conflict_notice(e)
                 except Exception as e:
+                    db.rollback()
                     st.error(f"출하 등록 중 오류 발생: {e}")
             else:
                 st.warning("수신수량을 1 이상 입력해야 합니다.")
\ No newline at end of file
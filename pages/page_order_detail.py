@@ -7,7 +7,6 @@ from database.connection import get_db, close_db
 from services.approval_service import get_order_details
 from services.warehousing_service import get_detailed_receipt_status, get_receipt_history
 from services.shipping_service import get_item_inventory_status, get_shipping_plans_for_order
-from database.models import OrderDetail
 
 
 def show_page():
@@ -70,6 +69,8 @@ def show_page():
                     st.markdown(f"**승인일시:** {master.approved_at.strftime('%Y-%m-%d %H:%M')}")
             st.markdown(f"**등록자:** {master.created_by}")
             st.markdown(f"**등록일시:** {master.created_at.strftime('%Y-%m-%d %H:%M')}")
+            if getattr(master, "archived_at", None):
+                st.caption(f"📦 보관된 주문입니다. (보관일시: {master.archived_at.strftime('%Y-%m-%d %H:%M')})")
         
         st.markdown("---")
         
@@ -138,9 +139,9 @@ def show_page():
             st.markdown("---")
             st.markdown("#### 출하 계획/상태")
             plan_data = []
+            item_names = {detail.order_seq: detail.item_name for detail in details}
             for plan in shipping_plans:
-                detail = db.query(OrderDetail).filter_by(order_no=plan.order_no, order_seq=plan.order_seq).first()
-                item_name = detail.item_name if detail else "N/A"
+                item_name = item_names.get(plan.order_seq, "N/A")
                 plan_data.append({
                     "품목명": item_name,
                     "출하수량": f"{plan.planned_qty:,}",
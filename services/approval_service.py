@@ -1,6 +1,11 @@
 
 from datetime import datetime
-from database.models import OrderMaster, OrderDetail
+from database.models import OrderMaster, OrderDetail, ArchivedOrderMaster, ArchivedOrderDetail
+from services.exceptions import version_conflict_as
+from utils.metrics import ORDER_DECISIONS, track_duration
+
+def _conflict_message(order):
+    return f"주문 {order.order_no}이(가) 다른 사용자에 의해 먼저 변경되었습니다. 새로고침 후 다시 시도해주세요."
 
 def get_orders_for_approval(db, filters):
     """
@@ -10,24 +15,39 @@ def get_orders_for_approval(db, filters):
         db: The database session.
         filters (dict): A dictionary containing filter criteria like 
                         'status', 'order_type', 'search_no'.
+
+    Archived orders are only searched when an order number is given,
+    so the regular worklist never scans the archive.
     """
-    query = db.query(OrderMaster).order_by(OrderMaster.created_at.desc())
-    
+    orders = _filter_orders(db.query(OrderMaster), OrderMaster, filters).order_by(OrderMaster.created_at.desc()).all()
+
+    if filters.get("search_no"):
+        archived = _filter_orders(db.query(ArchivedOrderMaster), ArchivedOrderMaster, filters).all()
+        if archived:
+            orders = sorted(orders + archived, key=lambda o: o.created_at, reverse=True)
+    return orders
+
+def _filter_orders(query, model, filters):
     if filters.get("status") and filters["status"] != "전체":
-        query = query.filter(OrderMaster.status == filters["status"])
+        query = query.filter(model.status == filters["status"])
     
     if filters.get("order_type") and filters["order_type"] != "전체":
-        query = query.filter(OrderMaster.order_type == filters["order_type"])
+        query = query.filter(model.order_type == filters["order_type"])
     
     if filters.get("search_no"):
-        query = query.filter(OrderMaster.order_no.contains(filters["search_no"]))
+        query = query.filter(model.order_no.contains(filters["search_no"]))
     
-    return query.all()
+    return query
 
 def get_order_details(db, order_no):
-    """Fetches the details for a single order."""
+    """Fetches the details for a single order, falling back to the archive for archived orders."""
+    detail_model = OrderDetail
     master = db.query(OrderMaster).filter(OrderMaster.order_no == order_no).first()
-    details = db.query(OrderDetail).filter(OrderDetail.order_no == order_no).order_by(OrderDetail.order_seq).all()
+    if master is None:
+        master = db.get(ArchivedOrderMaster, order_no)
+        if master is not None:
+            detail_model = ArchivedOrderDetail
+    details = db.query(detail_model).filter(detail_model.order_no == order_no).order_by(detail_model.order_seq).all()
     
     total_amount = 0
     if details:
@@ -35,20 +55,30 @@ def get_order_details(db, order_no):
         
     return master, details, total_amount
 
+@track_duration("approve_order")
 def approve_order(db, order, priority, username):
     """Sets the order status to 'Approved'."""
     order.status = "승인"
     order.priority = priority
     order.approved_by = username
     order.approved_at = datetime.now()
-    db.commit()
+    with version_conflict_as(db, _conflict_message(order)):
+        db.commit()
+    ORDER_DECISIONS.inc(decision="approve")
 
+@track_duration("reject_order")
 def reject_order(db, order):
     """Sets the order status to 'Rejected'."""
     order.status = "거부"
-    db.commit()
+    order.closed_at = datetime.now()
+    with version_conflict_as(db, _conflict_message(order)):
+        db.commit()
+    ORDER_DECISIONS.inc(decision="reject")
 
+@track_duration("set_order_in_production")
 def set_order_in_production(db, order):
     """Sets the order status to 'In Production'."""
     order.status = "생산중"
-    db.commit()
+    with version_conflict_as(db, _conflict_message(order)):
+        db.commit()
+    ORDER_DECISIONS.inc(decision="in_production")
@@ -1,17 +1,24 @@
 
 from collections import Counter
-from database.models import OrderMaster, Warehouse, ShippingPlan
+from sqlalchemy import func
+from database.models import OrderMaster, Warehouse, ShippingPlan, ArchivedOrderMaster
+
+def _archived_status_counts(db, created_by=None):
+    """Counts archived orders by status so that totals still include closed orders moved to the cold tables."""
+    query = db.query(ArchivedOrderMaster.status, func.count()).group_by(ArchivedOrderMaster.status)
+    if created_by is not None:
+        query = query.filter(ArchivedOrderMaster.created_by == created_by)
+    return Counter(dict(query.all()))
 
 def get_client_dashboard_data(db, username):
     """Fetches all necessary data for the client ('발주사') dashboard."""
     my_orders = db.query(OrderMaster).filter_by(created_by=username).order_by(OrderMaster.created_at.desc()).all()
-    if not my_orders:
+    status_counts = Counter(o.status for o in my_orders) + _archived_status_counts(db, created_by=username)
+    if not status_counts:
         return None
-
-    status_counts = Counter(o.status for o in my_orders)
     
     data = {
-        "total_orders": len(my_orders),
+        "total_orders": sum(status_counts.values()),
         "pending_count": status_counts.get("대기", 0),
         "approved_count": status_counts.get("승인", 0) + status_counts.get("생산중", 0),
         "completed_count": status_counts.get("출하완료", 0),
@@ -22,7 +29,7 @@ def get_client_dashboard_data(db, username):
 def get_manager_dashboard_data(db):
     """Fetches all necessary data for the order manager ('주문담당자') dashboard."""
     all_orders = db.query(OrderMaster).all()
-    status_counts = Counter(o.status for o in all_orders)
+    status_counts = Counter(o.status for o in all_orders) + _archived_status_counts(db)
     
     urgent_orders = db.query(OrderMaster).filter(
         OrderMaster.order_type == "긴급",
@@ -34,7 +41,7 @@ def get_manager_dashboard_data(db):
     ).order_by(OrderMaster.created_at).limit(10).all()
 
     data = {
-        "total_orders": len(all_orders),
+        "total_orders": sum(status_counts.values()),
         "pending_count": status_counts.get("대기", 0),
         "approved_count": status_counts.get("승인", 0),
         "warehousing_complete_count": status_counts.get("입고완료", 0),
@@ -0,0 +1,23 @@
+from contextlib import contextmanager
+from sqlalchemy.orm.exc import StaleDataError
+
+
+class ConcurrencyConflictError(Exception):
+    """
+    Raised when a write loses a race with another user's concurrent change,
+    e.g. the order was already approved or the remaining quantity was consumed.
+    The caller should reload the data and retry.
+    """
+
+
+@contextmanager
+def version_conflict_as(db, message):
+    """
+    Translates an ORM version-check failure (StaleDataError) into a ConcurrencyConflictError,
+    rolling back the failed transaction so the session stays usable.
+    """
+    try:
+        yield
+    except StaleDataError as e:
+        db.rollback()
+        raise ConcurrencyConflictError(message) from e
@@ -0,0 +1,108 @@
+from sqlalchemy import select, union_all, literal_column
+from config import EXPORT_FETCH_ROWS
+from database.models import (
+    OrderMaster, OrderDetail, Warehouse, ShippingPlan,
+    ArchivedOrderMaster, ArchivedOrderDetail, ArchivedWarehouse, ArchivedShippingPlan,
+)
+
+def _order_columns(master, _):
+    return [
+        ("주문번호", master.order_no), ("주문일자", master.order_date), ("주문구분", master.order_type),
+        ("고객사", master.customer_company), ("상태", master.status), ("우선순위", master.priority),
+        ("승인자", master.approved_by), ("승인일시", master.approved_at), ("등록자", master.created_by),
+        ("등록일시", master.created_at), ("종료일시", master.closed_at),
+    ]
+
+def _order_line_columns(master, detail):
+    return [
+        ("주문번호", detail.order_no), ("순번", detail.order_seq), ("주문일자", master.order_date),
+        ("고객사", master.customer_company), ("상태", master.status), ("품목코드", detail.item_code),
+        ("품목명", detail.item_name), ("주문수량", detail.order_qty), ("단가", detail.unit_price),
+        ("입고수량", detail.received_qty), ("출하계획수량", detail.planned_qty), ("출하수량", detail.shipping_qty),
+        ("출하금액", detail.shipping_amount), ("납품예정일", detail.planned_shipping_date), ("출하일자", detail.actual_shipping_date),
+    ]
+
+def _receipt_columns(master, receipt):
+    return [
+        ("입고일자", receipt.received_date), ("입고번호", receipt.warehouse_id), ("주문번호", receipt.order_no),
+        ("순번", receipt.order_seq), ("고객사", master.customer_company), ("품목코드", receipt.item_code),
+        ("품목명", receipt.item_name), ("입고수량", receipt.received_qty), ("입고자", receipt.received_by),
+        ("등록일시", receipt.created_at),
+    ]
+
+def _shipping_plan_columns(master, plan):
+    return [
+        ("출하예정일", plan.planned_shipping_date), ("계획번호", plan.plan_id), ("주문번호", plan.order_no),
+        ("순번", plan.order_seq), ("고객사", master.customer_company), ("계획수량", plan.planned_qty),
+        ("상태", plan.status), ("등록자", plan.created_by), ("등록일시", plan.created_at),
+    ]
+
+# name -> label, column builder, (live, archived) model pairs, date filter column, number of leading sort columns
+EXPORTS = {
+    "orders": {
+        "label": "주문", "columns": _order_columns, "sort_columns": 1,
+        "models": ((OrderMaster, None), (ArchivedOrderMaster, None)),
+        "date": lambda master, _: master.order_date,
+    },
+    "order_lines": {
+        "label": "주문상세", "columns": _order_line_columns, "sort_columns": 2,
+        "models": ((OrderMaster, OrderDetail), (ArchivedOrderMaster, ArchivedOrderDetail)),
+        "date": lambda master, _: master.order_date,
+    },
+    "receipts": {
+        "label": "입고내역", "columns": _receipt_columns, "sort_columns": 2,
+        "models": ((OrderMaster, Warehouse), (ArchivedOrderMaster, ArchivedWarehouse)),
+        "date": lambda _, receipt: receipt.received_date,
+    },
+    "shipping_plans": {
+        "label": "출하계획", "columns": _shipping_plan_columns, "sort_columns": 2,
+        "models": ((OrderMaster, ShippingPlan), (ArchivedOrderMaster, ArchivedShippingPlan)),
+        "date": lambda _, plan: plan.planned_shipping_date,
+    },
+}
+
+def get_export_headers(name):
+    """Returns the column headers of an export."""
+    return [header for header, _ in EXPORTS[name]["columns"](OrderMaster, EXPORTS[name]["models"][0][1])]
+
+def _export_select(spec, master, child, start_date, end_date, customer, created_by):
+    columns = spec["columns"](master, child)
+    stmt = select(*[column.label(f"c{idx}") for idx, (_, column) in enumerate(columns)])
+    if child is None:
+        stmt = stmt.select_from(master)
+    else:
+        stmt = stmt.select_from(child).join(master, master.order_no == child.order_no)
+
+    date_column = spec["date"](master, child)
+    if start_date:
+        stmt = stmt.where(date_column >= start_date)
+    if end_date:
+        stmt = stmt.where(date_column <= end_date)
+    if customer:
+        stmt = stmt.where(master.customer_company == customer)
+    if created_by:
+        stmt = stmt.where(master.created_by == created_by)
+    return stmt
+
+def iter_export_rows(db, name, start_date=None, end_date=None, customer=None, created_by=None, include_archived=True):
+    """
+    Yields export rows as tuples (in get_export_headers order), filtered by date range and customer.
+
+    The date range applies to the order date for orders/lines, the receipt date for receipts
+    and the planned shipping date for shipping plans. created_by limits rows to orders
+    registered by one customer user. Rows are fetched from the cursor EXPORT_FETCH_ROWS at
+    a time (yield_per), so memory stays flat no matter how many rows are exported.
+    Archived orders are included unless include_archived is False.
+    """
+    spec = EXPORTS[name]
+    pairs = spec["models"] if include_archived else spec["models"][:1]
+    selects = [_export_select(spec, master, child, start_date, end_date, customer, created_by) for master, child in pairs]
+    stmt = selects[0] if len(selects) == 1 else union_all(*selects)
+    stmt = stmt.order_by(*[literal_column(f"c{idx}") for idx in range(spec["sort_columns"])])
+
+    result = db.execute(stmt.execution_options(yield_per=EXPORT_FETCH_ROWS))
+    try:
+        for row in result:
+            yield tuple(row)
+    finally:
+        result.close()
@@ -0,0 +1,127 @@
+from datetime import date, timedelta
+from services.item_catalog import get_item_catalog
+from utils.validators import validate_order_type, validate_qty
+
+MAX_IDEMPOTENCY_KEY_LENGTH = 100
+MAX_LINES_PER_ORDER = 100
+MAX_ORDER_QTY = 1_000_000_000  # well below SQLite's INTEGER range (2**63), so one line cannot fail the whole batch insert
+
+def load_item_catalog(db):
+    """Returns the active items keyed by item code and by item name (shared item catalog cache)."""
+    catalog = get_item_catalog(db)
+    return catalog.by_code, catalog.by_name
+
+def _parse_date(value, field):
+    try:
+        return date.fromisoformat(value), None
+    except (TypeError, ValueError):
+        return None, f"{field}은(는) YYYY-MM-DD 형식이어야 합니다."
+
+def _validate_line(line, order_date, items_by_code, items_by_name):
+    if not isinstance(line, dict):
+        return None, "주문 항목은 객체여야 합니다."
+
+    for field in ("item_code", "item_name"):
+        if line.get(field) is not None and not isinstance(line[field], str):
+            return None, f"{field}은(는) 문자열이어야 합니다."
+
+    item = None
+    if line.get("item_code"):
+        item = items_by_code.get(line["item_code"])
+        if item is None:
+            return None, f"등록되지 않았거나 사용하지 않는 품목코드입니다: {line['item_code']}"
+    elif line.get("item_name"):
+        item = items_by_name.get(line["item_name"])
+        if item is None:
+            return None, f"등록되지 않은 품목명입니다: {line['item_name']}"
+    else:
+        return None, "품목코드(item_code) 또는 품목명(item_name)을 입력해주세요."
+
+    order_qty = line.get("order_qty")
+    if not isinstance(order_qty, int) or isinstance(order_qty, bool):
+        return None, f"{item.item_name}: 주문수량은 정수여야 합니다."
+    is_valid, error_msg = validate_qty(order_qty)
+    if not is_valid:
+        return None, f"{item.item_name}: {error_msg}"
+    if order_qty > MAX_ORDER_QTY:
+        return None, f"{item.item_name}: 주문수량은 {MAX_ORDER_QTY:,} 이하여야 합니다."
+
+    # 화면 주문과 같이 납품예정일은 주문일자 + 품목 납기일수 이후여야 합니다.
+    min_date = order_date + timedelta(days=item.lead_time_days) if item.lead_time_days > 0 else order_date
+    planned_shipping_date = min_date
+    if line.get("planned_shipping_date") is not None:
+        planned_shipping_date, error = _parse_date(line["planned_shipping_date"], "납품예정일")
+        if error:
+            return None, f"{item.item_name}: {error}"
+        if planned_shipping_date < min_date:
+            return None, f"{item.item_name}: 납품예정일은 {min_date:%Y-%m-%d} 이후여야 합니다."
+
+    return {
+        "item_code": item.item_code,
+        "item_name": item.item_name,
+        "order_qty": order_qty,
+        "unit_price": float(item.unit_price),  # 단가는 항상 품목 마스터 기준
+        "planned_shipping_date": planned_shipping_date,
+    }, None
+
+def validate_order(raw_order, items_by_code, items_by_name, today=None):
+    """
+    Validates one API order payload against the item master.
+    Returns (order, errors); order is None when there are errors.
+    """
+    if not isinstance(raw_order, dict):
+        return None, ["주문은 객체여야 합니다."]
+
+    errors = []
+    key = raw_order.get("idempotency_key")
+    if not isinstance(key, str) or not key.strip():
+        errors.append("멱등성 키(idempotency_key)를 입력해주세요.")
+    elif len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+        errors.append(f"멱등성 키는 {MAX_IDEMPOTENCY_KEY_LENGTH}자 이하여야 합니다.")
+
+    order_date = today or date.today()
+    if raw_order.get("order_date") is not None:
+        order_date, error = _parse_date(raw_order["order_date"], "주문일자")
+        if error:
+            errors.append(error)
+
+    order_type = raw_order.get("order_type", "일반")
+    is_valid, error_msg = validate_order_type(order_type)
+    if not is_valid:
+        errors.append(error_msg)
+
+    lines = raw_order.get("lines")
+    if not isinstance(lines, list) or not lines:
+        errors.append("주문 항목(lines)을 하나 이상 입력해주세요.")
+        lines = []
+    elif len(lines) > MAX_LINES_PER_ORDER:
+        errors.append(f"주문 항목은 {MAX_LINES_PER_ORDER}개 이하여야 합니다.")
+        lines = []
+
+    details = []
+    if order_date:
+        for seq, line in enumerate(lines, start=1):
+            detail, error = _validate_line(line, order_date, items_by_code, items_by_name)
+            if error:
+                errors.append(f"항목 {seq}: {error}")
+            else:
+                details.append(detail)
+
+    if errors:
+        return None, errors
+    return {"idempotency_key": key, "order_date": order_date, "order_type": order_type, "details": details}, []
+
+def validate_order_batch(db, raw_orders, today=None):
+    """
+    Validates a batch of API order payloads.
+    Returns (valid, rejected): valid is a list of (index, order) and rejected maps index -> error messages.
+    """
+    items_by_code, items_by_name = load_item_catalog(db)
+    valid, rejected = [], {}
+    for index, raw_order in enumerate(raw_orders):
+        order, errors = validate_order(raw_order, items_by_code, items_by_name, today)
+        if errors:
+            rejected[index] = errors
+        else:
+            valid.append((index, order))
+    return valid, rejected
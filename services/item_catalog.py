@@ -0,0 +1,97 @@
+import threading
+from dataclasses import dataclass
+from decimal import Decimal
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from database.change_notifier import watcher_for_session
+from database.connection import get_db, close_db
+from database.models import ItemMaster, ChangeCounter
+from utils.metrics import CACHE_REQUESTS
+
+@dataclass(frozen=True)
+class CatalogItem:
+    """Immutable snapshot of an ItemMaster row, safe to share across sessions and threads."""
+    item_code: str
+    item_name: str
+    lead_time_days: int
+    unit_price: Decimal
+    is_active: str
+
+@dataclass(frozen=True)
+class ItemCatalog:
+    """Active items indexed for lookups. Treat the dicts and lists as read-only."""
+    version: int
+    by_code: dict
+    by_name: dict
+    active: list  # sorted by item name
+    price_lookup: dict  # item name -> {"item_code", "unit_price" (float)}, as used by the Excel row validation
+
+_catalogs = {}  # database URL -> ItemCatalog
+_catalog_lock = threading.Lock()
+
+def get_item_master_version(db):
+    """
+    Returns the item_master change counter, which triggers bump on every insert/update/delete.
+    Returns None for a database that init_db has not migrated yet (no change_counter table).
+
+    For file databases the counter is read through the process-wide change watcher, which
+    only re-reads change_counter after PRAGMA data_version shows another connection
+    (possibly another server process) committed.
+    """
+    watcher = watcher_for_session(db)
+    if watcher is not None:
+        return watcher.table_version(ItemMaster.__tablename__)
+    try:
+        version = db.execute(select(ChangeCounter.version).where(ChangeCounter.name == ItemMaster.__tablename__)).scalar()
+    except OperationalError:
+        return None
+    return version or 0
+
+def _build_catalog(db, version):
+    rows = db.execute(select(
+        ItemMaster.item_code, ItemMaster.item_name, ItemMaster.lead_time_days, ItemMaster.unit_price, ItemMaster.is_active,
+    ).where(ItemMaster.is_active == "Y").order_by(ItemMaster.item_name)).all()
+    items = [CatalogItem(*row) for row in rows]
+    return ItemCatalog(
+        version=version,
+        by_code={item.item_code: item for item in items},
+        by_name={item.item_name: item for item in items},
+        active=items,
+        price_lookup={item.item_name: {"item_code": item.item_code, "unit_price": float(item.unit_price)} for item in items},
+    )
+
+def get_item_catalog(db=None):
+    """
+    Returns the process-wide active item catalog.
+
+    Each call reads only the item_master change counter; the items themselves are reloaded
+    only when the counter has moved since the catalog was built, so lookups are dict hits.
+    Catalogs are kept per database URL.
+    """
+    owns_session = db is None
+    if owns_session:
+        db = get_db()
+    try:
+        key = str(db.get_bind().url)
+        version = get_item_master_version(db)
+        if version is None:
+            CACHE_REQUESTS.inc(cache="item_catalog", result="miss")
+            return _build_catalog(db, version)
+        catalog = _catalogs.get(key)
+        if catalog is None or catalog.version != version:
+            with _catalog_lock:
+                catalog = _catalogs.get(key)
+                if catalog is None or catalog.version != version:
+                    CACHE_REQUESTS.inc(cache="item_catalog", result="miss")
+                    catalog = _catalogs[key] = _build_catalog(db, version)
+                    return catalog
+        CACHE_REQUESTS.inc(cache="item_catalog", result="hit")
+        return catalog
+    finally:
+        if owns_session:
+            close_db(db)
+
+def invalidate_item_catalog():
+    """Drops all cached catalogs."""
+    with _catalog_lock:
+        _catalogs.clear()
@@ -1,13 +1,20 @@
 
+from datetime import datetime
 from decimal import Decimal
-from database.models import OrderMaster, OrderDetail, ItemMaster
-from utils.order_utils import generate_order_no
-from utils.excel_handler import parse_excel_file
+from sqlalchemy import insert, select
+from database.change_notifier import bulk_changes
+from database.models import OrderMaster, OrderDetail, OrderIdempotencyKey
+from services.item_catalog import get_item_catalog
+from utils.order_utils import generate_order_no, last_order_seq
+from utils.excel_handler import parse_excel_file, parse_excel_file_streaming, parse_csv_file
+from config import EXCEL_STREAMING_THRESHOLD_BYTES
+from utils.metrics import ORDERS_CREATED, ORDER_LINES_CREATED, track_duration
 
 def get_active_items(db):
-    """Fetches all active items from the ItemMaster."""
-    return db.query(ItemMaster).filter(ItemMaster.is_active == "Y").order_by(ItemMaster.item_name).all()
+    """Returns the active items sorted by name, from the shared item catalog cache."""
+    return get_item_catalog(db).active
 
+@track_duration("create_order")
 def create_order(db, user, order_data, details):
     """
     Creates a new order in the database with its details.
@@ -19,7 +26,7 @@ def create_order(db, user, order_data, details):
         details (list): A list of dictionaries for each order detail.
     """
     # Generate a fresh order number upon final submission
-    order_no = generate_order_no(order_data['order_date'])
+    order_no = generate_order_no(order_data['order_date'], db)
     
     # Create OrderMaster
     order_master = OrderMaster(
@@ -46,11 +53,94 @@ def create_order(db, user, order_data, details):
         db.add(order_detail)
         
     db.commit()
+    ORDERS_CREATED.inc(source="web")
+    ORDER_LINES_CREATED.inc(len(details))
     return order_no
 
-def process_excel_file(uploaded_file):
+@track_duration("create_orders_bulk")
+def create_orders_bulk(db, user, orders, source="api"):
+    """
+    Creates many validated orders in a single transaction with multi-row inserts.
+
+    Each order is a dict with 'idempotency_key', 'order_date', 'order_type' and 'details'
+    (same shape as for create_order). An idempotency key that the same user already
+    sent returns the existing order number instead of creating a new order.
+    Returns a list of (order_no, created) tuples in input order.
+
+    Order numbers are allocated per year after the highest existing number, so the
+    session should already hold the write lock (e.g. run it through the group-commit
+    writer, whose transactions start with BEGIN IMMEDIATE).
+    """
+    results, created = _insert_orders_bulk(db, user, orders)
+    db.commit()
+    ORDERS_CREATED.inc(len(created), source=source)
+    ORDER_LINES_CREATED.inc(sum(len(order["details"]) for order in created))
+    return results
+
+def _insert_orders_bulk(db, user, orders):
+    keys = [order["idempotency_key"] for order in orders]
+    existing = dict(db.execute(
+        select(OrderIdempotencyKey.idempotency_key, OrderIdempotencyKey.order_no).where(
+            OrderIdempotencyKey.username == user["username"],
+            OrderIdempotencyKey.idempotency_key.in_(keys),
+        )
+    ).all())
+
+    now = datetime.now()
+    next_seq = {}
+    results, created = [], []
+    masters, details, key_rows = [], [], []
+    for order in orders:
+        key = order["idempotency_key"]
+        if key in existing:
+            results.append((existing[key], False))
+            continue
+
+        year = order["order_date"].year
+        if year not in next_seq:
+            next_seq[year] = last_order_seq(db, year)
+        next_seq[year] += 1
+        order_no = f"ORD-{year}-{next_seq[year]:03d}"
+        existing[key] = order_no
+        results.append((order_no, True))
+        created.append(order)
+
+        masters.append({
+            "order_no": order_no, "order_date": order["order_date"], "order_type": order["order_type"],
+            "customer_company": user["company_name"], "status": "대기", "priority": 5,
+            "created_by": user["username"], "created_at": now, "version": 1,
+        })
+        for idx, detail in enumerate(order["details"]):
+            details.append({
+                "order_no": order_no, "order_seq": idx + 1, "item_code": detail["item_code"],
+                "item_name": detail["item_name"], "order_qty": detail["order_qty"],
+                "unit_price": Decimal(str(detail["unit_price"])), "shipping_qty": 0, "shipping_amount": 0,
+                "planned_shipping_date": detail["planned_shipping_date"],
+                "received_qty": 0, "planned_qty": 0, "version": 1,
+            })
+        key_rows.append({"username": user["username"], "idempotency_key": key, "order_no": order_no, "created_at": now})
+
+    if masters:
+        # Row-level change triggers are skipped; the counters are bumped once for the whole batch.
+        with bulk_changes(db, [OrderMaster.__tablename__, OrderDetail.__tablename__]) as changed_orders:
+            db.execute(insert(OrderMaster.__table__), masters)
+            db.execute(insert(OrderDetail.__table__), details)
+            db.execute(insert(OrderIdempotencyKey.__table__), key_rows)
+            changed_orders.update(master["order_no"] for master in masters)
+    return results, created
+
+def process_excel_file(uploaded_file, db=None, progress=None):
     """
     Parses an uploaded Excel file and returns the structured order details.
-    This is a wrapper around the existing excel_handler functionality.
+    This is a wrapper around the existing excel_handler functionality;
+    pandas/openpyxl are only imported once this is called.
+
+    Uploads of EXCEL_STREAMING_THRESHOLD_BYTES or more are spooled to a temp file and
+    read in chunks, calling progress(rows_read, total_rows) after each chunk.
+    .csv/.tsv files are read with the chunked CSV reader (same columns and rules).
     """
-    return parse_excel_file(uploaded_file)
+    if getattr(uploaded_file, "name", "").lower().endswith((".csv", ".tsv")):
+        return parse_csv_file(uploaded_file, db, progress=progress)
+    if getattr(uploaded_file, "size", 0) >= EXCEL_STREAMING_THRESHOLD_BYTES:
+        return parse_excel_file_streaming(uploaded_file, db, progress=progress)
+    return parse_excel_file(uploaded_file, db)
@@ -1,7 +1,10 @@
 
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
+from sqlalchemy import func, update
 from database.models import OrderMaster, OrderDetail, ShippingPlan
+from services.exceptions import ConcurrencyConflictError, version_conflict_as
+from utils.metrics import SHIPMENTS_CONFIRMED, track_duration
 
 def get_orders_for_registration(db, customer_company):
     """
@@ -30,28 +33,48 @@ def get_plans_for_registration(db, order_no):
     """
     return db.query(ShippingPlan).filter_by(order_no=order_no, status="지시").all()
 
+@track_duration("confirm_shipment_received")
 def confirm_shipment_received(db, order, received_items):
     """
     Updates the status of shipping plans and order details upon client confirmation.
     - Changes ShippingPlan status from '지시' to '출하완료'.
     - Updates OrderDetail with shipping quantity and amount.
     - Updates OrderMaster status to '출하완료' if all items are fully shipped.
+    The plan status change is conditional on the plan still being '지시',
+    so the same shipment can never be confirmed twice.
     """
     for item in received_items:
         plan = item["plan"]
         detail = item["detail"]
         
         # 1. Update the ShippingPlan status
-        plan.status = "출하완료"
+        result = db.execute(
+            update(ShippingPlan)
+            .where(ShippingPlan.plan_id == plan.plan_id, ShippingPlan.status == "지시")
+            .values(status="출하완료")
+        )
+        if result.rowcount != 1:
+            db.rollback()
+            raise ConcurrencyConflictError(
+                f"주문 {order.order_no}의 출하 계획이 이미 처리되었습니다. 새로고침 후 다시 시도해주세요."
+            )
         
-        # 2. Update the corresponding OrderDetail
-        detail.shipping_qty = (detail.shipping_qty or 0) + item["received_qty"]
-        detail.shipping_amount = Decimal(str(detail.unit_price)) * detail.shipping_qty
-        if not detail.actual_shipping_date:
-            detail.actual_shipping_date = item["received_date"]
+        # 2. Update the corresponding OrderDetail (relative to the stored balance, not the rendered one)
+        shipped_qty = func.coalesce(OrderDetail.shipping_qty, 0) + item["received_qty"]
+        db.execute(
+            update(OrderDetail)
+            .where(OrderDetail.order_no == detail.order_no, OrderDetail.order_seq == detail.order_seq)
+            .values(
+                shipping_qty=shipped_qty,
+                shipping_amount=OrderDetail.unit_price * shipped_qty,
+                actual_shipping_date=func.coalesce(OrderDetail.actual_shipping_date, item["received_date"]),
+                version=OrderDetail.version + 1,
+            )
+        )
 
     # 3. Check if the entire order is now complete
     db.flush() # Ensure detail.shipping_qty updates are available for the query
+    db.refresh(order)
     
     all_details = db.query(OrderDetail).filter_by(order_no=order.order_no).all()
     
@@ -61,5 +84,8 @@ def confirm_shipment_received(db, order, received_items):
     
     if is_order_complete:
         order.status = "출하완료"
+        order.closed_at = datetime.now()
         
-    db.commit()
+    with version_conflict_as(db, f"주문 {order.order_no}이(가) 다른 사용자에 의해 변경되었습니다. 새로고침 후 다시 시도해주세요."):
+        db.commit()
+    SHIPMENTS_CONFIRMED.inc(len(received_items))
@@ -1,5 +1,8 @@
 
-from database.models import OrderMaster, OrderDetail, Warehouse, ShippingPlan
+from sqlalchemy import update
+from database.models import OrderMaster, OrderDetail, Warehouse, ShippingPlan, ArchivedWarehouse, ArchivedShippingPlan
+from services.exceptions import ConcurrencyConflictError
+from utils.metrics import SHIPPING_PLANS_CREATED, track_duration
 
 def get_orders_for_shipping_plan(db):
     """Fetches orders that are fully received and ready for shipping plan creation."""
@@ -10,21 +13,26 @@ def get_orders_for_shipping_plan(db):
 def get_item_inventory_status(db, order_no, order_seq):
     """
     Calculates the detailed inventory status for a single order item.
+    Items of archived orders are read from the archive tables.
     """
     # Sum of all received items
+    plan_model = ShippingPlan
     receipts = db.query(Warehouse.received_qty).filter_by(order_no=order_no, order_seq=order_seq).all()
+    if not receipts:
+        plan_model = ArchivedShippingPlan
+        receipts = db.query(ArchivedWarehouse.received_qty).filter_by(order_no=order_no, order_seq=order_seq).all()
     total_received = sum(r[0] for r in receipts)
     
     # Sum of items already planned or instructed for shipping
-    planned_items = db.query(ShippingPlan.planned_qty).filter(
-        ShippingPlan.order_no == order_no,
-        ShippingPlan.order_seq == order_seq,
-        ShippingPlan.status.in_(["계획", "지시"])
+    planned_items = db.query(plan_model.planned_qty).filter(
+        plan_model.order_no == order_no,
+        plan_model.order_seq == order_seq,
+        plan_model.status.in_(["계획", "지시"])
     ).all()
     total_planned = sum(p[0] for p in planned_items)
 
     # Sum of items already shipped
-    shipped_items = db.query(ShippingPlan.planned_qty).filter_by(
+    shipped_items = db.query(plan_model.planned_qty).filter_by(
         order_no=order_no, 
         order_seq=order_seq, 
         status="출하완료"
@@ -40,8 +48,39 @@ def get_item_inventory_status(db, order_no, order_seq):
         "available": available_qty
     }
 
+def _reserve_planned_qty(db, order_no, order_seq, qty):
+    """
+    Atomically adds qty to the line's planned balance, but only if the result
+    stays within the received quantity (planned <= available).
+    """
+    if qty <= 0:
+        raise ValueError("출하수량은 0보다 커야 합니다.")
+    result = db.execute(
+        update(OrderDetail)
+        .where(
+            OrderDetail.order_no == order_no,
+            OrderDetail.order_seq == order_seq,
+            OrderDetail.planned_qty + qty <= OrderDetail.received_qty,
+        )
+        .values(planned_qty=OrderDetail.planned_qty + qty, version=OrderDetail.version + 1)
+    )
+    if result.rowcount != 1:
+        db.rollback()
+        raise ConcurrencyConflictError(
+            f"주문 {order_no}의 {order_seq}번 항목 출하수량이 가용재고를 초과합니다. "
+            "다른 사용자가 먼저 출하 계획을 등록했을 수 있으니 새로고침 후 다시 시도해주세요."
+        )
+
+@track_duration("create_shipping_plans")
 def create_shipping_plans(db, shipping_items, username):
-    """Creates new shipping plan entries in the database."""
+    """
+    Creates new shipping plan entries in the database.
+    The planned balance of each line is reserved with a conditional UPDATE first,
+    so concurrent plans can never exceed the available quantity.
+    """
+    for item in shipping_items:
+        _reserve_planned_qty(db, item["order_no"], item["order_seq"], item["planned_qty"])
+
     for item in shipping_items:
         db.add(ShippingPlan(
             order_no=item["order_no"],
@@ -52,12 +91,18 @@ def create_shipping_plans(db, shipping_items, username):
             created_by=username
         ))
     db.commit()
+    SHIPPING_PLANS_CREATED.inc(len(shipping_items))
 
 def get_shipping_plans_for_order(db, order_no):
-    """Fetches all shipping plans associated with a given order."""
-    return db.query(ShippingPlan).filter_by(order_no=order_no).order_by(
+    """Fetches all shipping plans associated with a given order (including archived orders)."""
+    plans = db.query(ShippingPlan).filter_by(order_no=order_no).order_by(
         ShippingPlan.planned_shipping_date, ShippingPlan.order_seq
     ).all()
+    if not plans:
+        plans = db.query(ArchivedShippingPlan).filter_by(order_no=order_no).order_by(
+            ArchivedShippingPlan.planned_shipping_date, ArchivedShippingPlan.order_seq
+        ).all()
+    return plans
 
 def instruct_shipping_plans(db, plans):
     """Updates the status of given shipping plans from 'Plan' to 'Instruct'."""
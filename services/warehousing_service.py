@@ -1,10 +1,15 @@
 
-from database.models import OrderMaster, OrderDetail, Warehouse
+from sqlalchemy import update
+from database.models import OrderMaster, OrderDetail, Warehouse, ArchivedOrderDetail, ArchivedWarehouse
+from services.exceptions import ConcurrencyConflictError, version_conflict_as
+from utils.metrics import RECEIPTS_REGISTERED, RECEIPT_QTY, track_duration
+
+WAREHOUSING_STATUSES = ("승인", "생산중")
 
 def get_orders_for_warehousing(db):
     """Fetches orders that are ready for warehousing ('Approved' or 'In Production')."""
     return db.query(OrderMaster).filter(
-        OrderMaster.status.in_(["승인", "생산중"])
+        OrderMaster.status.in_(WAREHOUSING_STATUSES)
     ).order_by(OrderMaster.order_no.desc()).all()
 
 def get_order_receipt_status(db, order_no):
@@ -30,14 +35,19 @@ def get_detailed_receipt_status(db, order_no):
     """
     Gets the receipt status for each line item in an order.
     Returns a list of dictionaries, each containing detail, received_qty, and remaining_qty.
+    Archived orders are read from the archive tables.
     """
+    detail_model, warehouse_model = OrderDetail, Warehouse
     order_details = db.query(OrderDetail).filter(OrderDetail.order_no == order_no).order_by(OrderDetail.order_seq).all()
+    if not order_details:
+        detail_model, warehouse_model = ArchivedOrderDetail, ArchivedWarehouse
+        order_details = db.query(detail_model).filter(detail_model.order_no == order_no).order_by(detail_model.order_seq).all()
     if not order_details:
         return []
 
     # Get a summary of all receipts for the order to avoid querying in a loop
     receipt_summary = {}
-    receipts = db.query(Warehouse.order_seq, Warehouse.received_qty).filter(Warehouse.order_no == order_no).all()
+    receipts = db.query(warehouse_model.order_seq, warehouse_model.received_qty).filter(warehouse_model.order_no == order_no).all()
     for seq, qty in receipts:
         receipt_summary[seq] = receipt_summary.get(seq, 0) + qty
 
@@ -51,10 +61,40 @@ def get_detailed_receipt_status(db, order_no):
         })
     return status_list
 
+def _reserve_receipt_qty(db, order_no, order_seq, qty):
+    """
+    Atomically adds qty to the line's received balance, but only if the result
+    stays within the ordered quantity (received <= ordered).
+    """
+    if qty <= 0:
+        raise ValueError("입고수량은 0보다 커야 합니다.")
+    result = db.execute(
+        update(OrderDetail)
+        .where(
+            OrderDetail.order_no == order_no,
+            OrderDetail.order_seq == order_seq,
+            OrderDetail.received_qty + qty <= OrderDetail.order_qty,
+        )
+        .values(received_qty=OrderDetail.received_qty + qty, version=OrderDetail.version + 1)
+    )
+    if result.rowcount != 1:
+        db.rollback()
+        raise ConcurrencyConflictError(
+            f"주문 {order_no}의 {order_seq}번 항목 입고수량이 주문수량을 초과합니다. "
+            "다른 사용자가 먼저 입고했을 수 있으니 새로고침 후 다시 시도해주세요."
+        )
+
+@track_duration("register_receipts")
 def register_receipts(db, order, receipt_items, username):
     """
     Registers new warehouse receipts and updates the order status.
+    Each line balance is updated with a conditional UPDATE, so concurrent receipts
+    can never push the received quantity above the ordered quantity.
     """
+    # Reserve the quantities first; this also takes SQLite's write lock for the transaction
+    for item in receipt_items:
+        _reserve_receipt_qty(db, item["order_no"], item["order_seq"], item["received_qty"])
+
     # Add new warehouse entries
     for item in receipt_items:
         db.add(Warehouse(
@@ -66,7 +106,10 @@ def register_receipts(db, order, receipt_items, username):
             received_date=item["received_date"],
             received_by=username
         ))
-    
+
+    # Re-read the order inside the write transaction so the status change is based on the latest version
+    db.refresh(order)
+
     # Update status to 'In Production' if it was 'Approved'
     if order.status == "승인":
         order.status = "생산중"
@@ -79,10 +122,18 @@ def register_receipts(db, order, receipt_items, username):
     if status["progress"] >= 100:
         order.status = "입고완료"
     
-    db.commit()
+    with version_conflict_as(db, f"주문 {order.order_no}이(가) 다른 사용자에 의해 변경되었습니다. 새로고침 후 다시 시도해주세요."):
+        db.commit()
+    RECEIPTS_REGISTERED.inc(len(receipt_items))
+    RECEIPT_QTY.inc(sum(item["received_qty"] for item in receipt_items))
 
 def get_receipt_history(db, order_no):
-    """Fetches the history of warehouse receipts for a given order."""
-    return db.query(Warehouse).filter(
+    """Fetches the history of warehouse receipts for a given order (including archived orders)."""
+    receipts = db.query(Warehouse).filter(
         Warehouse.order_no == order_no
     ).order_by(Warehouse.received_date.desc(), Warehouse.order_seq).all()
+    if not receipts:
+        receipts = db.query(ArchivedWarehouse).filter(
+            ArchivedWarehouse.order_no == order_no
+        ).order_by(ArchivedWarehouse.received_date.desc(), ArchivedWarehouse.order_seq).all()
+    return receipts
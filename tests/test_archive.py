@@ -0,0 +1,123 @@
+"""
+종료 주문 보관(아카이브) 테스트
+"""
+from datetime import date, datetime
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import sessionmaker
+
+from database.archive import archive_closed_orders, archivable_orders_query
+from database.db_init import migrate_schema
+from database.models import (
+    OrderMaster, OrderDetail, Warehouse, ShippingPlan,
+    ArchivedOrderMaster, ArchivedOrderDetail, ArchivedWarehouse, ArchivedShippingPlan,
+)
+from database.seed_data import generate
+from database.write_queue import create_writer_engine
+from services.approval_service import get_order_details, get_orders_for_approval
+from services.dashboard_service import get_client_dashboard_data, get_manager_dashboard_data
+from services.shipping_service import get_item_inventory_status, get_shipping_plans_for_order
+from services.warehousing_service import get_detailed_receipt_status, get_receipt_history
+
+NOW = datetime(2026, 1, 1)
+
+
+def _seeded_engine(tmp_path, orders=300):
+    engine = create_writer_engine(f"sqlite:///{tmp_path / 'archive.db'}")
+    generate(engine, orders, seed=3, customers=4, items=10, end_date=date(2025, 12, 31))
+    return engine
+
+
+def _count(conn, model):
+    return conn.execute(select(func.count()).select_from(model)).scalar()
+
+
+class TestArchiveClosedOrders:
+    """보관 작업 테스트"""
+
+    def test_moves_only_old_closed_orders_in_batches(self, tmp_path):
+        """기간이 지난 출하완료/거부 주문만 배치 단위로 옮기고 행 수를 보존"""
+        engine = _seeded_engine(tmp_path)
+        models = [(OrderMaster, ArchivedOrderMaster), (OrderDetail, ArchivedOrderDetail),
+                  (Warehouse, ArchivedWarehouse), (ShippingPlan, ArchivedShippingPlan)]
+        with engine.connect() as conn:
+            before = {hot.__tablename__: _count(conn, hot) for hot, _ in models}
+
+        planned = archive_closed_orders(engine, older_than_days=90, dry_run=True, now=NOW)
+        totals = archive_closed_orders(engine, older_than_days=90, batch_size=25, pause_s=0, now=NOW)
+
+        assert totals["order_master"] == planned["order_master"] > 25
+        assert totals["batches"] > 1
+        with engine.connect() as conn:
+            for hot, cold in models:
+                assert _count(conn, hot) + _count(conn, cold) == before[hot.__tablename__]
+                assert _count(conn, cold) == totals[hot.__tablename__]
+            archived_statuses = set(conn.execute(select(ArchivedOrderMaster.status).distinct()).scalars())
+            assert archived_statuses <= {"출하완료", "거부"}
+            # 남은 종료 주문은 모두 기준일 이후에 종료된 주문
+            remaining = conn.execute(select(func.min(OrderMaster.closed_at)).where(
+                OrderMaster.status.in_(["출하완료", "거부"]))).scalar()
+            assert remaining is None or remaining >= datetime(2025, 10, 3)
+
+        # 다시 실행하면 옮길 주문이 없음
+        assert archive_closed_orders(engine, older_than_days=90, pause_s=0, now=NOW)["order_master"] == 0
+
+    def test_services_find_archived_orders(self, tmp_path):
+        """주문 상세/검색 조회가 보관된 주문도 찾음"""
+        engine = _seeded_engine(tmp_path)
+        archive_closed_orders(engine, older_than_days=90, pause_s=0, now=NOW)
+        db = sessionmaker(bind=engine)()
+        try:
+            order_no = db.query(ArchivedOrderMaster.order_no).filter(
+                ArchivedOrderMaster.status == "출하완료").order_by(ArchivedOrderMaster.order_no).first()[0]
+
+            master, details, total_amount = get_order_details(db, order_no)
+            assert master.order_no == order_no and master.archived_at is not None
+            assert details and total_amount == sum(d.order_qty * d.unit_price for d in details)
+
+            receipt_status = get_detailed_receipt_status(db, order_no)
+            assert [s["remaining_qty"] for s in receipt_status] == [0] * len(details)
+            assert get_receipt_history(db, order_no)
+            assert get_shipping_plans_for_order(db, order_no)
+            inventory = get_item_inventory_status(db, order_no, details[0].order_seq)
+            assert inventory["shipped"] == details[0].order_qty and inventory["available"] == 0
+
+            found = get_orders_for_approval(db, {"status": "전체", "order_type": "전체", "search_no": order_no})
+            assert [o.order_no for o in found] == [order_no]
+            # 주문번호 검색이 없으면 보관 테이블은 조회하지 않음
+            worklist = get_orders_for_approval(db, {"status": "출하완료", "order_type": "전체", "search_no": ""})
+            assert order_no not in {o.order_no for o in worklist}
+        finally:
+            db.close()
+
+    def test_dashboard_totals_include_archived_orders(self, tmp_path):
+        """보관 전후로 대시보드의 전체/상태별 주문 수가 같음"""
+        engine = _seeded_engine(tmp_path)
+        db = sessionmaker(bind=engine)()
+        try:
+            keys = ["total_orders", "pending_count", "approved_count", "shipping_complete_count"]
+            username = db.query(OrderMaster.created_by).first()[0]
+            manager_before = {k: get_manager_dashboard_data(db)[k] for k in keys}
+            client_before = get_client_dashboard_data(db, username)["total_orders"]
+            db.rollback()
+
+            assert archive_closed_orders(engine, older_than_days=90, pause_s=0, now=NOW)["order_master"] > 0
+
+            assert {k: get_manager_dashboard_data(db)[k] for k in keys} == manager_before
+            assert get_client_dashboard_data(db, username)["total_orders"] == client_before
+        finally:
+            db.close()
+
+    def test_candidate_query_uses_closed_at_index(self, tmp_path):
+        """보관 대상 조회는 인덱스 범위 검색으로 끝나고, 기존 데이터베이스에도 인덱스를 추가"""
+        engine = _seeded_engine(tmp_path, orders=50)
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_order_master_closed_at"))
+        engine.dispose()
+        migrate_schema(create_engine(engine.url))
+
+        query = archivable_orders_query(NOW, 100).compile(engine, compile_kwargs={"literal_binds": True})
+        with engine.connect() as conn:
+            plan = " ".join(row[3] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {query}")))
+        assert "USING INDEX ix_order_master_closed_at" in plan
+        assert "TEMP B-TREE" not in plan
@@ -3,7 +3,7 @@
 """
 import pytest
 import bcrypt
-from datetime import datetime
+from datetime import datetime, timedelta
 import sys
 import os
 
@@ -11,7 +11,12 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database.models import User
-from auth.auth import hash_password, verify_password
+from auth import auth as auth_module
+from auth.auth import (
+    hash_password, verify_password, hash_rounds, needs_rehash, check_password, update_password_hash,
+    issue_session_token, validate_session_token,
+    revoke_session_token, purge_sessions,
+)
 
 
 class TestPasswordHashing:
@@ -109,3 +114,116 @@ class TestLogin:
         # 잘못된 비밀번호 검증
         assert verify_password("wrong_password", password_hash) is False
 
+
+class TestPasswordCost:
+    """bcrypt 비용 설정 및 재해싱 테스트"""
+
+    def test_rounds_recorded_in_hash(self):
+        """설정한 비용이 해시에 기록됨"""
+        hashed = hash_password("test123", rounds=4)
+
+        assert hash_rounds(hashed) == 4
+        assert needs_rehash(hashed, rounds=4) is False
+        assert needs_rehash(hashed, rounds=5) is True
+
+    def test_check_password_returns_rehash(self, monkeypatch):
+        """비용이 바뀐 해시는 검증 스레드에서 새 비용으로 다시 해싱"""
+        import auth.auth as auth_module
+        monkeypatch.setattr(auth_module, "BCRYPT_ROUNDS", 5)
+        old_hash = hash_password("test123", rounds=4)
+
+        ok, new_hash = check_password("test123", old_hash)
+        assert ok is True
+        assert hash_rounds(new_hash) == 5 and verify_password("test123", new_hash)
+        assert check_password("test123", new_hash) == (True, None)
+        assert check_password("wrong", old_hash) == (False, None)
+
+    def test_update_password_hash_only_if_unchanged(self, test_db, sample_user_data):
+        """저장된 해시가 그사이 바뀌었으면 교체하지 않음"""
+        old_hash = hash_password("test123", rounds=4)
+        test_db.add(User(user_id=sample_user_data["user_id"], username=sample_user_data["username"],
+                         password_hash=old_hash, role=sample_user_data["role"]))
+        test_db.commit()
+        new_hash = hash_password("test123", rounds=5)
+
+        assert update_password_hash(test_db, sample_user_data["user_id"], "stale", new_hash) is False
+        assert update_password_hash(test_db, sample_user_data["user_id"], old_hash, new_hash) is True
+        test_db.expire_all()
+        assert test_db.get(User, sample_user_data["user_id"]).password_hash == new_hash
+
+
+class TestSessionToken:
+    """세션 토큰 테스트"""
+
+    @pytest.fixture
+    def user(self, test_db, sample_user_data):
+        test_db.add(User(
+            user_id=sample_user_data["user_id"],
+            username=sample_user_data["username"],
+            password_hash="-",
+            role=sample_user_data["role"],
+            company_name=sample_user_data["company_name"]
+        ))
+        test_db.commit()
+        return sample_user_data
+
+    def test_round_trip(self, test_db, user):
+        """발급한 토큰으로 사용자 정보 복원"""
+        token = issue_session_token(test_db, user["user_id"])
+        user_info = validate_session_token(token, db=test_db)
+
+        assert user_info["username"] == user["username"]
+        assert user_info["role"] == user["role"]
+
+    def test_tampered_token(self, test_db, user):
+        """서명이나 만료 시각을 바꾼 토큰은 거부"""
+        token = issue_session_token(test_db, user["user_id"])
+        session_id, expires_ts, signature = token.split(".")
+
+        assert validate_session_token(f"{session_id}.{int(expires_ts) + 3600}.{signature}", db=test_db) is None
+        assert validate_session_token(f"{session_id}.{expires_ts}.{signature[:-1]}A", db=test_db) is None
+        assert validate_session_token("garbage", db=test_db) is None
+
+    def test_expired_token(self, test_db, user):
+        """만료된 토큰은 거부"""
+        token = issue_session_token(test_db, user["user_id"], now=datetime.now() - timedelta(hours=2), ttl_hours=1)
+
+        assert validate_session_token(token, db=test_db) is None
+
+    def test_revoked_token(self, test_db, user):
+        """로그아웃으로 폐기한 토큰은 거부하고 정리 작업에서 삭제"""
+        token = issue_session_token(test_db, user["user_id"])
+        other = issue_session_token(test_db, user["user_id"])
+
+        assert revoke_session_token(test_db, token) is True
+        assert validate_session_token(token, db=test_db) is None
+        assert validate_session_token(other, db=test_db) is not None
+        assert purge_sessions(test_db) == 1
+
+    def test_secret_file_created_once_across_threads(self, tmp_path, monkeypatch):
+        """동시에 키를 만들어도 모두 같은 키를 사용하고, 빈 키 파일은 거부"""
+        import threading
+
+        path = tmp_path / "session_secret.key"
+        monkeypatch.setattr(auth_module, "SESSION_SECRET", None)
+        monkeypatch.setattr(auth_module, "SESSION_SECRET_PATH", str(path))
+        create = auth_module._session_secret.__wrapped__  # lru_cache 없이 호출
+
+        keys, barrier = [], threading.Barrier(8)
+
+        def worker():
+            barrier.wait()
+            keys.append(create())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(keys) == 8 and len(set(keys)) == 1 and keys[0] == path.read_bytes()
+        assert [p.name for p in tmp_path.iterdir()] == ["session_secret.key"]  # 임시 파일은 남지 않음
+
+        path.write_bytes(b"  \n")
+        with pytest.raises(RuntimeError):
+            create()
@@ -0,0 +1,122 @@
+"""
+프로세스 간 변경 알림 테스트
+"""
+import sqlite3
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from database.change_notifier import ChangeWatcher, bulk_changes, prune_order_changes, watcher_for_session
+from database.models import ItemMaster, OrderMaster, OrderDetail
+
+
+def _db_path(db):
+    return db.get_bind().url.database
+
+
+class TestChangeWatcher:
+    """PRAGMA data_version 기반 변경 감시 테스트"""
+
+    def test_reports_changed_tables_and_orders(self, test_db):
+        """다른 연결이 커밋한 테이블과 주문번호를 알리고, 변경이 없으면 None"""
+        watcher = ChangeWatcher(_db_path(test_db))
+        received = []
+        watcher.subscribe(received.append)
+        assert watcher.poll() is None  # 첫 확인은 기준값만 기록
+
+        test_db.add(OrderMaster(order_no="ORD-1", order_date=date(2026, 10, 19), order_type="일반",
+                                customer_company="삼성SDI", created_by="samsung_sdi"))
+        test_db.add(OrderDetail(order_no="ORD-1", order_seq=1, item_code="ITEM001", item_name="ESS",
+                                order_qty=1, unit_price=Decimal("1.00")))
+        test_db.commit()
+        changes = watcher.poll()
+
+        assert changes.tables == {"order_master", "order_detail"}
+        assert changes.order_nos == {"ORD-1"}
+        assert received == [changes]
+        assert watcher.poll() is None
+
+        # 다른 도구가 직접 SQL로 바꾼 경우도 트리거로 감지
+        conn = sqlite3.connect(_db_path(test_db))
+        conn.execute("UPDATE order_detail SET order_qty = 2 WHERE order_no = 'ORD-1'")
+        conn.commit()
+        conn.close()
+        assert watcher.poll().order_nos == {"ORD-1"}
+        watcher.close()
+
+    def test_table_version_sees_other_connections(self, test_db):
+        """조회할 때마다 다른 연결의 커밋을 반영한 카운터를 돌려줌"""
+        watcher = watcher_for_session(test_db)
+        before = watcher.table_version("item_master")
+
+        test_db.add(ItemMaster(item_code="ITEM001", item_name="ESS", lead_time_days=30,
+                               unit_price=Decimal("400000.00"), is_active="Y"))
+        test_db.commit()
+
+        assert watcher.table_version("item_master") == before + 1
+        assert watcher.table_version("users") == 0
+
+    def test_unmigrated_database(self, tmp_path):
+        """change_counter 테이블이 없으면 버전을 알 수 없음(None)"""
+        path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE item_master (item_code TEXT PRIMARY KEY)")
+        conn.commit()
+        watcher = ChangeWatcher(path)
+
+        assert watcher.table_version("item_master") is None
+        conn.execute("CREATE TABLE change_counter (name TEXT PRIMARY KEY, version INTEGER)")
+        conn.execute("INSERT INTO change_counter VALUES ('item_master', 3)")
+        conn.commit()
+        assert watcher.table_version("item_master") == 3
+        conn.close()
+        watcher.close()
+
+
+class TestBulkChanges:
+    """대량 쓰기의 변경 기록과 order_changes 정리 테스트"""
+
+    def _order(self, order_no):
+        return OrderMaster(order_no=order_no, order_date=date(2026, 10, 19), order_type="일반",
+                           customer_company="삼성SDI", created_by="samsung_sdi")
+
+    def test_counters_bumped_once_per_batch(self, test_db):
+        """블록 안의 행마다 트리거가 돌지 않고, 끝난 뒤 테이블 카운터와 주문번호를 한 번만 기록"""
+        watcher = ChangeWatcher(_db_path(test_db))
+        watcher.poll()
+
+        with bulk_changes(test_db, ["order_master"]) as changed_orders:
+            test_db.add_all([self._order(f"ORD-{n}") for n in range(5)])
+            test_db.flush()
+            changed_orders.update(f"ORD-{n}" for n in range(5))
+        test_db.commit()
+
+        counters = dict(test_db.execute(text("SELECT name, version FROM change_counter")).all())
+        assert counters["order_master"] == 1 and counters["order_changes"] == 1
+        assert test_db.execute(text("SELECT COUNT(*) FROM change_tracking_pause")).scalar() == 0
+        changes = watcher.poll()
+        assert changes.tables == {"order_master"} and changes.order_nos == {f"ORD-{n}" for n in range(5)}
+
+        # 블록 밖의 쓰기는 다시 트리거가 기록
+        test_db.add(self._order("ORD-X"))
+        test_db.commit()
+        assert watcher.poll().order_nos == {"ORD-X"}
+        watcher.close()
+
+    def test_prune_keeps_recent_changes(self, test_db):
+        """최근 keep개 순번만 남기고, 그 전에 확인한 감시 객체에는 불완전하다고 알림"""
+        watcher = ChangeWatcher(_db_path(test_db))
+        watcher.poll()
+        for n in range(5):
+            test_db.add(self._order(f"ORD-{n}"))
+            test_db.commit()
+
+        assert prune_order_changes(test_db, keep=2) == 3
+        test_db.commit()
+        remaining = test_db.execute(text("SELECT order_no FROM order_changes ORDER BY seq")).scalars().all()
+        assert remaining == ["ORD-3", "ORD-4"]
+        changes = watcher.poll()
+        assert changes.order_nos == {"ORD-3", "ORD-4"} and not changes.order_nos_complete
+        assert prune_order_changes(test_db, keep=10) == 0
+        watcher.close()
@@ -0,0 +1,155 @@
+"""
+드롭 폴더 주문 수신 테스트
+"""
+import csv
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from api import drop_folder
+from database.models import ItemMaster, OrderMaster, OrderDetail, User
+
+ITEMS = {"ESS": {"item_code": "ITEM001", "unit_price": 400000.0}, "EV 모듈": {"item_code": "ITEM002", "unit_price": 150000.0}}
+
+
+@pytest.fixture
+def drop_db(test_db, monkeypatch):
+    test_db.add_all([
+        User(user_id="user001", username="samsung_sdi", password_hash="x", role="발주사", company_name="삼성SDI"),
+        ItemMaster(item_code="ITEM001", item_name="ESS", lead_time_days=30, unit_price=Decimal("400000.00"), is_active="Y"),
+        ItemMaster(item_code="ITEM002", item_name="EV 모듈", lead_time_days=0, unit_price=Decimal("150000.00"), is_active="Y"),
+    ])
+    test_db.commit()
+
+    class _InlineWriter:
+        def execute(self, fn, *args, **kwargs):
+            return fn(test_db, *args, **kwargs)
+
+    monkeypatch.setattr(drop_folder, "get_db", lambda: test_db)
+    monkeypatch.setattr(drop_folder, "close_db", lambda db: None)
+    monkeypatch.setattr(drop_folder, "get_writer", lambda: _InlineWriter())
+    return test_db
+
+
+def _read_report(path):
+    with open(path + ".report.csv", encoding="utf-8-sig", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+class TestParseOrderFile:
+    """파일 파싱 테스트 (엑셀 업로드와 같은 검증 규칙)"""
+
+    def test_groups_rows_by_order_key(self, tmp_path):
+        """주문키별로 주문을 만들고, 오류 행이 있는 주문은 통째로 제외"""
+        path = tmp_path / "orders.csv"
+        pd.DataFrame({
+            "주문키": ["PO-1", "PO-1", "PO-2", "PO-3"],
+            "주문구분": ["긴급", "긴급", "일반", "일반"],
+            "품목명": ["ESS", "EV 모듈", "없는 품목", "ESS"],
+            "주문수량": [10, 5, 1, 2],
+        }).to_csv(path, index=False, encoding="cp949")
+
+        parsed = drop_folder.parse_order_file(str(path), ITEMS, date(2026, 10, 19))
+
+        assert [order["idempotency_key"] for order in parsed["orders"]] == ["PO-1", "PO-3"]
+        first = parsed["orders"][0]
+        assert first["order_type"] == "긴급" and first["order_date"] == date(2026, 10, 19) and first["rows"] == [2, 3]
+        assert [d["item_code"] for d in first["details"]] == ["ITEM001", "ITEM002"]
+        assert parsed["row_errors"] == [(4, "등록되지 않은 품목명입니다: 없는 품목")]
+        assert parsed["rejected"] == {"PO-2": [4]}
+
+    def test_missing_columns_is_file_error(self, tmp_path):
+        """필수 컬럼이 없으면 파일 전체 오류"""
+        path = tmp_path / "orders.xlsx"
+        pd.DataFrame({"품목명": ["ESS"]}).to_excel(path, index=False)
+
+        parsed = drop_folder.parse_order_file(str(path), ITEMS, date(2026, 10, 19))
+
+        assert parsed == {"error": "필수 컬럼이 누락되었습니다: 주문수량"}
+
+
+class TestScanOnce:
+    """폴더 처리 흐름 테스트"""
+
+    def test_files_move_to_done_and_error_with_reports(self, drop_db, tmp_path):
+        """정상 파일은 done, 오류 파일은 error로 옮기고 보고서 작성, 같은 파일을 다시 놓아도 중복 생성 없음"""
+        inbox = tmp_path / "samsung_sdi"
+        inbox.mkdir()
+        pd.DataFrame({"품목명": ["ESS", "EV 모듈"], "주문수량": [10, 5]}).to_excel(inbox / "good.xlsx", index=False)
+        pd.DataFrame({"품목명": ["ESS", "ESS"], "주문수량": [1, "많이"]}).to_csv(inbox / "bad.csv", index=False)
+        shutil.copy(inbox / "good.xlsx", tmp_path / "good_copy.xlsx")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            summaries = {s["file"]: s for s in drop_folder.scan_once(str(tmp_path), executor, settle_s=0)}
+
+        assert summaries["good.xlsx"]["failed"] is False and summaries["good.xlsx"]["created"] == 1
+        assert summaries["bad.csv"]["failed"] is True and summaries["bad.csv"]["created"] == 0
+        assert os.path.dirname(summaries["good.xlsx"]["path"]) == str(tmp_path / "done" / "samsung_sdi")
+        assert os.path.dirname(summaries["bad.csv"]["path"]) == str(tmp_path / "error" / "samsung_sdi")
+        assert os.listdir(inbox) == [] and os.listdir(tmp_path / "processing" / "samsung_sdi") == []
+
+        good_report = _read_report(summaries["good.xlsx"]["path"])
+        assert [(r["행"], r["결과"]) for r in good_report] == [("2", "생성"), ("3", "생성")]
+        order_no = good_report[0]["주문번호"]
+        master = drop_db.get(OrderMaster, order_no)
+        assert master.customer_company == "삼성SDI" and master.order_type == "일반"
+        assert drop_db.query(OrderDetail).filter_by(order_no=order_no).count() == 2
+
+        bad_report = _read_report(summaries["bad.csv"]["path"])
+        assert ("3", "오류", "주문수량은 숫자여야 합니다.") in [(r["행"], r["결과"], r["메시지"]) for r in bad_report]
+        assert drop_db.query(OrderMaster).count() == 1
+
+        shutil.copy(tmp_path / "good_copy.xlsx", inbox / "good.xlsx")
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            (again,) = drop_folder.scan_once(str(tmp_path), executor, settle_s=0)
+        assert (again["created"], again["duplicates"]) == (0, 1)
+        assert drop_db.query(OrderMaster).count() == 1
+
+    def test_same_name_with_new_rows_creates_new_orders(self, drop_db, tmp_path):
+        """매일 같은 이름으로 내용만 바뀌어 들어오는 파일(주문키 없음)은 새 주문으로 생성"""
+        inbox = tmp_path / "samsung_sdi"
+        inbox.mkdir()
+
+        created = []
+        for qty in (10, 20):
+            pd.DataFrame({"품목명": ["ESS"], "주문수량": [qty]}).to_csv(inbox / "orders.csv", index=False)
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                (summary,) = drop_folder.scan_once(str(tmp_path), executor, settle_s=0)
+            assert (summary["created"], summary["duplicates"]) == (1, 0)
+            created.append(_read_report(summary["path"])[0]["주문번호"])
+
+        assert created[0] != created[1]
+        assert drop_db.query(OrderMaster).count() == 2
+
+    def test_partial_failure_reports_committed_orders(self, drop_db, tmp_path, monkeypatch):
+        """뒤 묶음에서 오류가 나도 이미 커밋된 주문의 주문번호를 보고서에 남김"""
+        inbox = tmp_path / "samsung_sdi"
+        inbox.mkdir()
+        pd.DataFrame({"주문키": ["PO-1", "PO-2", "PO-3"], "품목명": ["ESS"] * 3, "주문수량": [1, 2, 3]}).to_csv(
+            inbox / "orders.csv", index=False)
+
+        calls = []
+
+        class _FailingWriter:
+            def execute(self, fn, *args, **kwargs):
+                calls.append(args)
+                if len(calls) == 2:
+                    raise RuntimeError("disk I/O error")
+                return fn(drop_db, *args, **kwargs)
+
+        monkeypatch.setattr(drop_folder, "DROP_FOLDER_ORDERS_PER_COMMIT", 2)
+        monkeypatch.setattr(drop_folder, "get_writer", lambda: _FailingWriter())
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            (summary,) = drop_folder.scan_once(str(tmp_path), executor, settle_s=0)
+
+        assert summary["failed"] and summary["created"] == 2
+        report = {row["주문키"]: row for row in _read_report(summary["path"]) if row["주문키"]}
+        created_nos = {no for (no,) in drop_db.query(OrderMaster.order_no).all()}
+        assert {report["PO-1"]["주문번호"], report["PO-2"]["주문번호"]} == created_nos
+        assert report["PO-1"]["결과"] == "생성" and report["PO-3"]["결과"] == "미생성"
+        assert any("disk I/O error" in row["메시지"] for row in _read_report(summary["path"]))
@@ -150,3 +150,160 @@ class TestExcelParsing:
         assert len(order_details) == 0
         assert "주문 상세 데이터가 없습니다" in error_msg or len(error_msg) > 0
 
+
+
+class TestValidateOrderRows:
+    """컬럼 단위 행 검증 테스트 (행 단위 구현과 같은 결과/메시지)"""
+
+    ITEMS = {"ESS": {"item_code": "ITEM001", "unit_price": 400000.0}}
+
+    def test_messages_and_details(self):
+        """행마다 처음 실패한 검증의 메시지, 통과한 행은 단가 경고와 날짜 오류를 순서대로"""
+        from datetime import date
+        from utils.excel_handler import validate_order_rows
+
+        df = pd.DataFrame({
+            "품목명": [" ESS ", None, "없는 품목", "ESS", "ESS", "ESS", "ESS"],
+            "주문수량": ["10", 5, 5, "많이", -1, 3.7, 2],
+            "단가": [None, None, None, None, None, "1000", "abc"],
+            "납품예정일": ["2026-12-31", None, None, None, None, "31/31/2026", None],
+        })
+
+        details, errors = validate_order_rows(df, self.ITEMS)
+
+        assert [row for row, _ in details] == [2, 7, 8]
+        assert details[0][1] == {"item_code": "ITEM001", "item_name": "ESS", "order_qty": 10,
+                                 "unit_price": 400000.0, "planned_shipping_date": date(2026, 12, 31)}
+        assert details[1][1]["order_qty"] == 3 and details[1][1]["planned_shipping_date"] is None
+        assert errors == [
+            (3, "품목명을 입력해주세요."),
+            (4, "등록되지 않은 품목명입니다: 없는 품목"),
+            (5, "주문수량은 숫자여야 합니다."),
+            (6, "수량은 0보다 커야 합니다."),
+            (7, "엑셀의 단가(1,000)는 무시되고 품목 마스터의 단가(400,000)가 사용됩니다."),
+            (7, "납품예정일 형식이 올바르지 않습니다."),
+        ]
+
+    def test_infinite_and_out_of_range_quantities(self):
+        """무한대와 int64 범위를 넘는 수량은 예외 없이 행 오류로 보고"""
+        from utils.excel_handler import validate_order_rows
+
+        float_df = pd.DataFrame({"품목명": ["ESS"] * 4, "주문수량": [float("inf"), 1e30, float("nan"), 4.0]})
+        object_df = pd.DataFrame({"품목명": ["ESS"] * 3, "주문수량": [float("-inf"), 10 ** 30, "7"]})
+
+        float_details, float_errors = validate_order_rows(float_df, self.ITEMS)
+        object_details, object_errors = validate_order_rows(object_df, self.ITEMS)
+
+        assert [(row, d["order_qty"]) for row, d in float_details] == [(5, 4)]
+        assert float_errors == [(row, "주문수량은 숫자여야 합니다.") for row in (2, 3, 4)]
+        assert [(row, d["order_qty"]) for row, d in object_details] == [(4, 7)]
+        assert object_errors == [(row, "주문수량은 숫자여야 합니다.") for row in (2, 3)]
+
+
+class TestStreamingParse:
+    """청크 단위 스트리밍 파싱 테스트"""
+
+    def test_same_result_as_full_read(self, test_db):
+        """시트 전체를 읽을 때와 같은 주문상세/메시지, 청크마다 진행률 보고, 임시 파일 삭제"""
+        import tempfile
+        from datetime import datetime
+        from decimal import Decimal
+        from openpyxl import Workbook
+        from database.models import ItemMaster
+        from utils.excel_handler import parse_excel_file_streaming
+
+        test_db.add(ItemMaster(item_code="ITEM001", item_name="ESS", lead_time_days=30, unit_price=Decimal("400000.00"), is_active="Y"))
+        test_db.commit()
+
+        workbook = Workbook()
+        sheet = workbook.active
+        for row in [["품목명", "주문수량", "단가", "납품예정일"], ["ESS", 10, 400000, "2026-12-01"], [None],
+                    ["ESS", "많이"], ["없는 품목", 1], ["ESS", 2.5, 1, "bad"], ["ESS", 3, None, datetime(2026, 1, 1)], [None]]:
+            sheet.append(row)
+        excel_buffer = BytesIO()
+        workbook.save(excel_buffer)
+
+        expected = parse_excel_file(BytesIO(excel_buffer.getvalue()), test_db)
+        spooled_before = set(os.listdir(tempfile.gettempdir()))
+        progress = []
+        result = parse_excel_file_streaming(BytesIO(excel_buffer.getvalue()), test_db, chunk_rows=2,
+                                            progress=lambda rows_read, total: progress.append(rows_read))
+
+        assert result == expected
+        assert result[0] is True and len(result[1]) == 3
+        assert "행 3: 품목명을 입력해주세요." in result[2]
+        assert progress == [3, 5, 6]  # 빈 행은 다음 데이터 행과 같은 청크에 포함
+        assert set(os.listdir(tempfile.gettempdir())) <= spooled_before
+
+
+class TestCsvParse:
+    """CSV/TSV 업로드 테스트"""
+
+    @pytest.mark.parametrize("encoding", ["utf-8-sig", "utf-8", "cp949"])
+    def test_encodings_and_chunks(self, test_db, encoding):
+        """UTF-8(BOM 유무)/CP949 자동 판별, 청크가 나뉘어도 행 번호와 메시지는 엑셀과 같음"""
+        from decimal import Decimal
+        from database.models import ItemMaster
+        from utils.excel_handler import parse_csv_file
+
+        test_db.add(ItemMaster(item_code="ITEM001", item_name="ESS", lead_time_days=30, unit_price=Decimal("400000.00"), is_active="Y"))
+        test_db.commit()
+        text = "품목명,주문수량,단가,납품예정일\nESS,10,400000,2026-12-01\n,5,,\n없는 품목,1,,\nESS,많이,,\nESS,3,1,\n"
+        upload = BytesIO(text.encode(encoding))
+        upload.name = "orders.csv"
+
+        success, details, error_msg = parse_csv_file(upload, test_db, chunk_rows=2)
+
+        assert success is True
+        assert [(d["item_code"], d["order_qty"]) for d in details] == [("ITEM001", 10), ("ITEM001", 3)]
+        assert error_msg.splitlines()[1:] == [
+            "행 3: 품목명을 입력해주세요.",
+            "행 4: 등록되지 않은 품목명입니다: 없는 품목",
+            "행 5: 주문수량은 숫자여야 합니다.",
+            "행 6: 엑셀의 단가(1)는 무시되고 품목 마스터의 단가(400,000)가 사용됩니다.",
+        ]
+
+    def test_tsv_keeps_item_names_as_text(self, test_db):
+        """TSV는 탭으로 구분하고, 숫자처럼 보이는 품목명도 문자열로 비교"""
+        from decimal import Decimal
+        from database.models import ItemMaster
+        from utils.excel_handler import parse_csv_file
+
+        test_db.add(ItemMaster(item_code="ITEM007", item_name="007", lead_time_days=0, unit_price=Decimal("1000.00"), is_active="Y"))
+        test_db.commit()
+        upload = BytesIO("품목명\t주문수량\n007\t4\n".encode("utf-8"))
+        upload.name = "orders.tsv"
+
+        assert parse_csv_file(upload, test_db) == (True, [{
+            "item_code": "ITEM007", "item_name": "007", "order_qty": 4, "unit_price": 1000.0, "planned_shipping_date": None,
+        }], "")
+
+
+class TestTemplateCache:
+    """주문 템플릿 캐시 테스트"""
+
+    def test_cached_per_item_version_with_dropdowns(self, test_db):
+        """같은 품목 버전이면 같은 바이트, 품목 변경 시 다시 생성, 품목명 드롭다운은 숨김 시트 목록 참조"""
+        from decimal import Decimal
+        from openpyxl import load_workbook
+        from database.models import ItemMaster
+
+        test_db.add(ItemMaster(item_code="ITEM001", item_name="ESS", lead_time_days=30, unit_price=Decimal("400000.00"), is_active="Y"))
+        test_db.commit()
+
+        template = download_template(test_db, role="발주사")
+        assert download_template(test_db, role="발주사") is template
+        workbook = load_workbook(BytesIO(template))
+        assert workbook.sheetnames == ["주문상세", "품목목록"] and workbook["품목목록"].sheet_state == "hidden"
+        validations = {dv.type: dv for dv in workbook["주문상세"].data_validations.dataValidation}
+        assert validations["list"].formula1 == "'품목목록'!$A$2:$A$2"
+        assert str(validations["list"].sqref) == "A2:A1001"
+
+        test_db.add(ItemMaster(item_code="ITEM002", item_name="EV 모듈", lead_time_days=0, unit_price=Decimal("150000.00"), is_active="Y"))
+        test_db.commit()
+        updated = download_template(test_db, role="발주사")
+        assert updated is not template
+        assert [row[0] for row in load_workbook(BytesIO(updated))["품목목록"].iter_rows(min_row=2, values_only=True)] == ["ESS", "EV 모듈"]
+
+        plain = load_workbook(BytesIO(download_template(test_db, role="발주사", dropdowns=False)))
+        assert plain.sheetnames == ["주문상세"]
@@ -0,0 +1,90 @@
+"""
+데이터 내보내기 테스트
+"""
+import csv
+import io
+from datetime import date, datetime
+
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from database.archive import archive_closed_orders
+from database.models import OrderMaster, Warehouse, ArchivedOrderMaster, ArchivedWarehouse
+from database.seed_data import generate
+from database.write_queue import create_writer_engine
+from services.export_service import EXPORTS, get_export_headers, iter_export_rows
+from utils.export_handler import ExportTooLargeError, export_bytes, export_to_file
+
+
+def _seeded_session(tmp_path):
+    engine = create_writer_engine(f"sqlite:///{tmp_path / 'export.db'}")
+    generate(engine, 200, seed=5, customers=3, items=8, end_date=date(2025, 12, 31))
+    archive_closed_orders(engine, older_than_days=90, pause_s=0, now=datetime(2026, 1, 1))
+    return sessionmaker(bind=engine)()
+
+
+class TestExportRows:
+    """내보내기 행 조회 테스트"""
+
+    def test_includes_archived_rows_and_filters(self, tmp_path):
+        """보관된 주문을 포함하여 정렬된 행을 돌려주고, 기간/고객사 조건을 적용"""
+        db = _seeded_session(tmp_path)
+        try:
+            assert db.query(ArchivedOrderMaster).count() > 0
+            rows = list(iter_export_rows(db, "orders"))
+            assert len(rows) == db.query(OrderMaster).count() + db.query(ArchivedOrderMaster).count()
+            assert [row[0] for row in rows] == sorted(row[0] for row in rows)
+            assert len(rows[0]) == len(get_export_headers("orders"))
+            assert len(list(iter_export_rows(db, "orders", include_archived=False))) == db.query(OrderMaster).count()
+
+            customer = rows[0][3]
+            start, end = date(2025, 3, 1), date(2025, 5, 31)
+            receipts = list(iter_export_rows(db, "receipts", start_date=start, end_date=end, customer=customer))
+            expected = sum(
+                db.execute(select(func.count()).select_from(w).join(m, m.order_no == w.order_no).where(
+                    w.received_date.between(start, end), m.customer_company == customer)).scalar()
+                for m, w in ((OrderMaster, Warehouse), (ArchivedOrderMaster, ArchivedWarehouse))
+            )
+            assert len(receipts) == expected > 0
+            assert all(start <= row[0] <= end and row[4] == customer for row in receipts)
+        finally:
+            db.close()
+
+
+class TestExportFiles:
+    """CSV/xlsx 파일 작성 테스트"""
+
+    def test_csv_and_xlsx_have_same_rows(self, tmp_path):
+        """CSV는 UTF-8 BOM과 한글 헤더, xlsx는 데이터명 시트에 같은 행 수"""
+        db = _seeded_session(tmp_path)
+        try:
+            csv_file, xlsx_file = io.BytesIO(), io.BytesIO()
+            csv_count = export_to_file(csv_file, "order_lines", "csv", db=db)
+            xlsx_count = export_to_file(xlsx_file, "order_lines", "xlsx", db=db)
+        finally:
+            db.close()
+
+        assert csv_count == xlsx_count > 0
+        assert csv_file.getvalue().startswith(b"\xef\xbb\xbf")
+        csv_rows = list(csv.reader(io.StringIO(csv_file.getvalue().decode("utf-8-sig"))))
+        assert csv_rows[0] == get_export_headers("order_lines") and len(csv_rows) == csv_count + 1
+
+        sheet = load_workbook(xlsx_file, read_only=True).worksheets[0]
+        assert sheet.title == EXPORTS["order_lines"]["label"]
+        xlsx_rows = list(sheet.iter_rows(values_only=True))
+        assert len(xlsx_rows) == xlsx_count + 1
+        assert [row[0] for row in xlsx_rows[1:]] == [row[0] for row in csv_rows[1:]]
+
+    def test_download_row_limit(self, tmp_path):
+        """다운로드용 내보내기는 행 수 제한을 넘으면 파일을 만들지 않고 오류"""
+        db = _seeded_session(tmp_path)
+        try:
+            total = export_to_file(io.BytesIO(), "orders", "csv", db=db)
+            content = export_bytes("orders", "csv", db=db, max_rows=total)
+            assert len(content.decode("utf-8-sig").splitlines()) == total + 1
+            with pytest.raises(ExportTooLargeError):
+                export_bytes("orders", "csv", db=db, max_rows=total - 1)
+        finally:
+            db.close()
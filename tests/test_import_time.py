@@ -0,0 +1,65 @@
+"""
+import 비용 회귀 테스트
+무거운 라이브러리(pandas, openpyxl)가 필요한 시점에만 로드되는지 새 프로세스에서 확인합니다.
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["pandas", "openpyxl"]
+SERVICE_MODULES = [
+    "services.approval_service", "services.dashboard_service", "services.exceptions", "services.order_service",
+    "services.shipping_registration_service", "services.shipping_service", "services.warehousing_service",
+]
+# services.* import 예산 (데이터베이스 계층 import 이후 추가 비용, ms). 느린 환경에서는 환경 변수로 조정합니다.
+SERVICES_IMPORT_BUDGET_MS = float(os.environ.get("SCM_IMPORT_BUDGET_MS", "150"))
+
+
+def _loaded_after(code: str) -> list:
+    """새 프로세스에서 code를 실행한 뒤 로드된 무거운 모듈 목록"""
+    script = f"import sys, json\n{code}\nprint(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    output = subprocess.check_output([sys.executable, "-c", script], cwd=ROOT_DIR, text=True,
+                                     stderr=subprocess.DEVNULL)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+class TestLazyImports:
+    """지연 import 테스트"""
+
+    def test_app_startup_does_not_import_page_modules(self):
+        """로그인 화면 전에는 페이지 모듈과 pandas를 불러오지 않음"""
+        loaded = _loaded_after("import app\nassert not any(m.startswith('pages.page_') for m in sys.modules)")
+        assert loaded == []
+
+    def test_services_do_not_import_excel_libraries(self):
+        """services와 엑셀 처리 모듈을 import해도 pandas/openpyxl은 로드되지 않음"""
+        imports = "\n".join(f"import {name}" for name in SERVICE_MODULES + ["utils.excel_handler"])
+        assert _loaded_after(imports) == []
+
+    def test_excel_libraries_load_on_first_use(self):
+        """엑셀 함수를 실제로 호출하면 그때 pandas/openpyxl을 로드"""
+        loaded = _loaded_after("from io import BytesIO\nfrom services.order_service import process_excel_file\n"
+                               "process_excel_file(BytesIO(b'not an excel file'))")
+        assert loaded == HEAVY_MODULES
+
+    def test_services_import_budget(self):
+        """데이터베이스 계층 이후 services.* import 비용이 예산 이내 (3회 중 최솟값)"""
+        script = (
+            "import time\nimport database.connection\nt0 = time.perf_counter()\n"
+            + "\n".join(f"import {name}" for name in SERVICE_MODULES)
+            + "\nprint((time.perf_counter() - t0) * 1000)"
+        )
+        timings = [float(subprocess.check_output([sys.executable, "-c", script], cwd=ROOT_DIR, text=True,
+                                                 stderr=subprocess.DEVNULL).strip().splitlines()[-1])
+                   for _ in range(3)]
+        assert min(timings) < SERVICES_IMPORT_BUDGET_MS, f"services import {min(timings):.0f}ms (예산 {SERVICES_IMPORT_BUDGET_MS:.0f}ms)"
+
+    def test_pages_resolve_on_first_navigation(self):
+        """페이지 이름으로 show_page 함수를 찾음"""
+        from pages import PAGE_MODULES, load_page
+
+        for page_name in PAGE_MODULES:
+            assert callable(load_page(page_name))
+        assert load_page("없는페이지") is None
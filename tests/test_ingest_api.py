@@ -0,0 +1,179 @@
+"""
+주문 일괄 수신 API 테스트
+"""
+import base64
+import http.client
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from api import ingest_server
+from database.models import ItemMaster, OrderMaster, OrderDetail, ArchivedOrderMaster
+from services.ingest_service import validate_order_batch
+from services.order_service import create_orders_bulk
+
+CUSTOMER = {"user_id": "user001", "username": "samsung_sdi", "role": "발주사", "company_name": "삼성SDI"}
+TODAY = date(2026, 10, 19)
+
+
+@pytest.fixture
+def item_db(test_db):
+    test_db.add_all([
+        ItemMaster(item_code="ITEM001", item_name="ESS", lead_time_days=30, unit_price=Decimal("400000.00"), is_active="Y"),
+        ItemMaster(item_code="ITEM002", item_name="EV 모듈", lead_time_days=0, unit_price=Decimal("150000.00"), is_active="Y"),
+        ItemMaster(item_code="ITEM009", item_name="단종 품목", lead_time_days=0, unit_price=Decimal("1000.00"), is_active="N"),
+    ])
+    test_db.commit()
+    return test_db
+
+
+def _order(key, lines, **extra):
+    return {"idempotency_key": key, "order_date": TODAY.isoformat(), "lines": lines, **extra}
+
+
+class TestValidation:
+    """품목 마스터 기준 검증 테스트"""
+
+    def test_valid_orders_use_item_master(self, item_db):
+        """품목명/코드 모두 허용, 단가는 품목 마스터, 납품예정일 기본값은 납기일수 이후"""
+        valid, rejected = validate_order_batch(item_db, [
+            _order("A", [{"item_code": "ITEM001", "order_qty": 10}, {"item_name": "EV 모듈", "order_qty": 5}]),
+        ], today=TODAY)
+
+        assert rejected == {}
+        (index, order), = valid
+        assert index == 0 and order["order_type"] == "일반"
+        first, second = order["details"]
+        assert first["unit_price"] == 400000.0 and first["planned_shipping_date"] == date(2026, 11, 18)
+        assert second["item_code"] == "ITEM002" and second["planned_shipping_date"] == TODAY
+
+    def test_invalid_orders_rejected_with_messages(self, item_db):
+        """잘못된 주문만 거부하고 항목별 사유를 돌려줌"""
+        valid, rejected = validate_order_batch(item_db, [
+            _order("ok", [{"item_code": "ITEM002", "order_qty": 1}]),
+            _order("inactive", [{"item_code": "ITEM009", "order_qty": 1}]),
+            _order("qty", [{"item_code": "ITEM002", "order_qty": 0}, {"item_code": "ITEM002", "order_qty": "3"}]),
+            _order("early", [{"item_code": "ITEM001", "order_qty": 1, "planned_shipping_date": "2026-10-20"}]),
+            {"lines": [{"item_code": "ITEM002", "order_qty": 1}], "order_type": "특급"},
+        ], today=TODAY)
+
+        assert [index for index, _ in valid] == [0]
+        assert rejected[1] == ["항목 1: 등록되지 않았거나 사용하지 않는 품목코드입니다: ITEM009"]
+        assert rejected[2] == ["항목 1: EV 모듈: 수량은 0보다 커야 합니다.", "항목 2: EV 모듈: 주문수량은 정수여야 합니다."]
+        assert rejected[3] == ["항목 1: ESS: 납품예정일은 2026-11-18 이후여야 합니다."]
+        assert rejected[4] == ["멱등성 키(idempotency_key)를 입력해주세요.", "주문구분은 '긴급' 또는 '일반'이어야 합니다."]
+
+    def test_non_string_item_fields_rejected(self, item_db):
+        """품목코드/품목명이 문자열이 아니면 예외 없이 해당 주문만 거부"""
+        valid, rejected = validate_order_batch(item_db, [
+            _order("code", [{"item_code": ["ITEM001"], "order_qty": 1}]),
+            _order("name", [{"item_name": {"name": "ESS"}, "order_qty": 1}]),
+            _order("ok", [{"item_code": "ITEM002", "order_qty": 1}]),
+        ], today=TODAY)
+
+        assert [index for index, _ in valid] == [2]
+        assert rejected[0] == ["항목 1: item_code은(는) 문자열이어야 합니다."]
+        assert rejected[1] == ["항목 1: item_name은(는) 문자열이어야 합니다."]
+
+
+class TestBulkCreate:
+    """일괄 생성과 멱등성 테스트"""
+
+    def test_idempotent_bulk_create(self, item_db):
+        """같은 키는 기존 주문번호를 돌려주고, 보관된 주문번호 다음부터 채번"""
+        item_db.add(ArchivedOrderMaster(
+            order_no="ORD-2026-1000", order_date=TODAY, order_type="일반", customer_company="삼성SDI", status="출하완료",
+            priority=5, created_by="samsung_sdi", created_at=datetime(2026, 1, 1), version=1, archived_at=datetime.now(),
+        ))
+        item_db.commit()
+        valid, _ = validate_order_batch(item_db, [
+            _order("A", [{"item_code": "ITEM002", "order_qty": 3}]),
+            _order("B", [{"item_code": "ITEM002", "order_qty": 4}, {"item_code": "ITEM001", "order_qty": 1}]),
+            _order("A", [{"item_code": "ITEM002", "order_qty": 3}]),
+        ], today=TODAY)
+        orders = [order for _, order in valid]
+
+        first = create_orders_bulk(item_db, CUSTOMER, orders)
+        assert first == [("ORD-2026-1001", True), ("ORD-2026-1002", True), ("ORD-2026-1001", False)]
+        assert create_orders_bulk(item_db, CUSTOMER, orders[:2]) == [("ORD-2026-1001", False), ("ORD-2026-1002", False)]
+
+        assert item_db.query(OrderMaster).count() == 2
+        assert item_db.query(OrderDetail).filter_by(order_no="ORD-2026-1002").count() == 2
+        master = item_db.get(OrderMaster, "ORD-2026-1001")
+        assert master.status == "대기" and master.customer_company == "삼성SDI" and master.created_by == "samsung_sdi"
+
+    def test_huge_quantity_rejected_next_to_valid_order(self, item_db):
+        """SQLite 정수 범위를 넘는 수량은 검증에서 거부되어 같은 묶음의 정상 주문은 생성됨"""
+        valid, rejected = validate_order_batch(item_db, [
+            _order("ok", [{"item_code": "ITEM002", "order_qty": 2}]),
+            _order("huge", [{"item_code": "ITEM002", "order_qty": 10 ** 30}]),
+        ], today=TODAY)
+
+        assert rejected == {1: ["항목 1: EV 모듈: 주문수량은 1,000,000,000 이하여야 합니다."]}
+        created = create_orders_bulk(item_db, CUSTOMER, [order for _, order in valid])
+        assert [is_new for _, is_new in created] == [True]
+        assert item_db.query(OrderMaster).count() == 1
+
+
+class TestHttpEndpoint:
+    """HTTP 엔드포인트 테스트"""
+
+    def test_batch_request_round_trip(self, item_db, monkeypatch, caplog):
+        """인증 → 검증 → 생성 결과를 입력 순서대로 응답, 인증 실패와 잘못된 본문은 오류 코드"""
+        class _InlineWriter:
+            def execute(self, fn, *args, **kwargs):
+                return fn(item_db, *args, **kwargs)
+
+        monkeypatch.setattr(ingest_server, "SessionLocal", lambda: item_db)
+        monkeypatch.setattr(item_db, "close", lambda: None)
+        monkeypatch.setattr(ingest_server, "get_writer", lambda: _InlineWriter())
+        monkeypatch.setattr(ingest_server, "login", lambda username, password: (
+            (True, "로그인 성공", CUSTOMER) if password == "samsung123" else (False, "비밀번호가 일치하지 않습니다.", {})))
+
+        server = ingest_server.start_ingest_server("127.0.0.1", 0)
+        try:
+            def post(body, password="samsung123"):
+                conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+                auth = base64.b64encode(f"samsung_sdi:{password}".encode()).decode()
+                conn.request("POST", ingest_server.BATCH_PATH, body=body, headers={"Authorization": f"Basic {auth}"})
+                response = conn.getresponse()
+                try:
+                    return response.status, json.loads(response.read())
+                finally:
+                    conn.close()
+
+            payload = json.dumps({"orders": [
+                _order("X1", [{"item_code": "ITEM002", "order_qty": 2}]),
+                _order("X2", [{"item_code": "NOPE", "order_qty": 2}]),
+            ]}).encode("utf-8")
+            status, body = post(payload)
+            assert status == 200
+            assert (body["created"], body["duplicates"], body["rejected"]) == (1, 0, 1)
+            assert body["results"][0]["status"] == "created" and body["results"][0]["order_no"].startswith("ORD-2026-")
+            assert body["results"][1]["status"] == "rejected"
+
+            status, body = post(payload)
+            assert (status, body["created"], body["duplicates"]) == (200, 0, 1)
+
+            assert post(payload, password="wrong")[0] == 401
+            assert post(b"not json")[0] == 400
+
+            conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+            conn.putrequest("POST", ingest_server.BATCH_PATH)
+            conn.putheader("Content-Length", "-1")
+            conn.endheaders()
+            assert conn.getresponse().status == 400
+            conn.close()
+
+            # 내부 오류 내용은 서버 로그에만 남고 응답에는 일반 메시지만
+            def fail(user, payload):
+                raise RuntimeError("database path /srv/secret.db")
+            monkeypatch.setattr(ingest_server, "ingest_orders", fail)
+            status, body = post(payload)
+            assert status == 500 and "secret" not in body["error"]
+            assert "secret.db" in caplog.text
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,37 @@
+"""
+SQL 계측 테스트
+"""
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from database.instrumentation import install_query_instrumentation, normalize_statement, track_queries
+from database.models import Base, OrderDetail
+
+
+class TestSqlInstrumentation:
+    """쿼리 수집 및 N+1 탐지 테스트"""
+
+    def test_normalize_statement(self):
+        """리터럴과 IN 목록 길이가 달라도 같은 형태로 정규화"""
+        a = normalize_statement("SELECT * FROM order_detail WHERE order_no = 'ORD-2024-001' AND order_seq IN (?, ?)")
+        b = normalize_statement("SELECT *\n  FROM order_detail WHERE order_no = 'ORD-2024-002' AND order_seq IN (?, ?, ?, ?)")
+        assert a == b == "SELECT * FROM order_detail WHERE order_no = ? AND order_seq IN (?)"
+
+    def test_repeated_lookups_are_flagged(self):
+        """건별 반복 조회는 N+1로 표시되고, 블록 밖 쿼리는 수집되지 않음"""
+        engine = install_query_instrumentation(create_engine("sqlite://"))
+        Base.metadata.create_all(bind=engine)
+
+        with Session(bind=engine) as db:
+            with track_queries("테스트", log=False) as stats:
+                db.query(OrderDetail).all()
+                for seq in range(1, 7):
+                    db.query(OrderDetail.item_name).filter_by(order_no="ORD-2024-001", order_seq=seq).scalar()
+            db.query(OrderDetail).all()
+
+        assert stats.query_count == 7
+        assert stats.total_ms > 0
+        flagged = stats.flagged_shapes()
+        assert len(flagged) == 1
+        assert flagged[0][1] == 6
+        assert "order_detail.item_name" in flagged[0][0]
@@ -57,7 +57,10 @@ class TestCompleteOrderFlow:
         assert order.status == "승인"
         
         # 3. 입고 등록 (by 제조담당자)
-        receipt_items = [{"order_no": order_no, "order_seq": 1, **order_details_data[0]}]
+        receipt_items = [{
+            "order_no": order_no, "order_seq": 1, "item_code": "ITEM_INTEG_001", "item_name": "통합테스트품목",
+            "received_qty": 100, "received_date": date.today()
+        }]
         register_receipts(test_db, order, receipt_items, setup_users["manufacturer"]["username"])
         assert order.status == "입고완료"
         
@@ -0,0 +1,49 @@
+"""
+품목 캐시 테스트
+"""
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from database.models import ItemMaster
+from services.ingest_service import load_item_catalog
+from services.item_catalog import get_item_catalog, get_item_master_version
+from services.order_service import get_active_items
+from utils.excel_handler import load_item_lookup
+
+
+def _add_items(db):
+    db.add_all([
+        ItemMaster(item_code="ITEM002", item_name="EV 모듈", lead_time_days=0, unit_price=Decimal("150000.00"), is_active="Y"),
+        ItemMaster(item_code="ITEM001", item_name="ESS", lead_time_days=30, unit_price=Decimal("400000.00"), is_active="Y"),
+        ItemMaster(item_code="ITEM009", item_name="단종 품목", lead_time_days=0, unit_price=Decimal("1000.00"), is_active="N"),
+    ])
+    db.commit()
+
+
+class TestItemCatalog:
+    """버전 기반 품목 캐시 테스트"""
+
+    def test_shared_until_item_master_changes(self, test_db):
+        """버전이 같으면 같은 캐시를 공유하고, 품목 변경(ORM/직접 SQL) 시 다시 읽음"""
+        _add_items(test_db)
+        catalog = get_item_catalog(test_db)
+
+        assert [item.item_code for item in catalog.active] == ["ITEM001", "ITEM002"]
+        assert get_active_items(test_db) is catalog.active
+        assert load_item_catalog(test_db) == (catalog.by_code, catalog.by_name)
+        assert load_item_lookup(test_db) == {"ESS": {"item_code": "ITEM001", "unit_price": 400000.0},
+                                             "EV 모듈": {"item_code": "ITEM002", "unit_price": 150000.0}}
+        assert get_item_catalog(test_db) is catalog
+
+        version = get_item_master_version(test_db)
+        test_db.get(ItemMaster, "ITEM001").unit_price = Decimal("390000.00")
+        test_db.commit()
+        assert get_item_master_version(test_db) == version + 1
+        updated = get_item_catalog(test_db)
+        assert updated is not catalog and updated.by_code["ITEM001"].unit_price == Decimal("390000.00")
+
+        # 다른 프로세스나 도구가 직접 SQL로 바꾸어도 트리거가 버전을 올림
+        test_db.execute(text("UPDATE item_master SET is_active = 'Y' WHERE item_code = 'ITEM009'"))
+        test_db.commit()
+        assert "ITEM009" in get_item_catalog(test_db).by_code
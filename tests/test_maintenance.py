@@ -0,0 +1,124 @@
+"""
+백업 및 유지보수 작업 테스트
+"""
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+from database.maintenance import (
+    backup_database, vacuum_database, run_task, due_tasks, last_successful_runs,
+    acquire_lease, release_lease, run_due_tasks,
+)
+
+
+def _make_db(path, rows=2000):
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, payload TEXT)")
+    conn.executemany("INSERT INTO t (payload) VALUES (?)", [("x" * 500,) for _ in range(rows)])
+    conn.close()
+
+
+class TestBackup:
+    """온라인 백업 테스트"""
+
+    def test_backup_in_steps_while_writing(self, tmp_path):
+        """쓰기가 계속되는 동안에도 작은 단계로 백업을 완료하고 오래된 백업은 정리"""
+        db_path = str(tmp_path / "scm.db")
+        _make_db(db_path)
+        stop = threading.Event()
+
+        def writer():
+            conn = sqlite3.connect(db_path, timeout=5, isolation_level=None)
+            while not stop.is_set():
+                conn.execute("INSERT INTO t (payload) VALUES ('y')")
+            conn.close()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            result = backup_database(db_path, str(tmp_path / "backups"), pages_per_step=8, pause_s=0.001, keep=1)
+        finally:
+            stop.set()
+            thread.join()
+
+        assert result["integrity"] == "ok"
+        assert result["steps"] > 1 or result["single_pass"]
+        backup = sqlite3.connect(result["path"])
+        assert backup.execute("SELECT COUNT(*) FROM t").fetchone()[0] >= 2000
+        backup.close()
+        assert len(list((tmp_path / "backups").glob("scm_*.db"))) == 1
+
+
+class TestVacuum:
+    """incremental vacuum 테스트"""
+
+    def test_reclaims_free_pages(self, tmp_path):
+        """삭제로 생긴 빈 페이지를 반환하고 줄어든 크기를 기록"""
+        db_path = str(tmp_path / "scm.db")
+        _make_db(db_path)
+        conn = sqlite3.connect(db_path, isolation_level=None)
+        conn.execute("DELETE FROM t WHERE id > 100")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.close()
+
+        result = vacuum_database(db_path, pages_per_step=50)
+
+        assert result["steps"] > 1
+        assert result["freed_pages"] > 0
+        assert result["reclaimed_bytes"] > 0
+        assert result["file_size_after"] < result["file_size_before"]
+
+
+class TestScheduling:
+    """유지보수 기록과 실행 주기 테스트"""
+
+    def test_run_task_logs_duration_and_due_tasks(self, tmp_path):
+        """작업 결과를 기록하고, 주기가 지난 작업과 실패한 작업만 다시 실행 대상이 됨"""
+        db_path = str(tmp_path / "scm.db")
+        log_path = str(tmp_path / "maintenance.log")
+        _make_db(db_path, rows=10)
+
+        assert run_task("optimize", db_path, log_path)["ok"]
+        failed = run_task("analyze", str(tmp_path / "missing" / "none.db"), log_path)
+        assert not failed["ok"] and "error" in failed
+
+        with open(log_path, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f]
+        assert [e["task"] for e in entries] == ["optimize", "analyze"]
+        assert all("duration_ms" in e for e in entries)
+
+        last_runs = last_successful_runs(log_path)
+        schedule = {"optimize": 3600, "analyze": 3600}
+        assert due_tasks(datetime.now(), schedule, last_runs) == ["analyze"]
+        assert due_tasks(datetime.now() + timedelta(hours=2), schedule, last_runs) == ["optimize", "analyze"]
+
+    def test_lease_allows_one_process(self, tmp_path):
+        """유지보수 임대는 한 holder만 얻고, 해제하거나 만료되면 다른 holder가 얻음"""
+        db_path = str(tmp_path / "scm.db")
+        log_path = str(tmp_path / "maintenance.log")
+        _make_db(db_path, rows=10)
+
+        results = []
+        barrier = threading.Barrier(8)
+
+        def contend(n):
+            barrier.wait()
+            results.append(acquire_lease(db_path, f"holder-{n}"))
+
+        threads = [threading.Thread(target=contend, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results.count(True) == 1
+
+        winner = next(f"holder-{n}" for n in range(8) if acquire_lease(db_path, f"holder-{n}"))
+        assert run_due_tasks(db_path, log_path) == []  # 다른 프로세스가 실행 중이면 건너뜀
+        release_lease(db_path, winner)
+
+        assert acquire_lease(db_path, "a", lease_s=0)
+        assert acquire_lease(db_path, "b")  # 만료된 임대는 이어받음
+        assert not acquire_lease(db_path, "a")
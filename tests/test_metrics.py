@@ -0,0 +1,84 @@
+"""
+지표 레지스트리 및 내보내기 테스트
+"""
+import json
+import urllib.request
+from datetime import date
+
+import pytest
+
+from services.order_service import create_order
+from utils.metrics import MetricsRegistry, ORDERS_CREATED, SERVICE_DURATION, dump_json, start_http_exporter
+
+
+class TestMetricsRegistry:
+    """카운터/게이지/히스토그램 테스트"""
+
+    def test_prometheus_text_format(self):
+        """Prometheus 텍스트 형식으로 출력"""
+        registry = MetricsRegistry()
+        orders = registry.counter("test_orders_total", "주문 수", ["source"])
+        depth = registry.gauge("test_queue_depth", "큐 길이")
+        latency = registry.histogram("test_latency_seconds", "지연 시간", buckets=(0.1, 1.0))
+
+        orders.inc(source="web")
+        orders.inc(2, source="api")
+        depth.set_function(lambda: 7)
+        latency.observe(0.05)
+        latency.observe(0.5)
+
+        text = registry.render_prometheus()
+        assert "# TYPE test_orders_total counter" in text
+        assert 'test_orders_total{source="api"} 2' in text
+        assert 'test_orders_total{source="web"} 1' in text
+        assert "test_queue_depth 7" in text
+        assert 'test_latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'test_latency_seconds_bucket{le="+Inf"} 2' in text
+        assert "test_latency_seconds_count 2" in text
+
+        with pytest.raises(ValueError):
+            orders.inc(-1, source="web")
+        with pytest.raises(ValueError):
+            orders.inc()
+
+    def test_histogram_percentiles(self):
+        """버킷 보간으로 백분위수 추정"""
+        registry = MetricsRegistry()
+        latency = registry.histogram("test_p_seconds", "지연 시간", buckets=(1, 2, 3, 4))
+        for value in [0.5] * 50 + [3.5] * 50:
+            latency.observe(value)
+
+        assert latency.percentile(0.5) == pytest.approx(1.0)
+        assert 3 < latency.percentile(0.95) <= 4
+        assert registry.histogram("test_empty_seconds", "빈 히스토그램").percentile(0.5) is None
+
+    def test_http_endpoint_and_json_dump(self, tmp_path):
+        """HTTP 엔드포인트와 JSON 저장"""
+        registry = MetricsRegistry()
+        registry.counter("test_requests_total", "요청 수").inc(3)
+
+        server = start_http_exporter("127.0.0.1", 0, registry)
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics", timeout=5) as response:
+                body = response.read().decode("utf-8")
+                assert response.headers["Content-Type"].startswith("text/plain")
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert "test_requests_total 3" in body
+
+        path = tmp_path / "metrics.json"
+        dump_json(str(path), registry)
+        snapshot = json.loads(path.read_text(encoding="utf-8"))
+        assert snapshot["metrics"]["test_requests_total"]["values"] == {"": 3}
+
+    def test_services_record_metrics(self, test_db):
+        """주문 생성 시 주문 수와 서비스 실행 시간이 기록됨"""
+        before = ORDERS_CREATED.value(source="web")
+        create_order(test_db, {"username": "test_user"},
+                     {"order_date": date(2024, 1, 15), "order_type": "일반", "customer_company": "테스트회사"},
+                     [{"item_code": "ITEM001", "item_name": "테스트 품목", "order_qty": 10, "unit_price": 1000,
+                       "planned_shipping_date": None}])
+
+        assert ORDERS_CREATED.value(source="web") == before + 1
+        assert SERVICE_DURATION.percentile(0.5, function="create_order", outcome="ok") is not None
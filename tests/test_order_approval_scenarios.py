@@ -2,7 +2,9 @@ import pytest
 from datetime import date
 from services.order_service import create_order
 from services.approval_service import approve_order, reject_order, set_order_in_production
+from sqlalchemy.orm import Session
 from database.models import OrderMaster
+from services.exceptions import ConcurrencyConflictError
 
 class TestOrderApproval:
     """주문 승인 시나리오 테스트 (서비스 사용)"""
@@ -51,4 +53,19 @@ class TestOrderApproval:
         set_order_in_production(test_db, self.order)
         
         updated_order = test_db.query(OrderMaster).filter_by(order_no=self.order_no).first()
-        assert updated_order.status == "생산중"
\ No newline at end of file
+        assert updated_order.status == "생산중"
+
+    def test_concurrent_approval_conflict(self, test_db):
+        """다른 사용자가 먼저 처리한 주문을 승인하면 충돌 오류가 발생하는지 테스트"""
+        other_db = Session(bind=test_db.get_bind())
+        try:
+            other_order = other_db.query(OrderMaster).filter_by(order_no=self.order_no).first()
+            reject_order(other_db, other_order)
+        finally:
+            other_db.close()
+
+        with pytest.raises(ConcurrencyConflictError):
+            approve_order(test_db, self.order, priority=5, username="manager")
+
+        current = test_db.query(OrderMaster).filter_by(order_no=self.order_no).first()
+        assert current.status == "거부"
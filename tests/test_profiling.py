@@ -0,0 +1,98 @@
+"""
+페이지 실행 시간 기록 테스트
+"""
+import cProfile
+
+import pytest
+
+from utils import profiling
+
+
+class TestPageTiming:
+    """페이지 실행 시간 링 버퍼 테스트"""
+
+    def test_timing_recorded_even_when_page_aborts(self, monkeypatch):
+        """페이지가 예외로 중단되어도 실행 시간이 기록됨"""
+        monkeypatch.setattr(profiling, "_timings", profiling.deque(maxlen=3))
+
+        with profiling.record_page_timing("주문승인", "주문담당자"):
+            pass
+        with pytest.raises(RuntimeError):
+            with profiling.record_page_timing("주문승인", "주문담당자"):
+                raise RuntimeError("rerun")
+
+        summary = profiling.timing_summary()
+        assert len(summary) == 1
+        assert summary[0]["페이지"] == "주문승인"
+        assert summary[0]["횟수"] == 2
+
+    def test_ring_buffer_keeps_latest(self, monkeypatch):
+        """버퍼 크기를 넘으면 오래된 기록부터 버려짐"""
+        monkeypatch.setattr(profiling, "_timings", profiling.deque(maxlen=3))
+
+        for page in ["대시보드", "주문등록", "출하계획", "입고등록"]:
+            with profiling.record_page_timing(page, "발주사"):
+                pass
+
+        assert [page for _, page, _, _ in profiling.recent_timings()] == ["주문등록", "출하계획", "입고등록"]
+
+    def test_profile_result_contains_downloadable_stats(self):
+        """프로파일 결과에 요약 텍스트와 .prof 바이트가 포함됨"""
+        profiler = cProfile.Profile()
+        profiler.enable()
+        sorted(range(1000), reverse=True)
+        profiler.disable()
+
+        result = profiling._profile_result("대시보드", profiler, 1.5)
+
+        assert result["raw"]
+        assert "function calls" in result["summary"]
+        assert result["file_name"].startswith("profile_대시보드_") and result["file_name"].endswith(".prof")
+
+    def test_concurrent_profiling_runs_unprofiled(self, monkeypatch):
+        """다른 세션이 프로파일링 중이면 예외 없이 프로파일링하지 않고 실행"""
+        monkeypatch.setattr(profiling.st, "session_state", {})
+        calls = []
+
+        with profiling._profiler_lock:
+            profiling.run_profiled("대시보드", lambda: calls.append("page"))
+
+        assert calls == ["page"]
+        assert profiling._PROFILE_RESULT_KEY not in profiling.st.session_state
+
+        profiling.run_profiled("대시보드", lambda: calls.append("page"))
+        assert profiling.st.session_state[profiling._PROFILE_RESULT_KEY]["page"] == "대시보드"
+        assert not profiling._profiler_lock.locked()
+
+
+class TestOrderCardInstrumentation:
+    """주문 카드 프래그먼트 계측 테스트"""
+
+    def test_card_rerun_is_timed_and_tracked(self, monkeypatch):
+        """카드만 다시 실행되면 '<페이지> (카드)' 이름으로 실행 시간과 SQL 수집이 기록됨"""
+        from database import instrumentation
+        from utils import order_card
+
+        monkeypatch.setattr(profiling, "_timings", profiling.deque(maxlen=3))
+        monkeypatch.setattr(profiling.st, "session_state", {"current_page": "입고등록", "user": {"role": "제조담당자"}})
+        seen = []
+
+        order_card.run_instrumented(lambda: seen.append(instrumentation.current_query_stats().page))
+
+        assert seen == ["입고등록 (카드)"]
+        assert [(page, role) for _, page, role, _ in profiling.recent_timings()] == [("입고등록 (카드)", "제조담당자")]
+
+    def test_card_inside_page_run_is_not_recorded_twice(self, monkeypatch):
+        """페이지 전체 실행 중에 그리는 카드는 페이지 계측에만 포함됨"""
+        from database import instrumentation
+        from utils import order_card
+
+        monkeypatch.setattr(profiling, "_timings", profiling.deque(maxlen=3))
+        monkeypatch.setattr(profiling.st, "session_state", {"current_page": "입고등록"})
+        seen = []
+
+        with instrumentation.track_queries("입고등록", log=False) as stats:
+            order_card.run_instrumented(lambda: seen.append(instrumentation.current_query_stats()))
+
+        assert seen == [stats]
+        assert profiling.recent_timings() == []
@@ -0,0 +1,60 @@
+"""
+합성 데이터 생성기 테스트
+"""
+from datetime import date
+
+from sqlalchemy import create_engine, func, select
+
+from database.models import OrderMaster, OrderDetail, Warehouse, ShippingPlan
+from database.seed_data import generate
+
+END_DATE = date(2025, 12, 31)
+
+
+def _generate(tmp_path, name, orders=300, seed=7):
+    engine = create_engine(f"sqlite:///{tmp_path / name}")
+    counts = generate(engine, orders, seed=seed, customers=4, items=10, end_date=END_DATE)
+    return engine, counts
+
+
+class TestSeedData:
+    """합성 데이터 생성 테스트"""
+
+    def test_same_seed_generates_same_orders(self, tmp_path):
+        """같은 시드면 같은 주문/상세 데이터 생성"""
+        engine_a, counts_a = _generate(tmp_path, "a.db")
+        engine_b, counts_b = _generate(tmp_path, "b.db")
+
+        assert counts_a == counts_b
+        query = select(OrderMaster.order_no, OrderMaster.status, OrderMaster.customer_company, OrderDetail.item_code,
+                       OrderDetail.order_qty).join(OrderDetail).order_by(OrderDetail.order_no, OrderDetail.order_seq)
+        with engine_a.connect() as conn_a, engine_b.connect() as conn_b:
+            assert conn_a.execute(query).all() == conn_b.execute(query).all()
+
+    def test_balances_match_receipts_and_plans(self, tmp_path):
+        """상세의 입고/계획 수량이 입고 내역, 출하 계획 합계와 일치"""
+        engine, counts = _generate(tmp_path, "balance.db")
+        assert counts["order_master"] == 300
+
+        with engine.connect() as conn:
+            received = {(no, seq): qty for no, seq, qty in conn.execute(
+                select(Warehouse.order_no, Warehouse.order_seq, func.sum(Warehouse.received_qty))
+                .group_by(Warehouse.order_no, Warehouse.order_seq))}
+            planned = {(no, seq): qty for no, seq, qty in conn.execute(
+                select(ShippingPlan.order_no, ShippingPlan.order_seq, func.sum(ShippingPlan.planned_qty))
+                .group_by(ShippingPlan.order_no, ShippingPlan.order_seq))}
+            for detail in conn.execute(select(OrderDetail)).all():
+                key = (detail.order_no, detail.order_seq)
+                assert detail.received_qty == received.get(key, 0)
+                assert detail.planned_qty == planned.get(key, 0)
+                assert detail.planned_qty <= detail.received_qty <= detail.order_qty
+                assert detail.shipping_qty in (0, detail.order_qty)
+
+    def test_appends_after_existing_order_numbers(self, tmp_path):
+        """기존 데이터가 있으면 주문번호를 이어서 채번"""
+        engine, _ = _generate(tmp_path, "append.db", orders=100)
+        generate(engine, 100, seed=8, customers=4, items=10, end_date=END_DATE)
+
+        with engine.connect() as conn:
+            total, distinct = conn.execute(select(func.count(), func.count(OrderMaster.order_no.distinct()))).one()
+        assert total == distinct == 200
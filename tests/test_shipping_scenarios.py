@@ -3,7 +3,8 @@ from datetime import date
 from services.order_service import create_order
 from services.approval_service import approve_order
 from services.warehousing_service import register_receipts
-from services.shipping_service import create_shipping_plans
+from services.shipping_service import create_shipping_plans, get_item_inventory_status
+from services.exceptions import ConcurrencyConflictError
 from services.shipping_registration_service import confirm_shipment_received
 from database.models import OrderMaster, OrderDetail, ShippingPlan
 
@@ -83,4 +84,15 @@ class TestShippingScenarios:
         
         # Because the full amount was shipped, the order status should be "출하완료"
         updated_order = test_db.query(OrderMaster).filter_by(order_no=warehoused_order.order_no).first()
-        assert updated_order.status == "출하완료"
\ No newline at end of file
+        assert updated_order.status == "출하완료"
+
+    def test_shipping_plan_cannot_exceed_available(self, test_db, warehoused_order):
+        """가용재고를 초과하는 출하 계획은 충돌 오류로 거부되는지 테스트"""
+        create_shipping_plans(test_db, [{"order_no": warehoused_order.order_no, "order_seq": 1, "planned_qty": 150, "planned_date": date(2024, 12, 31)}], "manager_a")
+
+        # 가용재고 200을 기준으로 화면을 본 다른 담당자가 150개를 다시 계획하는 경우
+        with pytest.raises(ConcurrencyConflictError):
+            create_shipping_plans(test_db, [{"order_no": warehoused_order.order_no, "order_seq": 1, "planned_qty": 150, "planned_date": date(2024, 12, 31)}], "manager_b")
+
+        assert test_db.query(ShippingPlan).filter_by(order_no=warehoused_order.order_no).count() == 1
+        assert get_item_inventory_status(test_db, warehoused_order.order_no, 1)["available"] == 50
@@ -0,0 +1,42 @@
+"""
+느린 쿼리 로그 테스트
+"""
+from datetime import date
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from database.models import Base, OrderMaster
+from database.slow_query_log import install_slow_query_log, read_entries, redact_parameters, summarize
+from services.approval_service import get_orders_for_approval
+
+
+class TestSlowQueryLog:
+    """느린 쿼리 기록 및 요약 테스트"""
+
+    def test_redact_parameters(self):
+        """문자열은 길이만 남기고 숫자/날짜는 유지"""
+        assert redact_parameters(("samsung_sdi", 5, date(2024, 1, 15), None)) == ["<str:11>", 5, "2024-01-15", None]
+        assert redact_parameters([("a",), ("bb",)], executemany=True) == {"rows": 2, "first": ["<str:1>"]}
+
+    def test_records_plan_and_calling_service(self, tmp_path):
+        """임계값을 넘은 쿼리를 계획, 호출 서비스 함수와 함께 기록"""
+        log_path = str(tmp_path / "slow.log")
+        engine = install_slow_query_log(create_engine("sqlite://"), threshold_ms=0, log_path=log_path)
+        Base.metadata.create_all(bind=engine)
+
+        with Session(bind=engine) as db:
+            get_orders_for_approval(db, {"status": "대기", "order_type": "전체", "search_no": "ORD-2024"})
+            db.query(OrderMaster).filter(OrderMaster.order_no == "ORD-2024-001").all()
+
+        entries = list(read_entries(log_path))
+        approval = [e for e in entries if e["caller"] and "get_orders_for_approval" in e["caller"]]
+        assert approval
+        assert approval[0]["caller"].startswith("services/approval_service.py:get_orders_for_approval")
+        assert "<str:" in str(approval[0]["params"])
+        assert "ORD-2024" not in str(approval[0]["params"])
+        assert approval[0]["plan"]
+
+        groups = summarize(entries)
+        assert sum(g["count"] for g in groups) == len(entries)
+        assert [g["total_ms"] for g in groups] == sorted((g["total_ms"] for g in groups), reverse=True)
@@ -3,7 +3,8 @@ from datetime import date
 from services.order_service import create_order
 from services.approval_service import approve_order
 from services.warehousing_service import register_receipts
-from database.models import OrderMaster, Warehouse
+from database.models import OrderMaster, OrderDetail, Warehouse
+from services.exceptions import ConcurrencyConflictError
 
 class TestWarehouseRegistration:
     """입고 등록 시나리오 테스트 (서비스 사용)"""
@@ -72,4 +73,17 @@ class TestWarehouseRegistration:
         register_receipts(test_db, approved_order, receipts, "manufacturer")
         
         updated_order = test_db.query(OrderMaster).filter_by(order_no=approved_order.order_no).first()
-        assert updated_order.status == "입고완료"
\ No newline at end of file
+        assert updated_order.status == "입고완료"
+
+    def test_over_receipt_is_rejected(self, test_db, approved_order):
+        """주문수량을 초과하는 입고는 충돌 오류로 거부되고 아무것도 반영되지 않는지 테스트"""
+        receipts = [{"order_no": approved_order.order_no, "order_seq": 1, "item_code": "ITEM001", "item_name": "테스트 품목 1", "received_qty": 80, "received_date": date.today()}]
+        register_receipts(test_db, approved_order, receipts, "manufacturer")
+
+        # 다른 작업자가 잔량(20)을 보기 전의 화면에서 다시 80개를 입고하려는 경우
+        with pytest.raises(ConcurrencyConflictError):
+            register_receipts(test_db, approved_order, receipts, "manufacturer2")
+
+        detail = test_db.query(OrderDetail).filter_by(order_no=approved_order.order_no, order_seq=1).first()
+        assert detail.received_qty == 80
+        assert test_db.query(Warehouse).filter_by(order_no=approved_order.order_no).count() == 1
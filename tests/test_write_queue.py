@@ -0,0 +1,83 @@
+"""
+그룹 커밋 쓰기 큐 테스트
+"""
+import os
+import tempfile
+from datetime import date
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from database.models import Base, OrderMaster
+from database.write_queue import GroupCommitWriter, create_writer_engine
+from services.order_service import create_order
+
+ORDER_DATA = {"order_date": date(2024, 1, 15), "order_type": "일반", "customer_company": "테스트회사"}
+DETAILS = [{"item_code": "ITEM001", "item_name": "테스트 품목", "order_qty": 10, "unit_price": 1000, "planned_shipping_date": None}]
+
+
+@pytest.fixture
+def writer_env():
+    """임시 데이터베이스에 연결된 쓰기 큐"""
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    engine = create_writer_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    writer = GroupCommitWriter(session_factory=session_factory, window_ms=50, max_batch=32).start()
+    try:
+        yield writer, session_factory
+    finally:
+        writer.stop()
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.unlink(db_path + suffix)
+
+
+class TestGroupCommitWriter:
+    """그룹 커밋 쓰기 큐 테스트"""
+
+    def test_execute_returns_result(self, writer_env):
+        """작업 결과가 호출자에게 반환되고 커밋되는지 테스트"""
+        writer, session_factory = writer_env
+        order_no = writer.execute(create_order, {"username": "client"}, ORDER_DATA, DETAILS)
+
+        db = session_factory()
+        try:
+            assert db.get(OrderMaster, order_no) is not None
+        finally:
+            db.close()
+
+    def test_concurrent_commands_share_commit(self, writer_env):
+        """동시에 제출된 작업이 하나의 커밋으로 묶이고 주문번호가 중복되지 않는지 테스트"""
+        writer, session_factory = writer_env
+        futures = [writer.submit(create_order, {"username": f"client{i}"}, ORDER_DATA, DETAILS) for i in range(10)]
+        order_nos = [f.result(timeout=10) for f in futures]
+
+        assert len(set(order_nos)) == 10
+        assert writer.batches_committed < 10
+
+    def test_failed_command_does_not_affect_batch(self, writer_env):
+        """한 작업의 실패가 같은 배치의 다른 작업을 취소하지 않는지 테스트"""
+        writer, session_factory = writer_env
+
+        def failing_command(db):
+            db.add(OrderMaster(order_no="ORD-FAIL-001", order_date=date(2024, 1, 15), order_type="일반",
+                               customer_company="테스트회사", created_by="client"))
+            db.flush()
+            raise ValueError("검증 실패")
+
+        ok = writer.submit(create_order, {"username": "client"}, ORDER_DATA, DETAILS)
+        bad = writer.submit(failing_command)
+
+        assert ok.result(timeout=10).startswith("ORD-2024-")
+        with pytest.raises(ValueError, match="검증 실패"):
+            bad.result(timeout=10)
+
+        db = session_factory()
+        try:
+            assert db.get(OrderMaster, "ORD-FAIL-001") is None
+            assert db.query(OrderMaster).count() == 1
+        finally:
+            db.close()
@@ -0,0 +1,23 @@
+"""
+동시 작업 충돌 안내
+다른 사용자가 먼저 처리하여 작업이 반영되지 않은 경우, 최신 데이터로 페이지를 다시 그리고 안내 메시지를 표시합니다.
+"""
+import streamlit as st
+
+from utils.metrics import CONCURRENCY_CONFLICTS
+
+_NOTICE_KEY = "concurrency_conflict_notice"
+
+
+def reload_with_conflict_notice(error):
+    """충돌 메시지를 저장하고 페이지를 다시 실행하여 최신 수량/상태를 보여줍니다."""
+    CONCURRENCY_CONFLICTS.inc()
+    st.session_state[_NOTICE_KEY] = str(error)
+    st.rerun()
+
+
+def show_conflict_notice():
+    """직전 실행에서 저장된 충돌 메시지가 있으면 표시합니다. 각 페이지 상단에서 호출합니다."""
+    message = st.session_state.pop(_NOTICE_KEY, None)
+    if message:
+        st.warning(f"⚠️ {message}")
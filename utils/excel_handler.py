@@ -1,47 +1,46 @@
 """
 엑셀 업로드/다운로드 처리
+
+pandas와 openpyxl은 import 비용이 크므로 엑셀 함수가 실제로 호출될 때 함수 안에서 불러옵니다.
+주문 생성처럼 엑셀이 필요 없는 경로(테스트, 작업자, CLI)는 이 모듈을 import해도 pandas를 로드하지 않습니다.
+품목 정보는 공용 품목 캐시(services.item_catalog)에서 가져옵니다. DB 세션을 인자로 받으면 그 세션을 사용하고, 없으면 직접 열고 닫습니다.
+
+큰 업로드는 parse_excel_file_streaming으로 읽습니다. 업로드 내용을 임시 파일로 옮긴 뒤 openpyxl read-only 모드로
+행을 하나씩 읽어 EXCEL_CHUNK_ROWS 행씩 검증하므로, 시트 전체를 DataFrame으로 만들지 않습니다.
+CSV/TSV 파일(parse_csv_file)은 같은 컬럼 규칙을 사용하며 pandas C 파서로 CSV_CHUNK_ROWS 행씩 읽습니다.
 """
-import pandas as pd
-from datetime import datetime
-from pathlib import Path
+import codecs
+import os
+import shutil
+import tempfile
+import threading
+from io import BytesIO
+from config import EXCEL_CHUNK_ROWS, CSV_CHUNK_ROWS, UPLOAD_SPOOL_DIR, TEMPLATE_ITEM_DROPDOWN, TEMPLATE_VALIDATION_ROWS
 from utils.validators import (
     validate_item_name, validate_qty, validate_unit_price
 )
-from decimal import Decimal
-from database.connection import get_db, close_db
-from database.models import ItemMaster
+from services.item_catalog import get_item_catalog
+from utils.metrics import CACHE_REQUESTS
+
+
+TEMPLATE_HEADERS = ["품목명", "주문수량", "단가(참고용)", "납품예정일"]  # 단가는 참고용으로만 표시, 실제로는 품목 마스터의 단가 사용
+TEMPLATE_SAMPLE_ROWS = 5
 
-# streamlit은 선택적 import (테스트 환경에서는 필요 없음)
-try:
-    import streamlit as st
-except ImportError:
-    st = None
 
+def _template_rows(catalog) -> list:
+    """템플릿 예시 행 (활성 품목 앞 5개, 납품예정일은 선택사항이라 비워 둠)"""
+    items = catalog.active[:TEMPLATE_SAMPLE_ROWS]
+    if items:
+        return [[item.item_name, 100, float(item.unit_price), ""] for item in items]
+    return [["ESS (Energy Storage System)", 100, 400000.00, ""], ["EV 모듈 (Electric Vehicle Module)", 100, 150000.00, ""]]
 
-def create_order_template():
+
+def create_order_template(db=None):
     """주문 엑셀 템플릿 생성"""
-    # 품목 마스터에서 활성 품목 조회
-    db = get_db()
-    try:
-        items = db.query(ItemMaster).filter(ItemMaster.is_active == "Y").order_by(ItemMaster.item_name).limit(5).all()
-        if items:
-            item_names = [item.item_name for item in items]
-            unit_prices = [float(item.unit_price) for item in items]
-        else:
-            item_names = ["ESS (Energy Storage System)", "EV 모듈 (Electric Vehicle Module)"]
-            unit_prices = [400000.00, 150000.00]
-    finally:
-        close_db(db)
-    
-    template_data = {
-        "품목명": item_names,
-        "주문수량": [100] * len(item_names),
-        "단가(참고용)": unit_prices,  # 참고용으로만 표시, 실제로는 품목 마스터의 단가 사용
-        "납품예정일": [""] * len(item_names)  # 선택사항
-    }
-    
-    df = pd.DataFrame(template_data)
-    return df
+    import pandas as pd
+
+    # 품목 마스터에서 활성 품목 조회 (공용 품목 캐시)
+    return pd.DataFrame(_template_rows(get_item_catalog(db)), columns=TEMPLATE_HEADERS)
 
 
 def save_template_file(file_path: str):
@@ -51,125 +50,440 @@ def save_template_file(file_path: str):
     return file_path
 
 
-def parse_excel_file(uploaded_file) -> tuple[bool, list, str]:
+REQUIRED_COLUMNS = ["품목명", "주문수량"]  # 품목코드와 단가는 제외 - 품목 마스터에서 관리
+
+
+def load_item_lookup(db=None) -> dict:
+    """활성 품목의 품목명 → {품목코드, 단가} (엑셀 행 검증용, 공용 품목 캐시의 dict이므로 수정하지 마세요)"""
+    return get_item_catalog(db).price_lookup
+
+
+_INT64_LIMIT = 2 ** 63  # 주문수량 배열(int64)에 담을 수 있는 범위
+
+
+def _int_or_none(value):
+    """int() 변환, 숫자가 아니거나 무한대/int64 범위 밖이면 None (주문수량 컬럼이 문자열/혼합 타입일 때)"""
+    try:
+        number = int(value)
+    except (ValueError, TypeError, OverflowError):
+        return None
+    return number if -_INT64_LIMIT <= number < _INT64_LIMIT else None
+
+
+def _float_or_nan(value):
+    """float() 변환, 비어 있거나 숫자가 아니면 NaN (단가 컬럼이 문자열/혼합 타입일 때)"""
+    import pandas as pd
+
+    if pd.isna(value):
+        return float("nan")
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return float("nan")
+
+
+def _parse_planned_date(value):
+    """납품예정일 셀 하나를 변환합니다. Returns: (날짜 또는 None, 형식 오류 여부)"""
+    import pandas as pd
+
+    if not pd.notna(value):
+        return None, False
+    try:
+        if isinstance(value, str):
+            return pd.to_datetime(value).date(), False
+        return (value.date() if hasattr(value, 'date') else None), False
+    except Exception:
+        return None, True
+
+
+def _planned_dates(column) -> tuple[list, list]:
+    """납품예정일 컬럼 변환. 날짜 타입 컬럼은 한 번에, 그 외에는 서로 다른 값마다 한 번씩만 변환합니다."""
+    import pandas as pd
+
+    if pd.api.types.is_datetime64_any_dtype(column):
+        dates = [None if pd.isna(value) else value for value in column.dt.date.tolist()]
+        return dates, [False] * len(dates)
+
+    parsed = {}
+    dates, invalid = [], []
+    for value in column.tolist():
+        try:
+            result = parsed[value]
+        except KeyError:
+            result = parsed[value] = _parse_planned_date(value)
+        except TypeError:  # 해시할 수 없는 값
+            result = _parse_planned_date(value)
+        dates.append(result[0])
+        invalid.append(result[1])
+    return dates, invalid
+
+
+def validate_order_rows(df, item_dict: dict) -> tuple[list, list]:
+    """
+    주문 상세 행 검증 및 변환 (엑셀 업로드, 드롭 폴더 수신 공통 규칙)
+    Returns: ([(엑셀 행 번호, 주문상세)], [(엑셀 행 번호, 에러메시지)])
+    단가 불일치처럼 경고만 하는 행은 주문상세와 에러메시지 양쪽에 나타납니다.
+
+    행마다 검증 함수를 호출하지 않고 컬럼 단위로 검증합니다. 각 행은 품목명 → 품목 마스터 → 주문수량 순서로
+    처음 실패한 검증의 메시지만 받고, 통과한 행만 단가 불일치 경고와 납품예정일 형식 검사를 받습니다.
+    """
+    import numpy as np
+    import pandas as pd
+
+    row_nums = (np.asarray(df.index) + 2).tolist()  # 엑셀 행 번호 (헤더 제외)
+    errors = []  # (행 위치, 같은 행 안의 순서, 메시지)
+
+    # 품목명 검증 및 품목 마스터 조회
+    names = df["품목명"]
+    names = names.astype(str).str.strip().where(names.notna(), "")
+    blank = (names == "").to_numpy()
+    known = names.isin(list(item_dict)).to_numpy() & ~blank
+    errors += [(pos, 0, "품목명을 입력해주세요.") for pos in np.flatnonzero(blank)]
+    errors += [(pos, 0, f"등록되지 않은 품목명입니다: {names.iat[pos]}") for pos in np.flatnonzero(~blank & ~known)]
+
+    # 주문수량: 정수 변환(소수는 버림), 숫자가 아니면 오류, 0 이하이면 오류
+    positions = np.flatnonzero(known)
+    qty_column = df["주문수량"].iloc[positions]
+    if pd.api.types.is_integer_dtype(qty_column):
+        qty = qty_column.to_numpy(dtype=np.int64)
+        is_number = np.ones(len(qty), dtype=bool)
+    elif pd.api.types.is_float_dtype(qty_column):
+        values = qty_column.to_numpy(dtype=float)
+        is_number = np.isfinite(values) & (np.abs(values) < _INT64_LIMIT)
+        qty = np.where(is_number, values, 0).astype(np.int64)
+    else:
+        converted = [_int_or_none(value) for value in qty_column.tolist()]
+        is_number = np.array([value is not None for value in converted], dtype=bool)
+        qty = np.array([value if value is not None else 0 for value in converted], dtype=np.int64)
+    errors += [(pos, 0, "주문수량은 숫자여야 합니다.") for pos in positions[~is_number]]
+    errors += [(pos, 0, "수량은 0보다 커야 합니다.") for pos in positions[is_number & (qty <= 0)]]
+
+    valid = is_number & (qty > 0)
+    positions, qty = positions[valid], qty[valid]
+    valid_names = names.iloc[positions].tolist()
+    unit_prices = np.array([item_dict[name]["unit_price"] for name in valid_names], dtype=float)
+
+    # 엑셀에 단가 컬럼이 있으면 경고만 표시 (품목 마스터의 단가를 사용)
+    if "단가" in df.columns:
+        price_column = df["단가"].iloc[positions]
+        if pd.api.types.is_numeric_dtype(price_column) and not pd.api.types.is_bool_dtype(price_column):
+            excel_prices = price_column.to_numpy(dtype=float)
+        else:
+            excel_prices = np.array([_float_or_nan(value) for value in price_column.tolist()], dtype=float)
+        mismatch = np.flatnonzero(np.abs(excel_prices - unit_prices) > 0.01)
+        errors += [
+            (positions[i], 1, f"엑셀의 단가({float(excel_prices[i]):,.0f})는 무시되고 품목 마스터의 단가({float(unit_prices[i]):,.0f})가 사용됩니다.")
+            for i in mismatch
+        ]
+
+    # 납품예정일 처리 (선택사항, "출하예정일" 컬럼도 지원 - 하위 호환성)
+    date_column = "납품예정일" if "납품예정일" in df.columns else "출하예정일" if "출하예정일" in df.columns else None
+    if date_column:
+        planned_dates, invalid_dates = _planned_dates(df[date_column].iloc[positions])
+        errors += [(positions[i], 2, "납품예정일 형식이 올바르지 않습니다.") for i in np.flatnonzero(invalid_dates)]
+    else:
+        planned_dates = [None] * len(positions)
+
+    order_details = [
+        (row_nums[pos], {
+            "item_code": item_dict[name]["item_code"],
+            "item_name": name,
+            "order_qty": order_qty,
+            "unit_price": float(unit_price),
+            "planned_shipping_date": planned_date,
+        })
+        for pos, name, order_qty, unit_price, planned_date in zip(
+            positions.tolist(), valid_names, qty.tolist(), unit_prices.tolist(), planned_dates)
+    ]
+    errors.sort(key=lambda error: (error[0], error[1]))
+    return order_details, [(row_nums[pos], message) for pos, _, message in errors]
+
+
+def _summarize_parse(order_details: list, row_errors: list) -> tuple[bool, list, str]:
+    errors = [f"행 {row_num}: {message}" for row_num, message in row_errors]
+    if errors:
+        error_message = "\n".join(errors)
+        if order_details:
+            error_message = f"일부 데이터에 오류가 있습니다:\n{error_message}"
+        return len(order_details) > 0, order_details, error_message
+
+    if len(order_details) == 0:
+        return False, [], "주문 상세 데이터가 없습니다."
+
+    return True, order_details, ""
+
+
+def parse_excel_file(uploaded_file, db=None) -> tuple[bool, list, str]:
     """
     엑셀 파일 파싱
     Returns: (성공여부, 주문상세리스트, 에러메시지)
     """
+    import pandas as pd
+
     try:
         # 엑셀 파일 읽기
         df = pd.read_excel(uploaded_file, engine='openpyxl')
         
-        # 필수 컬럼 확인 (품목코드와 단가는 제외 - 품목 마스터에서 관리)
-        required_columns = ["품목명", "주문수량"]
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        # 필수 컬럼 확인
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
         
         if missing_columns:
             return False, [], f"필수 컬럼이 누락되었습니다: {', '.join(missing_columns)}"
         
         # 품목 마스터 조회 (품목명으로 품목코드와 단가 찾기)
-        db = get_db()
-        try:
-            items = db.query(ItemMaster).filter(ItemMaster.is_active == "Y").all()
-            item_dict = {item.item_name: {"item_code": item.item_code, "unit_price": float(item.unit_price)} for item in items}
-        finally:
-            close_db(db)
+        item_dict = load_item_lookup(db)
         
         # 데이터 검증 및 변환
-        order_details = []
-        errors = []
+        rows, row_errors = validate_order_rows(df, item_dict)
+        return _summarize_parse([detail for _, detail in rows], row_errors)
         
-        for idx, row in df.iterrows():
-            row_num = idx + 2  # 엑셀 행 번호 (헤더 제외)
-            
-            # 품목명 검증 및 품목코드 찾기
-            item_name = str(row["품목명"]).strip() if pd.notna(row["품목명"]) else ""
-            is_valid, error_msg = validate_item_name(item_name)
-            if not is_valid:
-                errors.append(f"행 {row_num}: {error_msg}")
-                continue
-            
-            # 품목 마스터에서 품목코드와 단가 찾기
-            if item_name not in item_dict:
-                errors.append(f"행 {row_num}: 등록되지 않은 품목명입니다: {item_name}")
+    except Exception as e:
+        return False, [], f"엑셀 파일 처리 중 오류 발생: {str(e)}"
+
+
+def spool_upload(uploaded_file, suffix: str = ".xlsx") -> str:
+    """업로드 파일 내용을 1MB씩 임시 파일로 복사하고 경로를 반환합니다. 파일 삭제는 호출한 쪽에서 합니다."""
+    uploaded_file.seek(0)
+    with tempfile.NamedTemporaryFile(suffix=suffix, dir=UPLOAD_SPOOL_DIR, delete=False) as spool:
+        shutil.copyfileobj(uploaded_file, spool, length=1024 * 1024)
+    return spool.name
+
+
+def _sheet_cell_value(cell):
+    """pd.read_excel(engine='openpyxl')과 같은 셀 값 변환 (빈 셀 → "", 정수인 숫자 → int)"""
+    import numpy as np
+    from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+
+    if cell.value is None:
+        return ""
+    if cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC:
+        value = int(cell.value)
+        return value if value == cell.value else float(cell.value)
+    return cell.value
+
+
+def iter_excel_chunks(path: str, chunk_rows: int = EXCEL_CHUNK_ROWS):
+    """
+    첫 번째 시트를 chunk_rows 행씩 DataFrame으로 읽습니다.
+    Yields: (DataFrame, 지금까지 읽은 행 수, 시트의 전체 행 수 또는 None)
+    DataFrame의 인덱스는 pd.read_excel로 시트 전체를 읽었을 때와 같으므로(빈 행은 건너뜀) 행 번호가 일치합니다.
+    """
+    from openpyxl import load_workbook
+    from pandas.io.parsers import TextParser
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        total_rows = sheet.max_row
+        sheet.reset_dimensions()
+
+        header, rows, rows_read, offset = None, [], 0, 0
+        blank_rows = 0  # 빈 행은 뒤에 데이터 행이 나올 때만 포함 (시트 끝의 빈 행은 제외)
+
+        def to_frame():
+            df = TextParser([header] + rows, header=0, skip_blank_lines=False).read()
+            df.index = df.index + offset
+            return df
+
+        for row in sheet.rows:
+            values = [_sheet_cell_value(cell) for cell in row]
+            while values and values[-1] == "":
+                values.pop()
+            if header is None:
+                header = values
                 continue
-            
-            item_code = item_dict[item_name]["item_code"]
-            unit_price = item_dict[item_name]["unit_price"]  # 품목 마스터의 단가 사용
-            
-            # 주문수량 검증
-            try:
-                order_qty = int(row["주문수량"])
-                is_valid, error_msg = validate_qty(order_qty)
-                if not is_valid:
-                    errors.append(f"행 {row_num}: {error_msg}")
-                    continue
-            except (ValueError, TypeError):
-                errors.append(f"행 {row_num}: 주문수량은 숫자여야 합니다.")
+            if not values:
+                blank_rows += 1
                 continue
-            
-            # 엑셀에 단가 컬럼이 있으면 경고만 표시 (품목 마스터의 단가를 사용)
-            if "단가" in df.columns and pd.notna(row["단가"]):
-                excel_unit_price = None
-                try:
-                    excel_unit_price = float(row["단가"])
-                except (ValueError, TypeError):
-                    pass
-                
-                if excel_unit_price is not None and abs(excel_unit_price - unit_price) > 0.01:
-                    errors.append(f"행 {row_num}: 엑셀의 단가({excel_unit_price:,.0f})는 무시되고 품목 마스터의 단가({unit_price:,.0f})가 사용됩니다.")
-            
-            # 납품예정일 처리 (선택사항)
-            planned_shipping_date = None
-            # "출하예정일" 또는 "납품예정일" 컬럼 모두 지원 (하위 호환성)
-            date_column = None
-            if "납품예정일" in df.columns:
-                date_column = "납품예정일"
-            elif "출하예정일" in df.columns:
-                date_column = "출하예정일"
-            
-            if date_column and pd.notna(row[date_column]):
-                try:
-                    if isinstance(row[date_column], str):
-                        planned_shipping_date = pd.to_datetime(row[date_column]).date()
-                    else:
-                        planned_shipping_date = row[date_column].date() if hasattr(row[date_column], 'date') else None
-                except:
-                    errors.append(f"행 {row_num}: 납품예정일 형식이 올바르지 않습니다.")
-            
-            order_detail = {
-                "item_code": item_code,
-                "item_name": item_name,
-                "order_qty": order_qty,
-                "unit_price": float(unit_price),
-                "planned_shipping_date": planned_shipping_date
-            }
-            
-            order_details.append(order_detail)
-        
-        if errors:
-            error_message = "\n".join(errors)
-            if order_details:
-                error_message = f"일부 데이터에 오류가 있습니다:\n{error_message}"
-            return len(order_details) > 0, order_details, error_message
-        
-        if len(order_details) == 0:
-            return False, [], "주문 상세 데이터가 없습니다."
-        
-        return True, order_details, ""
-        
+            rows.extend([[""] * len(header) for _ in range(blank_rows)])
+            rows.append((values + [""] * (len(header) - len(values)))[:len(header)])
+            rows_read += blank_rows + 1
+            blank_rows = 0
+            if len(rows) >= chunk_rows:
+                df = to_frame()
+                yield df, rows_read, total_rows
+                offset += len(df)
+                rows = []
+        if header and (rows or offset == 0):
+            yield to_frame(), rows_read, total_rows
+    finally:
+        workbook.close()
+
+
+def parse_excel_file_streaming(uploaded_file, db=None, chunk_rows: int = EXCEL_CHUNK_ROWS, progress=None) -> tuple[bool, list, str]:
+    """
+    큰 엑셀 파일 파싱 (parse_excel_file과 같은 결과와 메시지)
+    업로드 내용을 임시 파일로 옮기고 시트를 chunk_rows 행씩 읽어 검증하므로, 메모리 사용량이 시트 크기에 비례하지 않습니다.
+    progress(읽은 행 수, 전체 행 수 또는 None)는 청크마다 호출됩니다.
+    Returns: (성공여부, 주문상세리스트, 에러메시지)
+    """
+    path = None
+    try:
+        path = spool_upload(uploaded_file)
+        item_dict = None
+        order_details, row_errors = [], []
+        for df, rows_read, total_rows in iter_excel_chunks(path, chunk_rows):
+            if item_dict is None:
+                missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+                if missing_columns:
+                    return False, [], f"필수 컬럼이 누락되었습니다: {', '.join(missing_columns)}"
+                item_dict = load_item_lookup(db)
+
+            rows, errors = validate_order_rows(df, item_dict)
+            order_details.extend(detail for _, detail in rows)
+            row_errors.extend(errors)
+            if progress:
+                progress(rows_read, total_rows)
+
+        if item_dict is None:
+            return False, [], f"필수 컬럼이 누락되었습니다: {', '.join(REQUIRED_COLUMNS)}"
+        return _summarize_parse(order_details, row_errors)
+
     except Exception as e:
         return False, [], f"엑셀 파일 처리 중 오류 발생: {str(e)}"
+    finally:
+        if path:
+            os.unlink(path)
 
 
-def download_template():
-    """템플릿 파일 다운로드용 바이트 반환"""
-    df = create_order_template()
-    from io import BytesIO
+CSV_ENCODINGS = ("utf-8-sig", "cp949")  # 엑셀에서 "CSV UTF-8" 또는 기본 "CSV"로 저장한 파일
+CSV_SAMPLE_BYTES = 1024 * 1024
+
+
+def detect_csv_encoding(sample: bytes) -> str:
+    """파일 앞부분으로 인코딩 판별 (UTF-8로 읽히면 UTF-8, 아니면 CP949)"""
+    for encoding in CSV_ENCODINGS:
+        try:
+            # 샘플 끝에서 잘린 멀티바이트 문자는 오류로 보지 않음
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    raise ValueError("파일 인코딩을 확인할 수 없습니다 (UTF-8 또는 CP949).")
+
+
+def csv_separator(file_name: str) -> str:
+    """확장자가 .tsv/.tab이면 탭, 그 외에는 쉼표"""
+    return "\t" if os.path.splitext(file_name or "")[1].lower() in (".tsv", ".tab") else ","
+
+
+def iter_csv_chunks(source, sep: str = ",", chunk_rows: int = CSV_CHUNK_ROWS):
+    """
+    CSV/TSV 파일을 chunk_rows 행씩 DataFrame으로 읽습니다 (pandas C 파서). source는 파일 경로 또는 바이너리 파일 객체입니다.
+    Yields: (DataFrame, 지금까지 읽은 행 수). 인덱스는 파일 전체 기준이므로 행 번호(인덱스 + 2)가 이어집니다.
+    품목명과 날짜 컬럼은 문자열로 읽어 "001" 같은 품목명이 숫자로 바뀌지 않게 합니다.
+    """
+    import pandas as pd
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            sample = f.read(CSV_SAMPLE_BYTES)
+    else:
+        source.seek(0)
+        sample = source.read(CSV_SAMPLE_BYTES)
+        source.seek(0)
+    encoding = detect_csv_encoding(sample)
+
+    rows_read = 0
+    text_columns = {"품목명": str, "납품예정일": str, "출하예정일": str}
+    with pd.read_csv(source, sep=sep, encoding=encoding, engine="c", chunksize=chunk_rows, dtype=text_columns) as reader:
+        for df in reader:
+            rows_read += len(df)
+            yield df, rows_read
+
+
+def parse_csv_file(uploaded_file, db=None, sep: str = None, chunk_rows: int = CSV_CHUNK_ROWS, progress=None) -> tuple[bool, list, str]:
+    """
+    CSV/TSV 파일 파싱 (엑셀과 같은 컬럼과 검증 규칙, UTF-8/CP949 자동 판별)
+    sep를 생략하면 파일 이름의 확장자로 정합니다. progress(읽은 행 수, None)는 청크마다 호출됩니다.
+    Returns: (성공여부, 주문상세리스트, 에러메시지)
+    """
+    import pandas as pd
+
+    if sep is None:
+        sep = csv_separator(getattr(uploaded_file, "name", ""))
+    try:
+        item_dict = None
+        order_details, row_errors = [], []
+        for df, rows_read in iter_csv_chunks(uploaded_file, sep, chunk_rows):
+            if item_dict is None:
+                missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+                if missing_columns:
+                    return False, [], f"필수 컬럼이 누락되었습니다: {', '.join(missing_columns)}"
+                item_dict = load_item_lookup(db)
+
+            rows, errors = validate_order_rows(df, item_dict)
+            order_details.extend(detail for _, detail in rows)
+            row_errors.extend(errors)
+            if progress:
+                progress(rows_read, None)
+
+        return _summarize_parse(order_details, row_errors)
+
+    except pd.errors.EmptyDataError:
+        return False, [], f"필수 컬럼이 누락되었습니다: {', '.join(REQUIRED_COLUMNS)}"
+    except Exception as e:
+        return False, [], f"CSV 파일 처리 중 오류 발생: {str(e)}"
+
+
+_template_cache = {}  # (역할, 드롭다운 여부) -> (품목 캐시, 템플릿 바이트)
+_template_lock = threading.Lock()
+
+
+def _build_template_bytes(catalog, dropdowns: bool) -> bytes:
+    """템플릿 xlsx 작성. dropdowns이면 숨김 시트의 품목 목록으로 품목명 드롭다운과 주문수량(양의 정수) 검증을 넣습니다."""
+    from openpyxl import Workbook
+    from openpyxl.worksheet.datavalidation import DataValidation
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "주문상세"
+    sheet.append(TEMPLATE_HEADERS)
+    for row in _template_rows(catalog):
+        sheet.append([value if value != "" else None for value in row])
+
+    if dropdowns and catalog.active:
+        last_row = TEMPLATE_VALIDATION_ROWS + 1
+        item_sheet = workbook.create_sheet("품목목록")
+        item_sheet.sheet_state = "hidden"
+        item_sheet.append(["품목명"])
+        for item in catalog.active:
+            item_sheet.append([item.item_name])
+
+        item_validation = DataValidation(
+            type="list", formula1=f"'품목목록'!$A$2:$A${len(catalog.active) + 1}", allow_blank=True,
+            showErrorMessage=True, errorTitle="품목명", error="품목 마스터에 등록된 품목명을 선택해주세요.",
+        )
+        qty_validation = DataValidation(
+            type="whole", operator="greaterThan", formula1="0", allow_blank=True,
+            showErrorMessage=True, errorTitle="주문수량", error="주문수량은 0보다 큰 정수여야 합니다.",
+        )
+        sheet.add_data_validation(item_validation)
+        sheet.add_data_validation(qty_validation)
+        item_validation.add(f"A2:A{last_row}")
+        qty_validation.add(f"B2:B{last_row}")
+
     output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='주문상세')
-    output.seek(0)
+    workbook.save(output)
     return output.getvalue()
 
 
+def download_template(db=None, role: str = None, dropdowns: bool = TEMPLATE_ITEM_DROPDOWN):
+    """
+    템플릿 파일 다운로드용 바이트 반환
+    품목 마스터 버전(공용 품목 캐시)과 역할별로 한 번만 만들고, 이후에는 메모리에 보관한 바이트를 돌려줍니다.
+    """
+    catalog = get_item_catalog(db)
+    key = (role, dropdowns)
+    cached = _template_cache.get(key)
+    if cached and cached[0] is catalog:
+        CACHE_REQUESTS.inc(cache="order_template", result="hit")
+        return cached[1]
+
+    CACHE_REQUESTS.inc(cache="order_template", result="miss")
+    template = _build_template_bytes(catalog, dropdowns)
+    with _template_lock:
+        _template_cache[key] = (catalog, template)
+    return template
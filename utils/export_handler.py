@@ -0,0 +1,131 @@
+"""
+주문/입고/출하 데이터 내보내기 (CSV, xlsx)
+
+services.export_service.iter_export_rows가 DB 커서에서 조금씩 가져온 행을 받는 대로 파일에 씁니다.
+CSV는 엑셀에서 한글이 깨지지 않도록 UTF-8(BOM)으로 쓰고, xlsx는 openpyxl write-only 모드를 사용하므로
+내보내는 행 수와 관계없이 메모리 사용량이 일정합니다.
+단, 대시보드 다운로드 버튼은 Streamlit이 완성된 파일 전체를 메모리에 올려 전송하므로
+config.EXPORT_DOWNLOAD_MAX_ROWS행까지만 허용하며, 그보다 많은 행은 아래 CLI로 파일을 만듭니다.
+
+실행:
+    python -m utils.export_handler orders --format csv --start 2026-01-01 --end 2026-03-31 -o orders.csv
+    python -m utils.export_handler receipts --format xlsx --customer 삼성SDI -o receipts.xlsx
+"""
+import argparse
+import csv
+import io
+import tempfile
+from datetime import date
+
+from config import EXPORT_FETCH_ROWS, EXPORT_DOWNLOAD_MAX_ROWS
+from database.connection import get_db, close_db
+from services.export_service import EXPORTS, get_export_headers, iter_export_rows
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+class ExportTooLargeError(ValueError):
+    """다운로드 버튼으로 내보내기에는 행이 너무 많음"""
+
+
+def _limit_rows(rows, max_rows: int):
+    for count, row in enumerate(rows, 1):
+        if count > max_rows:
+            raise ExportTooLargeError(
+                f"내보낼 행이 {max_rows:,}행을 넘습니다. 기간을 줄이거나 python -m utils.export_handler로 파일을 만드세요.")
+        yield row
+
+
+def write_csv(file, headers: list, rows) -> int:
+    """바이너리 파일에 CSV(UTF-8 BOM)로 씁니다. 쓴 행 수를 반환합니다."""
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        writer = csv.writer(text)
+        writer.writerow(headers)
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        text.flush()
+        return count
+    finally:
+        text.detach()
+
+
+def write_xlsx(file, headers: list, rows, sheet_title: str = "Sheet1") -> int:
+    """바이너리 파일에 xlsx로 씁니다 (write-only 모드). 쓴 행 수를 반환합니다."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_title)
+    sheet.append(headers)
+    count = 0
+    for row in rows:
+        sheet.append(row)
+        count += 1
+    workbook.save(file)
+    return count
+
+
+def export_to_file(file, name: str, fmt: str = "csv", db=None, max_rows: int = None, **filters) -> int:
+    """
+    내보내기 name을 fmt 형식으로 file에 씁니다. filters는 iter_export_rows의 조건입니다. 쓴 행 수를 반환합니다.
+    max_rows를 주면 그보다 행이 많을 때 ExportTooLargeError를 발생시킵니다.
+    """
+    owns_session = db is None
+    if owns_session:
+        db = get_db()
+    try:
+        rows = iter_export_rows(db, name, **filters)
+        if max_rows is not None:
+            rows = _limit_rows(rows, max_rows)
+        headers = get_export_headers(name)
+        if fmt == "xlsx":
+            return write_xlsx(file, headers, rows, sheet_title=EXPORTS[name]["label"])
+        return write_csv(file, headers, rows)
+    finally:
+        if owns_session:
+            close_db(db)
+
+
+def export_bytes(name: str, fmt: str = "csv", db=None, max_rows: int = EXPORT_DOWNLOAD_MAX_ROWS, **filters) -> bytes:
+    """
+    다운로드 버튼용 내보내기 파일 내용
+    Streamlit은 다운로드 데이터(호출 가능한 data의 반환값 포함)를 bytes로 바꿔 메모리에 보관하므로 파일 전체가
+    메모리에 올라갑니다. 그래서 max_rows(기본 config.EXPORT_DOWNLOAD_MAX_ROWS)행을 넘으면 ExportTooLargeError를 발생시킵니다.
+    파일은 임시 파일에 먼저 쓰므로, DB 조회와 파일 작성 중에는 행 전체를 메모리에 두지 않습니다.
+    """
+    with tempfile.TemporaryFile() as f:
+        export_to_file(f, name, fmt, db=db, max_rows=max_rows, **filters)
+        f.seek(0)
+        return f.read()
+
+
+def export_file_name(name: str, fmt: str, start_date: date = None, end_date: date = None) -> str:
+    period = f"_{start_date:%Y%m%d}-{end_date:%Y%m%d}" if start_date and end_date else ""
+    return f"{EXPORTS[name]['label']}{period}.{fmt}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="주문/입고/출하 데이터 내보내기")
+    parser.add_argument("name", choices=list(EXPORTS), help="내보낼 데이터")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--start", type=date.fromisoformat, help="시작일 (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, help="종료일 (YYYY-MM-DD)")
+    parser.add_argument("--customer", help="고객사")
+    parser.add_argument("--no-archived", action="store_true", help="보관된 주문 제외")
+    parser.add_argument("-o", "--output", help="저장할 파일 경로 (기본: 데이터명_기간.형식)")
+    args = parser.parse_args()
+
+    output = args.output or export_file_name(args.name, args.format, args.start, args.end)
+    with open(output, "wb") as f:
+        count = export_to_file(f, args.name, args.format, start_date=args.start, end_date=args.end,
+                               customer=args.customer, include_archived=not args.no_archived)
+    print(f"{EXPORTS[args.name]['label']} {count:,}행 → {output} (커서에서 {EXPORT_FETCH_ROWS:,}행씩 조회)")
+
+
+if __name__ == "__main__":
+    main()
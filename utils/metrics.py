@@ -0,0 +1,376 @@
+"""
+지표(metrics) 수집 및 내보내기
+
+서비스와 페이지가 기록하는 카운터, 게이지, 히스토그램을 프로세스 전역 레지스트리에 모으고
+Prometheus 텍스트 형식의 HTTP 엔드포인트(백그라운드 스레드)와 주기적인 JSON 파일로 내보냅니다.
+외부 라이브러리 없이 표준 라이브러리만 사용합니다.
+
+사용:
+    from utils.metrics import ORDERS_CREATED, track_duration
+    ORDERS_CREATED.inc()
+
+    @track_duration("create_order")
+    def create_order(...): ...
+"""
+import bisect
+import functools
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import (
+    METRICS_HTTP_ENABLED, METRICS_HTTP_HOST, METRICS_HTTP_PORT,
+    METRICS_JSON_PATH, METRICS_JSON_INTERVAL_S,
+)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_key(labelnames, labels: dict) -> tuple:
+    if set(labels) != set(labelnames):
+        raise ValueError(f"레이블이 올바르지 않습니다: {sorted(labels)} (필요: {list(labelnames)})")
+    return tuple(str(labels[name]) for name in labelnames)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames, key, extra=()) -> str:
+    pairs = list(zip(labelnames, key)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _samples(self):
+        """(이름 접미사, 레이블 키, 추가 레이블, 값) 목록"""
+        raise NotImplementedError
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, key, extra, value in self._samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(self.labelnames, key, extra)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """단조 증가 카운터 (이름은 _total로 끝나도록 짓습니다)"""
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        if amount < 0:
+            raise ValueError("카운터는 감소할 수 없습니다.")
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(self.labelnames, labels), 0)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        if not items and not self.labelnames:
+            items = [((), 0)]
+        return [("", key, (), value) for key, value in items]
+
+    def snapshot(self):
+        with self._lock:
+            return {",".join(key) or "": value for key, value in sorted(self._values.items())}
+
+
+class Gauge(_Metric):
+    """임의로 오르내리는 값. 함수를 등록하면 수집할 때마다 값을 읽습니다."""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._functions = {}
+
+    def set(self, value: float, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, fn, **labels):
+        """수집 시점에 fn()을 호출하여 값을 읽습니다 (예: 쓰기 큐 길이)."""
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._functions[key] = fn
+
+    def _current(self) -> dict:
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, fn in functions.items():
+            try:
+                values[key] = fn()
+            except Exception:
+                continue
+        return values
+
+    def value(self, **labels) -> float:
+        return self._current().get(_label_key(self.labelnames, labels), 0)
+
+    def _samples(self):
+        return [("", key, (), value) for key, value in sorted(self._current().items())]
+
+    def snapshot(self):
+        return {",".join(key) or "": value for key, value in sorted(self._current().items())}
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램. 버킷으로부터 백분위수(p50/p95/p99)를 추정합니다."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = _label_key(self.labelnames, labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            state["counts"][index] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    def _states(self):
+        with self._lock:
+            return {key: {"counts": list(s["counts"]), "sum": s["sum"], "count": s["count"]}
+                    for key, s in sorted(self._values.items())}
+
+    def percentile(self, q: float, **labels):
+        """버킷 경계 사이를 선형 보간한 백분위수 추정값 (관측값이 없으면 None)"""
+        state = self._states().get(_label_key(self.labelnames, labels))
+        return self._estimate(state, q) if state else None
+
+    def _estimate(self, state, q: float):
+        if not state["count"]:
+            return None
+        rank = q * state["count"]
+        cumulative = 0
+        lower = 0.0
+        for bound, count in zip(self.buckets, state["counts"]):
+            if count and cumulative + count >= rank:
+                if bound == math.inf:
+                    return lower
+                return lower + (bound - lower) * (rank - cumulative) / count
+            cumulative += count
+            lower = bound if bound != math.inf else lower
+        return lower
+
+    def _samples(self):
+        samples = []
+        for key, state in self._states().items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, state["counts"]):
+                cumulative += count
+                samples.append(("_bucket", key, (("le", _format_value(bound)),), cumulative))
+            samples.append(("_sum", key, (), state["sum"]))
+            samples.append(("_count", key, (), state["count"]))
+        return samples
+
+    def snapshot(self):
+        return {
+            ",".join(key) or "": {
+                "count": state["count"],
+                "sum": round(state["sum"], 6),
+                "p50": self._estimate(state, 0.50),
+                "p95": self._estimate(state, 0.95),
+                "p99": self._estimate(state, 0.99),
+            }
+            for key, state in self._states().items()
+        }
+
+
+class MetricsRegistry:
+    """이름으로 지표를 등록하고 한 번에 내보내는 레지스트리 (같은 이름을 다시 등록하면 기존 지표 반환)"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, documentation, labelnames=(), **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"이미 다른 종류로 등록된 지표입니다: {name}")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "metrics": {m.name: {"type": m.kind, "labels": list(m.labelnames), "values": m.snapshot()} for m in metrics},
+        }
+
+
+REGISTRY = MetricsRegistry()
+
+# --- 애플리케이션 지표 ---
+ORDERS_CREATED = REGISTRY.counter("scm_orders_created_total", "생성된 주문 수", ["source"])
+ORDER_LINES_CREATED = REGISTRY.counter("scm_order_lines_created_total", "생성된 주문 상세 수")
+RECEIPTS_REGISTERED = REGISTRY.counter("scm_receipts_registered_total", "등록된 입고 건수")
+RECEIPT_QTY = REGISTRY.counter("scm_receipt_qty_total", "입고 수량 합계")
+SHIPPING_PLANS_CREATED = REGISTRY.counter("scm_shipping_plans_created_total", "생성된 출하 계획 수")
+SHIPMENTS_CONFIRMED = REGISTRY.counter("scm_shipments_confirmed_total", "출하 완료 처리된 계획 수")
+ORDER_DECISIONS = REGISTRY.counter("scm_order_decisions_total", "주문 승인/거부/생산 전환 건수", ["decision"])
+CONCURRENCY_CONFLICTS = REGISTRY.counter("scm_concurrency_conflicts_total", "동시 작업 충돌로 거절된 작업 수")
+CACHE_REQUESTS = REGISTRY.counter("scm_cache_requests_total", "캐시 조회 수", ["cache", "result"])
+CHANGE_NOTIFICATIONS = REGISTRY.counter("scm_change_notifications_total", "다른 연결(프로세스)의 커밋으로 감지한 테이블 변경 수",
+                                        ["table"])
+DB_LOCK_ERRORS = REGISTRY.counter("scm_db_lock_errors_total", "잠금 대기 시간 초과(database is locked) 오류 수")
+DB_LOCK_WAIT = REGISTRY.histogram("scm_db_lock_wait_seconds", "쓰기 잠금(BEGIN IMMEDIATE) 획득 대기 시간")
+WRITE_QUEUE_DEPTH = REGISTRY.gauge("scm_write_queue_depth", "그룹 커밋 쓰기 큐의 대기 작업 수")
+WRITE_BATCH_SIZE = REGISTRY.histogram("scm_write_batch_size", "그룹 커밋 한 번에 묶인 작업 수",
+                                      buckets=(1, 2, 4, 8, 16, 32, 64, 128))
+SERVICE_DURATION = REGISTRY.histogram("scm_service_duration_seconds", "서비스 함수 실행 시간", ["function", "outcome"])
+PAGE_RENDER_DURATION = REGISTRY.histogram("scm_page_render_seconds", "페이지 렌더링 시간", ["page", "role"])
+MAINTENANCE_DURATION = REGISTRY.histogram("scm_maintenance_duration_seconds", "백업/유지보수 작업 실행 시간",
+                                          ["task", "outcome"], buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 300, 900))
+PASSWORD_VERIFY_DURATION = REGISTRY.histogram("scm_password_verify_seconds", "로그인 비밀번호 검증 시간 (스레드 풀 대기 포함)",
+                                              ["outcome"])
+PASSWORD_REHASHES = REGISTRY.counter("scm_password_rehashes_total", "비용 설정 변경으로 다시 해싱한 비밀번호 수")
+MAINTENANCE_RECLAIMED_BYTES = REGISTRY.counter("scm_maintenance_reclaimed_bytes_total", "유지보수로 반환한 디스크 공간 (bytes)")
+
+
+def track_duration(function_name: str):
+    """서비스 함수 실행 시간을 성공/실패로 나누어 SERVICE_DURATION에 기록하는 데코레이터"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = fn(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                SERVICE_DURATION.observe(time.perf_counter() - started, function=function_name, outcome=outcome)
+        return wrapper
+    return decorator
+
+
+# --- 내보내기 ---
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_exporter(host: str = METRICS_HTTP_HOST, port: int = METRICS_HTTP_PORT, registry: MetricsRegistry = REGISTRY):
+    """Prometheus 텍스트 형식 엔드포인트를 데몬 스레드에서 시작하고 서버를 반환합니다."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="scm-metrics-http", daemon=True).start()
+    return server
+
+
+def dump_json(path: str = METRICS_JSON_PATH, registry: MetricsRegistry = REGISTRY):
+    """현재 지표를 JSON 파일로 저장합니다 (임시 파일에 쓴 뒤 교체)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(registry.snapshot(), f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _json_dump_loop(path: str, interval_s: float):
+    while True:
+        time.sleep(interval_s)
+        try:
+            dump_json(path)
+        except OSError:
+            continue
+
+
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+def start_metrics_exporters():
+    """
+    HTTP 엔드포인트와 주기적 JSON 저장을 프로세스당 한 번만 시작합니다. app.main에서 매 실행마다 호출해도 됩니다.
+    포트를 이미 다른 프로세스가 사용 중이면 HTTP 엔드포인트는 건너뜁니다.
+    """
+    global _exporters_started
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+        if METRICS_HTTP_ENABLED:
+            try:
+                start_http_exporter()
+            except OSError:
+                pass
+        if METRICS_JSON_INTERVAL_S:
+            threading.Thread(target=_json_dump_loop, args=(METRICS_JSON_PATH, METRICS_JSON_INTERVAL_S),
+                             name="scm-metrics-json", daemon=True).start()
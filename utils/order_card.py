@@ -0,0 +1,81 @@
+"""
+주문 카드 프래그먼트 도우미
+작업 목록의 주문 카드를 st.fragment로 그리면, 카드 안의 폼을 제출해도 페이지 전체가 아니라 해당 카드만 다시 실행됩니다.
+카드는 주문번호만 받아 자신의 데이터를 직접 조회하므로 제출 한 번의 비용이 목록 길이와 무관합니다.
+카드만 다시 실행될 때는 app.main의 페이지 계측을 거치지 않으므로, order_card_fragment가 같은 계측
+(실행 시간, SQL 수집, 프로파일링)을 "<페이지> (카드)" 이름으로 적용합니다.
+"""
+import functools
+
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+from auth.auth import get_current_user
+from database.instrumentation import current_query_stats, track_queries
+from utils.profiling import record_page_timing, run_profiled, should_profile_rerun
+
+_NOTICE_KEY = "order_card_notice_{}"
+_PAGE_NOTICE_KEY = "order_card_page_notice"
+
+
+def order_card_fragment(func):
+    """
+    st.fragment와 같지만, 카드만 다시 실행될 때도 페이지 실행과 같은 계측을 적용합니다.
+    페이지 전체 실행 중에 그리는 카드는 이미 app.main의 계측에 포함되므로 그대로 실행합니다.
+    """
+    @functools.wraps(func)
+    def instrumented(*args, **kwargs):
+        run_instrumented(functools.partial(func, *args, **kwargs))
+
+    return st.fragment(instrumented)
+
+
+def run_instrumented(card_function):
+    """카드 함수를 실행 시간 기록, SQL 수집, (요청 시) 프로파일링으로 감싸 실행합니다."""
+    if current_query_stats() is not None:
+        card_function()
+        return
+
+    page = f"{st.session_state.get('current_page', '대시보드')} (카드)"
+    with record_page_timing(page, get_current_user().get("role", "")):
+        with track_queries(page):
+            if should_profile_rerun():
+                run_profiled(page, card_function)
+            else:
+                card_function()
+
+
+def rerun_card(order_no, message=None):
+    """
+    처리 결과 메시지를 남기고 카드만 다시 그립니다.
+    프래그먼트 밖(페이지 전체 실행 중)이면 페이지를 다시 실행하고, 주문이 목록에서 빠져도 보이도록 메시지를 페이지 상단에 표시합니다.
+    """
+    try:
+        if message:
+            st.session_state[_NOTICE_KEY.format(order_no)] = message
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.session_state.pop(_NOTICE_KEY.format(order_no), None)
+        if message:
+            st.session_state[_PAGE_NOTICE_KEY] = message
+        st.rerun()
+
+
+def show_page_notice():
+    """페이지 전체를 다시 실행한 경우의 처리 결과 메시지를 표시합니다. 각 페이지 상단에서 호출합니다."""
+    message = st.session_state.pop(_PAGE_NOTICE_KEY, None)
+    if message:
+        st.success(message)
+
+
+def show_card_notice(order_no):
+    """직전 카드 실행에서 남긴 처리 결과 메시지를 표시합니다."""
+    message = st.session_state.pop(_NOTICE_KEY.format(order_no), None)
+    if message:
+        st.success(message)
+
+
+def show_card_closed(order_no, status):
+    """처리가 끝나 작업 목록에서 빠진 주문의 카드 (페이지를 다시 불러오면 목록에서 사라짐)"""
+    show_card_notice(order_no)
+    st.caption(f"✅ {order_no}: 처리 완료 (현재 상태: {status or '보관됨'})")
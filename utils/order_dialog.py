@@ -7,7 +7,6 @@ from database.connection import get_db, close_db
 from services.approval_service import get_order_details
 from services.warehousing_service import get_detailed_receipt_status, get_receipt_history
 from services.shipping_service import get_item_inventory_status, get_shipping_plans_for_order
-from database.models import OrderDetail
 
 
 def show_order_detail_modal(order_no):
@@ -95,11 +94,12 @@ def check_and_render_dialog():
         # 출하 계획/상태 정보 조회 및 변환
         shipping_plans = get_shipping_plans_for_order(db, order_no)
         shipping_plans_data = []
+        # 품목명은 이미 조회한 상세(보관된 주문 포함)에서 가져옵니다.
+        item_names = {detail["order_seq"]: detail["item_name"] for detail in details_data}
         plan_details_map = {}
         if shipping_plans:
             for plan in shipping_plans:
-                detail = db.query(OrderDetail).filter_by(order_no=plan.order_no, order_seq=plan.order_seq).first()
-                plan_details_map[(plan.order_no, plan.order_seq)] = detail.item_name if detail else "N/A"
+                plan_details_map[(plan.order_no, plan.order_seq)] = item_names.get(plan.order_seq, "N/A")
                 shipping_plans_data.append({
                     "order_no": plan.order_no,
                     "order_seq": plan.order_seq,
@@ -2,17 +2,20 @@
 주문 관련 유틸리티 함수
 """
 from datetime import datetime
+from sqlalchemy import Integer, cast, func
 from database.connection import get_db, close_db
-from database.models import OrderMaster
+from database.models import OrderMaster, ArchivedOrderMaster
 
 
-def generate_order_no(order_date=None) -> str:
+def generate_order_no(order_date=None, db=None) -> str:
     """
     주문번호 자동 생성
     형식: ORD-YYYY-NNN (예: ORD-2024-001)
     
     Args:
         order_date: 주문일자 (datetime.date 객체), None이면 오늘 날짜 사용
+        db: 사용할 데이터베이스 세션. 지정하면 같은 트랜잭션에서 아직 커밋되지 않은
+            주문번호까지 고려하여 채번합니다. None이면 새 세션을 엽니다.
     
     Returns:
         생성된 주문번호 문자열
@@ -20,39 +23,30 @@ def generate_order_no(order_date=None) -> str:
     if order_date is None:
         order_date = datetime.now().date()
     
-    year = order_date.strftime("%Y")
+    year_prefix = f"ORD-{order_date.year}-"
     
-    # 해당 연도의 주문 번호 조회
-    db = get_db()
+    owns_session = db is None
+    if owns_session:
+        db = get_db()
     try:
-        # 해당 연도로 시작하는 주문번호 찾기
-        year_prefix = f"ORD-{year}-"
-        existing_orders = db.query(OrderMaster).filter(
-            OrderMaster.order_no.like(f"{year_prefix}%")
-        ).order_by(OrderMaster.order_no.desc()).all()
-        
-        # 다음 순번 결정
-        if existing_orders:
-            # 가장 큰 번호 찾기
-            max_num = 0
-            for order in existing_orders:
-                try:
-                    # ORD-YYYY-NNN 형식에서 NNN 추출
-                    num_part = order.order_no.split("-")[-1]
-                    num = int(num_part)
-                    if num > max_num:
-                        max_num = num
-                except (ValueError, IndexError):
-                    continue
-            
-            next_num = max_num + 1
-        else:
-            next_num = 1
-        
-        # 3자리 숫자로 포맷팅
-        order_no = f"{year_prefix}{next_num:03d}"
-        
-        return order_no
+        # 3자리 숫자로 포맷팅 (999건을 넘으면 자릿수가 늘어남)
+        return f"{year_prefix}{last_order_seq(db, order_date.year) + 1:03d}"
     finally:
-        close_db(db)
+        if owns_session:
+            close_db(db)
 
+
+def last_order_seq(db, year: int) -> int:
+    """
+    해당 연도에 마지막으로 발급된 주문번호의 일련번호 (없으면 0)
+    일련번호는 3자리를 넘을 수 있으므로 문자열이 아닌 숫자로 최댓값을 구하며,
+    보관된 주문의 번호도 다시 쓰지 않도록 보관 테이블까지 확인합니다.
+    """
+    prefix = f"ORD-{year}-"
+    last = 0
+    for model in (OrderMaster, ArchivedOrderMaster):
+        value = db.query(func.max(cast(func.substr(model.order_no, len(prefix) + 1), Integer))).filter(
+            model.order_no >= prefix, model.order_no < f"ORD-{year}."
+        ).scalar()
+        last = max(last, value or 0)
+    return last
@@ -0,0 +1,158 @@
+"""
+페이지 실행 시간 기록 및 요청 시 프로파일링
+
+app.main의 페이지 호출마다 페이지/역할별 실행 시간을 고정 크기 링 버퍼에 기록하고,
+관리자(config.PROFILING_ADMIN_USERS) 또는 설정(config.PROFILE_EVERY_RERUN)으로 요청된 재실행 한 번을
+cProfile로 수집하여 다운로드할 수 있게 합니다. 재배포 없이 운영 중인 느린 페이지를 분석하기 위한 도구입니다.
+"""
+import cProfile
+import io
+import os
+import pstats
+import statistics
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import streamlit as st
+
+from config import PAGE_TIMING_BUFFER_SIZE, PROFILE_EVERY_RERUN, PROFILING_ADMIN_USERS
+from utils.metrics import PAGE_RENDER_DURATION
+
+_PROFILE_REQUEST_KEY = "profile_next_rerun"
+_PROFILE_RESULT_KEY = "last_profile"
+
+_timings = deque(maxlen=PAGE_TIMING_BUFFER_SIZE)
+_timings_lock = threading.Lock()
+
+# 파이썬 3.12부터 프로세스 안에서 프로파일러는 하나만 활성화할 수 있습니다 (두 번째 enable()은 ValueError).
+_profiler_lock = threading.Lock()
+
+
+@contextmanager
+def record_page_timing(page: str, role: str):
+    """블록 실행 시간을 (시각, 페이지, 역할, ms)로 링 버퍼에 기록합니다. st.rerun()으로 중단되어도 기록됩니다."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with _timings_lock:
+            _timings.append((datetime.now(), page, role, elapsed_ms))
+        PAGE_RENDER_DURATION.observe(elapsed_ms / 1000, page=page, role=role)
+
+
+def recent_timings() -> list:
+    """링 버퍼에 남아 있는 기록 (오래된 순)"""
+    with _timings_lock:
+        return list(_timings)
+
+
+def timing_summary() -> list:
+    """페이지/역할별 실행 횟수, 중앙값, p95, 최댓값 (ms) 목록"""
+    groups = {}
+    for _, page, role, elapsed_ms in recent_timings():
+        groups.setdefault((page, role), []).append(elapsed_ms)
+
+    summary = []
+    for (page, role), values in sorted(groups.items()):
+        values.sort()
+        summary.append({
+            "페이지": page,
+            "역할": role,
+            "횟수": len(values),
+            "중앙값 ms": round(statistics.median(values), 1),
+            "p95 ms": round(values[min(len(values) - 1, int(len(values) * 0.95))], 1),
+            "최대 ms": round(values[-1], 1),
+        })
+    return summary
+
+
+def is_profiling_admin(user: dict) -> bool:
+    return user.get("username") in PROFILING_ADMIN_USERS
+
+
+def should_profile_rerun() -> bool:
+    """이번 재실행을 프로파일링할지 여부 (요청 플래그는 한 번 사용하면 지워집니다)"""
+    requested = st.session_state.pop(_PROFILE_REQUEST_KEY, False)
+    return requested or PROFILE_EVERY_RERUN
+
+
+def run_profiled(page: str, page_function):
+    """
+    페이지 함수를 cProfile로 실행하고 결과를 세션에 저장합니다.
+    다른 세션이 이미 프로파일링 중이면 이번 실행은 프로파일링 없이 실행하고 안내를 표시합니다.
+    """
+    if not _profiler_lock.acquire(blocking=False):
+        st.info("다른 세션에서 프로파일링 중이어서 이번 실행은 프로파일링하지 않았습니다.")
+        page_function()
+        return
+
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    try:
+        try:
+            profiler.enable()
+        except ValueError:
+            # 다른 도구의 프로파일러가 활성화되어 있는 경우
+            st.info("다른 프로파일러가 실행 중이어서 이번 실행은 프로파일링하지 않았습니다.")
+            page_function()
+            return
+        try:
+            page_function()
+        finally:
+            profiler.disable()
+            st.session_state[_PROFILE_RESULT_KEY] = _profile_result(page, profiler, (time.perf_counter() - started) * 1000)
+    finally:
+        _profiler_lock.release()
+
+
+def _profile_result(page: str, profiler: cProfile.Profile, elapsed_ms: float) -> dict:
+    text = io.StringIO()
+    pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(40)
+
+    # pstats는 파일로만 저장할 수 있으므로 임시 파일을 거쳐 바이트로 읽습니다.
+    fd, path = tempfile.mkstemp(suffix=".prof")
+    os.close(fd)
+    try:
+        profiler.dump_stats(path)
+        with open(path, "rb") as f:
+            raw = f.read()
+    finally:
+        os.unlink(path)
+
+    captured_at = datetime.now()
+    return {
+        "page": page,
+        "captured_at": captured_at,
+        "elapsed_ms": elapsed_ms,
+        "summary": text.getvalue(),
+        "raw": raw,
+        "file_name": f"profile_{page}_{captured_at:%Y%m%d_%H%M%S}.prof",
+    }
+
+
+def show_profiling_tools(user: dict):
+    """관리자용 사이드바 도구: 다음 재실행 프로파일링 요청, 결과 다운로드, 페이지별 실행 시간"""
+    if not is_profiling_admin(user):
+        return
+
+    with st.sidebar.expander("⏱️ 성능 진단"):
+        if st.button("다음 실행 프로파일링", use_container_width=True, key="profile_next_rerun_button"):
+            st.session_state[_PROFILE_REQUEST_KEY] = True
+            st.rerun()
+
+        result = st.session_state.get(_PROFILE_RESULT_KEY)
+        if result:
+            st.caption(f"{result['page']} · {result['captured_at']:%H:%M:%S} · {result['elapsed_ms']:.0f}ms")
+            st.download_button("프로파일 다운로드 (.prof)", result["raw"], file_name=result["file_name"],
+                               mime="application/octet-stream", use_container_width=True)
+            st.download_button("요약 다운로드 (.txt)", result["summary"], file_name=result["file_name"][:-5] + ".txt",
+                               mime="text/plain", use_container_width=True)
+
+        summary = timing_summary()
+        if summary:
+            st.dataframe(summary, use_container_width=True, hide_index=True)
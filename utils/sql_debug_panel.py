@@ -0,0 +1,40 @@
+"""
+SQL 진단 패널
+현재 재실행에서 실행된 쿼리 수, SQL 시간, 반복 문장(N+1 의심)을 페이지 하단에 표시합니다.
+config.SQL_DEBUG_PANEL (환경 변수 SCM_SQL_DEBUG=1)이 켜져 있을 때만 app.main에서 호출됩니다.
+"""
+import pandas as pd
+import streamlit as st
+
+from database.instrumentation import page_totals
+
+
+def show_sql_debug_panel(stats):
+    """재실행 단위 SQL 통계 표시"""
+    flagged = stats.flagged_shapes()
+    title = f"🔍 SQL 진단 - {stats.page}: 쿼리 {stats.query_count}건, {stats.total_ms:.1f}ms"
+    if flagged:
+        title += f" (N+1 의심 {len(flagged)}건)"
+
+    with st.expander(title, expanded=bool(flagged)):
+        col1, col2, col3 = st.columns(3)
+        col1.metric("쿼리 수", stats.query_count)
+        col2.metric("SQL 시간", f"{stats.total_ms:.1f} ms")
+        col3.metric("페이지 실행 시간", f"{stats.wall_ms:.1f} ms")
+
+        if flagged:
+            st.warning(f"같은 형태의 문장이 {stats.threshold}회 이상 반복되었습니다. 반복 조회를 한 번의 조회로 묶는 것을 검토하세요.")
+            st.dataframe(pd.DataFrame(flagged, columns=["문장 형태", "횟수", "총 ms"]), use_container_width=True, hide_index=True)
+
+        st.markdown("**시간이 긴 문장**")
+        st.dataframe(pd.DataFrame(stats.top_shapes(), columns=["문장 형태", "횟수", "총 ms"]),
+                     use_container_width=True, hide_index=True)
+
+        totals = page_totals()
+        if totals:
+            st.markdown("**페이지별 누적 (프로세스 시작 후)**")
+            st.dataframe(pd.DataFrame([
+                {"페이지": page, "실행 횟수": t["reruns"], "평균 쿼리 수": t["queries"] / t["reruns"],
+                 "평균 SQL ms": t["sql_ms"] / t["reruns"], "N+1 발생 실행": t["n_plus_one_reruns"]}
+                for page, t in totals.items()
+            ]), use_container_width=True, hide_index=True)